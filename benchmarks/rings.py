@@ -0,0 +1,92 @@
+# benchmarks/rings.py
+"""
+Representative rings for the benchmarks, as (add, mul) numpy tables.
+
+The structured families come from logic.ring_builders (array constructors, no
+analysis code involved), so the generators cost the same whatever the code
+under test does. Elements of composite rings are numbered in mixed radix
+(digit i of the label is component i).
+"""
+from typing import Callable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from logic import ring_builders
+
+Tables = Tuple[np.ndarray, np.ndarray]
+
+
+def _tables(ring: Tuple[object, object]) -> Tables:
+    return np.asarray(ring[0]), np.asarray(ring[1])
+
+
+def znz(n: int) -> Tables:
+    """Z/nZ."""
+    return _tables(ring_builders.zmod(n))
+
+
+def product(a: Tables, b: Tables) -> Tables:
+    """Direct product A x B; element i * len(B) + j is (i, j)."""
+    return _tables(ring_builders.direct_product(a, b))
+
+
+def matrix_ring(k: int, p: int) -> Tables:
+    """M_k(F_p), p prime; entry (r, c) is digit r * k + c of the label."""
+    return _tables(ring_builders.matrix_ring(k, p))
+
+
+def galois_field(p: int, k: int) -> Tables:
+    """GF(p^k) as F_p[x]/(f); coefficient i of the polynomial is digit i of the label."""
+    return _tables(ring_builders.galois_field(p, k))
+
+
+def random_tables(n: int, seed: int = 0) -> Tables:
+    """Uniformly random entries: almost surely not a ring (axiom checks fail early)."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, n, (n, n)), rng.integers(0, n, (n, n))
+
+
+def _largest_prime(n: int) -> int:
+    for p in range(n, 1, -1):
+        if all(p % q for q in range(2, int(p ** 0.5) + 1)):
+            return p
+    return 2
+
+
+def _prime_power(n: int) -> Optional[Tuple[int, int]]:
+    for p in range(2, n + 1):
+        if n % p == 0:
+            k = 0
+            while n % p == 0:
+                n //= p
+                k += 1
+            return (p, k) if n == 1 else None
+    return None
+
+
+# matrix rings M_k(F_p) by size
+_MATRIX_RINGS = {p ** (k * k): (k, p) for k, p in [(2, 2), (2, 3), (3, 2), (2, 5), (2, 7)]}
+
+
+def families(size: int) -> Iterator[Tuple[str, Callable[[], Tables]]]:
+    """(name, builder) for every family that has a member with about `size` elements."""
+    # builders take their parameters as defaults, so they stay valid after the loop moves on
+    p = _largest_prime(size)
+    yield f"Z/{p}", lambda p=p: znz(p)
+    if size >= 4 and size != p:
+        yield f"Z/{size}", lambda: znz(size)
+    if size % 2 == 0 and size >= 4:
+        half = size // 2
+        yield f"Z/2 x Z/{half}", lambda half=half: product(znz(2), znz(half))
+    power = _prime_power(size)
+    if power is not None and power[1] > 1:
+        gp, gk = power
+        yield f"GF({gp}^{gk})", lambda gp=gp, gk=gk: galois_field(gp, gk)
+    for n, (k, mp) in _MATRIX_RINGS.items():
+        # the matrix ring closest to this size (sizes are usually powers of two)
+        if size // 2 < n <= size:
+            yield f"M{k}(F{mp})", lambda k=k, mp=mp: matrix_ring(k, mp)
+    yield f"random {size}", lambda: random_tables(size)
+
+
+DEFAULT_SIZES = [8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096]
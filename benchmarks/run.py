@@ -0,0 +1,232 @@
+# benchmarks/run.py
+"""
+Benchmark the hot paths over representative rings: python -m benchmarks.run
+
+Stages: parsing fast input, the pure-Python addition-table validation,
+analyze_ring, the ring axiom checks (exact and sampled) and, if PyQt5 is
+installed, MainWindow.visualize rendered offscreen. Results are written as
+JSON; with --baseline they are compared to an earlier run and the exit code
+is 1 if any stage got slower than the tolerance allows.
+
+Baselines are machine specific, so none is kept in the repository: record one
+with -o on the machine that compares against it.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.rings import DEFAULT_SIZES, Tables, families
+from logic.ring_axioms import check_ring_axioms
+from logic.ring_checker import analyze_ring
+from logic.ring_table import parse_fast_blocks, validate_addition_table
+
+QUICK_SIZES = [8, 16, 32, 64, 128, 256]
+
+# largest n per stage; the pure-Python and O(n^3) stages would otherwise dominate the run
+STAGE_MAX_N = {
+    "parse": 4096,
+    "validate_addition_table": 4096,
+    "analyze_ring": 4096,
+    "axioms exact": 512,
+    "axioms sampled": 2048,
+    "visualize": 4096,
+}
+STAGES = list(STAGE_MAX_N)
+
+# differences below this are timer noise, not regressions
+NOISE_FLOOR = 1e-3
+
+
+def fast_input(add: np.ndarray, mul: np.ndarray) -> str:
+    """The custom fast-input block for (add, mul)."""
+    rows = [str(len(mul))]
+    for table in (add, mul):
+        rows.extend(" ".join(map(str, row)) for row in table.tolist())
+    return "\n".join(rows)
+
+
+def time_call(fn: Callable[[], Any], min_time: float, max_repeats: int = 1000) -> Tuple[float, float, int]:
+    """
+    (best, median, repeats): fn runs until min_time has passed (at least once).
+
+    A ValueError counts as a normal return: rejecting the invalid tables is
+    the path being measured for them.
+    """
+    times: List[float] = []
+    total = 0.0
+    while not times or (total < min_time and len(times) < max_repeats):
+        start = time.perf_counter()
+        try:
+            fn()
+        except ValueError:
+            pass
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+    return min(times), statistics.median(times), len(times)
+
+
+class Visualizer:
+    """MainWindow shown offscreen; render() points it at a ring and paints both views."""
+
+    def __init__(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5.QtWidgets import QApplication
+        from ui.main_window import MainWindow
+
+        self.app = QApplication.instance() or QApplication([])
+        self.window = MainWindow()
+        self.window.hide_output_cb.setChecked(False)
+        self.window.show()
+        self.app.processEvents()
+
+    def render(self, add: Any, mul: Any, res: Dict[str, Dict[str, Any]]) -> None:
+        w = self.window
+        w.visualize(add, mul, res)
+        for view in (w.add_table, w.mul_table):
+            view.viewport().grab()
+
+
+def stage_calls(stage: str, add: np.ndarray, mul: np.ndarray, visualizer: Optional[Visualizer]) -> Optional[Callable[[], Any]]:
+    """The timed call for a stage (inputs are prepared outside of it), or None to skip."""
+    if stage == "parse":
+        text = fast_input(add, mul)
+        return lambda: parse_fast_blocks(text, custom=True, compact=True)
+    if stage == "validate_addition_table":
+        rows = add.tolist()
+        return lambda: validate_addition_table(rows)
+    if stage == "analyze_ring":
+        return lambda: analyze_ring(mul, axioms="off")
+    if stage == "axioms exact":
+        return lambda: check_ring_axioms(add, mul, "exact")
+    if stage == "axioms sampled":
+        return lambda: check_ring_axioms(add, mul, "sampled", seed=0)
+    if stage == "visualize":
+        if visualizer is None:
+            return None
+        res = analyze_ring(mul, axioms="off")
+        return lambda: visualizer.render(add, mul, res)
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+def run(sizes: List[int], stages: List[str], min_time: float, gui: bool, log=sys.stderr) -> List[Dict[str, Any]]:
+    visualizer = None
+    if gui and "visualize" in stages:
+        try:
+            visualizer = Visualizer()
+        except ImportError as e:
+            print(f"visualize skipped: {e}", file=log)
+
+    results = []
+    seen = set()
+    for size in sizes:
+        for ring, build in families(size):
+            if ring in seen:
+                continue  # e.g. the same matrix ring is closest to two sizes
+            seen.add(ring)
+            tables: Optional[Tables] = None
+            for stage in stages:
+                if size > STAGE_MAX_N[stage]:
+                    continue
+                if tables is None:
+                    tables = build()
+                n = len(tables[1])
+                call = stage_calls(stage, *tables, visualizer)
+                if call is None:
+                    continue
+                best, median, repeats = time_call(call, min_time)
+                results.append({"stage": stage, "ring": ring, "n": n,
+                                "seconds": best, "median": median, "repeats": repeats})
+                print(f"{stage:<24} {ring:<16} {best * 1e3:12.3f} ms  (x{repeats})", file=log)
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Rows of the baseline comparison; "regression" marks stages slower than (1 + tolerance) times."""
+    before = {(r["stage"], r["ring"]): r["seconds"] for r in baseline.get("results", [])}
+    rows = []
+    for r in results:
+        old = before.get((r["stage"], r["ring"]))
+        if old is None:
+            continue
+        ratio = r["seconds"] / old if old else float("inf")
+        rows.append({
+            "stage": r["stage"], "ring": r["ring"], "n": r["n"],
+            "baseline": old, "seconds": r["seconds"], "ratio": ratio,
+            "regression": ratio > 1 + tolerance and r["seconds"] - old > NOISE_FLOOR,
+        })
+    return rows
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Finite Ring Analyzer benchmarks")
+    parser.add_argument("--sizes", default=None,
+                        help="comma-separated ring sizes (default: " + ",".join(map(str, DEFAULT_SIZES)) + ")")
+    parser.add_argument("--quick", action="store_true", help="sizes up to " + str(QUICK_SIZES[-1]) + " only")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated stages (default: all)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="repeat each call until this many seconds have passed (default: 0.2)")
+    parser.add_argument("--no-gui", action="store_true", help="skip the visualize stage")
+    parser.add_argument("-o", "--output", metavar="PATH", default="-", help="JSON results file (default: stdout)")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against the JSON results of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline, as a fraction (default: 0.25)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.sizes:
+        sizes = [int(s) for s in args.sizes.split(",")]
+    else:
+        sizes = QUICK_SIZES if args.quick else DEFAULT_SIZES
+    stages = [s.strip() for s in args.stages.split(",")]
+    unknown = [s for s in stages if s not in STAGE_MAX_N]
+    if unknown:
+        print(f"error: unknown stage(s): {', '.join(unknown)} (choose from: {', '.join(STAGES)})", file=sys.stderr)
+        return 2
+
+    results = run(sizes, stages, args.min_time, not args.no_gui)
+    report: Dict[str, Any] = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "min_time": args.min_time,
+        },
+        "results": results,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            rows = compare(results, json.load(f), args.tolerance)
+        report["comparison"] = {"baseline": args.baseline, "tolerance": args.tolerance, "rows": rows}
+        regressions = [r for r in rows if r["regression"]]
+        for r in regressions:
+            print(f"REGRESSION {r['stage']} {r['ring']}: {r['baseline'] * 1e3:.3f} ms -> "
+                  f"{r['seconds'] * 1e3:.3f} ms (x{r['ratio']:.2f})", file=sys.stderr)
+        print(f"{len(rows)} compared, {len(regressions)} regression(s)", file=sys.stderr)
+        status = 1 if regressions else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
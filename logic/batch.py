@@ -0,0 +1,370 @@
+# logic/batch.py
+"""
+Batch analysis of many rings across a process pool.
+
+Tables are shipped to the workers as compact (n, dtype, bytes) buffers rather
+than pickled nested lists, analyzed in chunks, and returned in input order.
+"""
+import math
+import os
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from logic import ring_numpy
+from logic.ring_canon import (analysis_zero, canonical_form, canonical_options,
+                              relabel_result, ring_fingerprint)
+from logic.ring_checker import analyze_ring
+from logic.profiling import Profiler, Report
+from logic.result_cache import ResultCache, cached_analyze, table_digest
+
+Result = Dict[str, Dict[str, Any]]
+Packed = Tuple[int, str, bytes]
+
+# Below this many table cells in total the pool start-up costs more than it saves.
+MIN_PARALLEL_CELLS = 1 << 20
+# Results kept in memory by LazyResults (older ones are recomputed or re-read from the cache).
+LAZY_MEMO_SIZE = 256
+
+
+class AnalysisCancelled(Exception):
+    """Raised by analyze_many when the cancelled() callback returns True."""
+
+
+def pack_table(table: Any) -> Packed:
+    """Compact, picklable form of a table: (n, dtype, raw bytes)."""
+    arr = ring_numpy.as_array(table)
+    return len(arr), arr.dtype.str, arr.tobytes()
+
+
+def unpack_table(packed: Packed) -> np.ndarray:
+    n, dtype, raw = packed
+    return np.frombuffer(raw, dtype=dtype).reshape(n, n)
+
+
+def _analyze_one(mul: Any, add: Optional[Any], options: Dict[str, Any]) -> Result:
+    return analyze_ring(mul, add_table=add, **options)
+
+
+def _analyze_chunk(chunk: List[Tuple[Optional[Packed], Packed]], options: Dict[str, Any]) -> List[Result]:
+    return [
+        _analyze_one(unpack_table(mul), None if add is None else unpack_table(add), options)
+        for add, mul in chunk
+    ]
+
+
+def analyze_many(
+    mul_tables: Sequence[Any],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancelled: Optional[Callable[[], bool]] = None,
+    add_tables: Optional[Sequence[Any]] = None,
+    cache: Optional[ResultCache] = None,
+    up_to_isomorphism: bool = False,
+    **options: Any,
+) -> List[Result]:
+    """
+    analyze_ring for every table, spread across a ProcessPoolExecutor.
+
+    Results come back in input order. progress(done, total) is called as rings
+    finish; if cancelled() returns True the remaining chunks are dropped and
+    AnalysisCancelled is raised. Small batches run in-process.
+
+    add_tables (same length as mul_tables, entries may be None) and any extra
+    keyword options (axioms=, error_bound=, seed=) are passed on to analyze_ring.
+    With a ResultCache, cached rings are answered up front and only the misses
+    are analyzed (and then stored).
+
+    With up_to_isomorphism=True, rings that are relabelings of each other are
+    analyzed once (on their canonical form, see ring_canon) and the result is
+    translated back to each input's labels. Witnesses are then valid but not
+    necessarily the first ones in each input's order.
+    """
+    total = len(mul_tables)
+    if add_tables is None:
+        add_tables = [None] * total
+    if up_to_isomorphism:
+        return _analyze_up_to_isomorphism(mul_tables, add_tables, workers, chunk_size,
+                                          progress, cancelled, cache, options)
+    if cache is None:
+        return _analyze_uncached(mul_tables, add_tables, workers, chunk_size, progress, cancelled, options)
+
+    keys = [table_digest(mul, add, **options) for add, mul in zip(add_tables, mul_tables)]
+    results: List[Optional[Result]] = [cache.get(k) for k in keys]
+    todo = [i for i, res in enumerate(results) if res is None]
+    hits = total - len(todo)
+    if progress and hits:
+        progress(hits, total)
+
+    fresh = _analyze_uncached(
+        [mul_tables[i] for i in todo], [add_tables[i] for i in todo],
+        workers, chunk_size,
+        (lambda done, _: progress(hits + done, total)) if progress else None,
+        cancelled, options,
+    )
+    for i, res in zip(todo, fresh):
+        cache.put(keys[i], res)
+        results[i] = res
+    return results
+
+
+def _analyze_up_to_isomorphism(
+    mul_tables: Sequence[Any],
+    add_tables: Sequence[Any],
+    workers: Optional[int],
+    chunk_size: Optional[int],
+    progress: Optional[Callable[[int, int], None]],
+    cancelled: Optional[Callable[[], bool]],
+    cache: Optional[ResultCache],
+    options: Dict[str, Any],
+) -> List[Result]:
+    total = len(mul_tables)
+    zeros = [analysis_zero(mul, add, **options) for add, mul in zip(add_tables, mul_tables)]
+
+    # Cheap fingerprints first: without a cache, a ring whose fingerprint is
+    # unique in the batch has no isomorphic partner and is analyzed as given.
+    fingerprints: List[Optional[str]] = []
+    for add, mul, zero in zip(add_tables, mul_tables, zeros):
+        try:
+            fingerprints.append(ring_fingerprint(mul, add, zero))
+        except ValueError:
+            fingerprints.append(None)
+    shared = {fp for fp, k in Counter(fingerprints).items() if fp is not None and k > 1}
+
+    forms: List[Any] = [None] * total
+    classes: Dict[str, int] = {}
+    work_mul: List[Any] = []
+    work_add: List[Any] = []
+    job: List[Tuple[int, bool]] = []  # per input: (index into work, canonical?)
+    for i, (add, mul, fp) in enumerate(zip(add_tables, mul_tables, fingerprints)):
+        if fp is not None and (cache is not None or fp in shared):
+            try:
+                forms[i] = canonical_form(mul, add, zeros[i])
+            except ValueError:
+                pass
+        form = forms[i]
+        if form is None:
+            job.append((len(work_mul), False))
+            work_mul.append(mul)
+            work_add.append(add)
+        else:
+            if form.digest not in classes:
+                classes[form.digest] = len(work_mul)
+                work_mul.append(form.mul)
+                work_add.append(form.add)
+            job.append((classes[form.digest], True))
+
+    # canonical and as-given tables go through the same batch (the canonical
+    # ones need zero_index=0, so they are analyzed with their own options)
+    canon_idx = sorted(set(k for k, canon in job if canon))
+    plain_idx = sorted(set(k for k, canon in job if not canon))
+    work_total = len(canon_idx) + len(plain_idx)
+    done_before = [0]
+
+    def stage_progress(done: int, _: int) -> None:
+        if progress:
+            progress(done_before[0] + done, work_total)
+
+    work_results: Dict[int, Result] = {}
+    for idx, opts in ((canon_idx, canonical_options(options)), (plain_idx, options)):
+        if not idx:
+            continue
+        res = analyze_many([work_mul[k] for k in idx], workers, chunk_size, stage_progress, cancelled,
+                           add_tables=[work_add[k] for k in idx], cache=cache, **opts)
+        work_results.update(zip(idx, res))
+        done_before[0] += len(idx)
+
+    results = []
+    for i, (k, canon) in enumerate(job):
+        res = work_results[k]
+        if canon:
+            res = relabel_result(res, forms[i].labels)
+            if res is None:
+                # validation messages quote positions: redo this one as given
+                res = _analyze_one(mul_tables[i], add_tables[i], options)
+        results.append(res)
+    return results
+
+
+def _analyze_uncached(
+    mul_tables: Sequence[Any],
+    add_tables: Sequence[Any],
+    workers: Optional[int],
+    chunk_size: Optional[int],
+    progress: Optional[Callable[[int, int], None]],
+    cancelled: Optional[Callable[[], bool]],
+    options: Dict[str, Any],
+) -> List[Result]:
+    total = len(mul_tables)
+    workers = workers or os.cpu_count() or 1
+    cells = sum(len(t) ** 2 for t in mul_tables)
+
+    if workers == 1 or total < 2 or cells < MIN_PARALLEL_CELLS:
+        results = []
+        for i, (add, mul) in enumerate(zip(add_tables, mul_tables), start=1):
+            if cancelled and cancelled():
+                raise AnalysisCancelled()
+            results.append(_analyze_one(mul, add, options))
+            if progress:
+                progress(i, total)
+        return results
+
+    # a few chunks per worker keeps the pool busy without drowning it in tiny tasks
+    chunk_size = chunk_size or max(1, math.ceil(total / (workers * 4)))
+    starts = range(0, total, chunk_size)
+    slots: List[Optional[List[Result]]] = [None] * len(starts)
+    done = 0
+
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(starts)))
+    try:
+        pending = {}
+        for k, s in enumerate(starts):
+            chunk = [
+                (None if add is None else pack_table(add), pack_table(mul))
+                for add, mul in zip(add_tables[s:s + chunk_size], mul_tables[s:s + chunk_size])
+            ]
+            pending[pool.submit(_analyze_chunk, chunk, options)] = k
+        while pending:
+            finished, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            if cancelled and cancelled():
+                for f in pending:
+                    f.cancel()
+                raise AnalysisCancelled()
+            for f in finished:
+                k = pending.pop(f)
+                slots[k] = f.result()
+                done += len(slots[k])
+                if progress:
+                    progress(done, total)
+    finally:
+        pool.shutdown(wait=False)
+
+    return [res for chunk in slots for res in chunk]
+
+_MISSING = object()
+
+
+def analyze_profiled(
+    mul_tables: Sequence[Any],
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancelled: Optional[Callable[[], bool]] = None,
+    add_tables: Optional[Sequence[Any]] = None,
+    memory: bool = True,
+    **options: Any,
+) -> Tuple[List[Result], List[Report]]:
+    """
+    analyze_many's serial counterpart: each ring runs under its own Profiler.
+
+    Everything stays in this process (stage timings and traced memory would be
+    lost in pool workers), one ring after another, and the result cache is not
+    used (a hit would profile the lookup instead of the analysis). Returns the
+    results and a profiling report per ring; progress and cancelled work as in
+    analyze_many.
+    """
+    total = len(mul_tables)
+    if add_tables is None:
+        add_tables = [None] * total
+    results: List[Result] = []
+    reports: List[Report] = []
+    for add, mul in zip(add_tables, mul_tables):
+        if cancelled and cancelled():
+            raise AnalysisCancelled()
+        with Profiler(memory=memory) as prof:
+            results.append(analyze_ring(mul, add_table=add, **options))
+        reports.append(prof.report())
+        if progress:
+            progress(len(results), total)
+    return results, reports
+
+
+class LazyResults:
+    """
+    Batch results computed when first asked for instead of all up front.
+
+    analyze_one(i) produces the result of ring i. get(i) answers from a bounded
+    LRU memo, waits for a prefetch already running for i, or computes it in
+    the calling thread. prefetch(i) schedules the neighbours of i on a
+    background thread. An exception raised for ring i is remembered and
+    re-raised by get(i), like a result.
+    """
+
+    def __init__(self, count: int, analyze_one: Callable[[int], Result],
+                 max_cached: int = LAZY_MEMO_SIZE, radius: int = 1):
+        self.count = count
+        self.analyze_one = analyze_one
+        self.max_cached = max_cached
+        self.radius = radius
+        self._memo: "OrderedDict[int, Any]" = OrderedDict()
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> Result:
+        return self.get(i)
+
+    def __iter__(self) -> Iterator[Result]:
+        return (self.get(i) for i in range(self.count))
+
+    def _store(self, i: int, value: Any) -> None:
+        with self._lock:
+            self._memo[i] = value
+            self._memo.move_to_end(i)
+            while len(self._memo) > self.max_cached:
+                self._memo.popitem(last=False)
+
+    def _compute(self, i: int) -> Any:
+        try:
+            value: Any = self.analyze_one(i)
+        except Exception as e:
+            value = e
+        self._store(i, value)
+        return value
+
+    def peek(self, i: int) -> Optional[Result]:
+        """The memoized result of ring i, or None if it has not been computed."""
+        with self._lock:
+            value = self._memo.get(i)
+        return None if isinstance(value, Exception) else value
+
+    def get(self, i: int) -> Result:
+        if not 0 <= i < self.count:
+            raise IndexError("batch index out of range")
+        future = None
+        with self._lock:
+            value = self._memo.get(i, _MISSING)
+            if value is not _MISSING:
+                self._memo.move_to_end(i)
+            else:
+                future = self._pending.get(i)
+        if value is _MISSING:
+            value = future.result() if future is not None else self._compute(i)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def prefetch(self, i: int) -> None:
+        """Analyze the rings within radius of i in the background."""
+        for j in range(i - self.radius, i + self.radius + 1):
+            if not 0 <= j < self.count:
+                continue
+            with self._lock:
+                if j in self._memo or j in self._pending:
+                    continue
+                future = self._pool.submit(self._compute, j)
+                self._pending[j] = future
+            future.add_done_callback(lambda _, j=j: self._done(j))
+
+    def _done(self, j: int) -> None:
+        with self._lock:
+            self._pending.pop(j, None)
+
+    def close(self) -> None:
+        """Drop queued prefetches (one already running is left to finish)."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
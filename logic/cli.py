@@ -0,0 +1,382 @@
+# logic/cli.py
+"""
+Headless command-line entry point: python -m logic analyze [files...]
+(plus convert, subrings to list subrings/ideals, product for direct
+products analyzed from their factors, and serve for a long-running local
+service, see logic.service).
+
+Streams the fast-input format (same as the GUI's Fast Input Mode), runs
+analyze_ring plus the ring axiom checks and writes one row per ring (see
+logic.export for the formats) to stdout or a file. Nothing from ui/ (or
+PyQt5) is imported here.
+"""
+import argparse
+import json
+import sys
+from contextlib import nullcontext
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+from logic import closure
+from logic.export import FORMATS, open_writer, result_columns
+from logic.product_ring import ProductRing
+from logic.profiling import Profiler
+from logic.ring_binary import RingFile, RingFileWriter, is_ring_file
+from logic.result_cache import ResultCache, cached_analyze, default_cache_path
+from logic.znz import ZnZRing
+from logic.ring_table import (RingTable, iter_fast_blocks, iter_znz_specs, validate_addition_table,
+                              validate_multiplication_table)
+
+
+def _open_sources(paths: List[str]) -> Iterator[Tuple[str, Union[TextIO, RingFile]]]:
+    """Text files (or stdin) to parse, or a mapped RingFile for compiled table files."""
+    if not paths:
+        paths = ["-"]
+    for path in paths:
+        if path == "-":
+            yield "<stdin>", sys.stdin
+            continue
+        try:
+            source: Union[TextIO, RingFile] = RingFile(path) if is_ring_file(path) else open(path, encoding="utf-8")
+        except OSError as e:
+            raise OSError(f"{path}: {e.strerror or e}") from None
+        with source:
+            yield path, source
+
+
+def _validate(add: Optional[Any], mul: Any) -> None:
+    """The GUI's table checks (shape, entry range, additive group basics)."""
+    if add is not None:
+        validate_addition_table(add)
+    validate_multiplication_table(mul)
+
+
+Row = Tuple[Optional[Dict[str, Dict[str, Any]]], Dict[str, Any]]
+
+
+def _profiled(items: Iterator[Any], args: argparse.Namespace, counter: List[int]) -> Iterator[Tuple[Any, Optional[Profiler]]]:
+    """
+    Items of a lazy parser, each pulled under a fresh Profiler when --profile or
+    --pstats-batch asks for one (so parsing is part of the ring's profile).
+    counter[0] numbers the rings across all inputs.
+    """
+    while True:
+        ring_no = counter[0] + 1
+        pstats = args.pstats if args.pstats_batch == ring_no else None
+        prof = Profiler(memory=args.profile, pstats_path=pstats) if args.profile or pstats else None
+        with prof or nullcontext():
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+        counter[0] = ring_no
+        yield item, prof
+
+
+def _rows(args: argparse.Namespace, cache: Optional[ResultCache]) -> Iterator[Row]:
+    """(result, meta) per ring; rings are streamed line by line, so memory stays flat."""
+    counter = [0]
+    for source, f in _open_sources(args.files):
+        if isinstance(f, RingFile) and not args.custom:
+            raise ValueError(f"{source} holds ring tables, analyze it with --custom")
+        if not args.custom:
+            # Z/nZ blocks are answered in closed form, no tables are built
+            specs = _profiled(iter_znz_specs(f), args, counter)
+            for idx, ((n, elems), prof) in enumerate(specs, start=1):
+                with prof or nullcontext():
+                    ring = ZnZRing(n, elems)
+                    res = ring.analyze()
+                meta: Dict[str, Any] = {"source": source, "batch": idx, "n": len(ring)}
+                if args.profile:
+                    meta["profile"] = prof.report()
+                yield res, meta
+            continue
+
+        blocks = iter(f) if isinstance(f, RingFile) else iter_fast_blocks(f, custom=True, compact=True)
+        for idx, ((add, mul), prof) in enumerate(_profiled(blocks, args, counter), start=1):
+            meta = {"source": source, "batch": idx, "n": len(mul)}
+            try:
+                with prof or nullcontext():
+                    if add is None or args.axioms == "off":
+                        # otherwise check_ring_axioms validates the tables (as a failed axiom)
+                        _validate(add, mul)
+                    res = cached_analyze(cache, mul, add, up_to_isomorphism=args.up_to_isomorphism,
+                                         axioms=args.axioms, error_bound=args.error_bound, seed=args.seed,
+                                         witnesses=args.witnesses)
+            except ValueError as e:
+                res = None
+                meta["error"] = str(e)
+            if args.profile:
+                meta["profile"] = prof.report()
+            yield res, meta
+
+
+def cmd_analyze(args: argparse.Namespace) -> int:
+    if args.pstats_batch is not None and not args.pstats:
+        print("error: --pstats-batch needs --pstats PATH", file=sys.stderr)
+        return 2
+    if args.witnesses and not args.custom:
+        print("error: --witnesses needs --custom", file=sys.stderr)
+        return 2
+    if args.profile or args.pstats:
+        # a cache hit would profile the lookup instead of the analysis
+        cache = None
+    elif args.no_cache:
+        # isomorphic rings within this run are still only analyzed once
+        cache = ResultCache(":memory:") if args.up_to_isomorphism else None
+    else:
+        cache = ResultCache(args.cache)
+    writer = None
+    # without --pstats-batch the whole run goes into the pstats file
+    run_profile = Profiler(memory=False, pstats_path=args.pstats) if args.pstats and args.pstats_batch is None else None
+    try:
+        writer = open_writer(args.output, args.format, args.gzip,
+                             result_columns(args.custom and args.axioms != "off", args.profile, args.witnesses))
+        with run_profile or nullcontext():
+            for res, meta in _rows(args, cache):
+                writer.write(res, **meta)
+    except (OSError, ValueError) as e:
+        # parse errors are fatal for the whole input, like in the GUI
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if writer is not None:
+            writer.close()
+        if cache is not None:
+            if args.cache_stats:
+                print("cache: " + ", ".join(f"{k}={v}" for k, v in cache.stats().items()), file=sys.stderr)
+            cache.close()
+    return 0
+
+
+def cmd_convert(args: argparse.Namespace) -> int:
+    count = 0
+    try:
+        with RingFileWriter(args.output) as writer:
+            for source, f in _open_sources(args.files):
+                blocks = iter(f) if isinstance(f, RingFile) else iter_fast_blocks(f, custom=True, compact=True)
+                for idx, (add, mul) in enumerate(blocks, start=1):
+                    try:
+                        writer.append(add, mul)
+                    except ValueError as e:
+                        raise ValueError(f"{source} batch {idx}: {e}")
+                    count += 1
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(f"{count} rings written to {args.output}", file=sys.stderr)
+    return 0
+
+
+def _parse_generators(text: Optional[str]) -> Optional[List[int]]:
+    if text is None:
+        return None
+    try:
+        return [int(x) for x in text.replace(",", " ").split()]
+    except ValueError:
+        raise ValueError(f"--generated-by expects integers, got {text!r}")
+
+
+def cmd_subrings(args: argparse.Namespace) -> int:
+    """One JSON line per subring (or ideal); Z/nZ ones as dZ/nZ, custom ones with their elements."""
+    kind = "ideal" if args.ideals else "subring"
+    out = sys.stdout
+    try:
+        generators = _parse_generators(args.generated_by)
+        if not args.custom:
+            for item in args.inputs:
+                try:
+                    n = int(item)
+                except ValueError:
+                    raise ValueError(f"expected n for Z/nZ, got {item!r} (custom rings need --custom)")
+                if n < 1:
+                    raise ValueError("n must be at least 1")
+                found = [closure.znz_generated(n, generators)] if generators is not None else closure.znz_subrings(n)
+                for r in found:
+                    out.write(json.dumps({"n": n, "kind": kind, "generator": r.step % n, "size": len(r)}) + "\n")
+            return 0
+        for source, f in _open_sources(args.inputs):
+            blocks = iter(f) if isinstance(f, RingFile) else iter_fast_blocks(f, custom=True, compact=True)
+            for idx, (add, mul) in enumerate(blocks, start=1):
+                if add is None:
+                    raise ValueError(f"{source} batch {idx}: subrings need the addition table")
+                try:
+                    _validate(add, mul)
+                except ValueError as e:
+                    raise ValueError(f"{source} batch {idx}: {e}")
+                if generators is not None:
+                    if any(g < 0 or g >= len(mul) for g in generators):
+                        raise ValueError(f"{source} batch {idx}: generators must be between 0 and {len(mul) - 1}")
+                    found = [closure.generated(add, mul, generators, ideal=args.ideals)]
+                else:
+                    found = closure.enumerate_closed(add, mul, ideal=args.ideals, limit=args.limit)
+                for elements in found:
+                    out.write(json.dumps({"source": source, "batch": idx, "n": len(mul), "kind": kind,
+                                          "size": len(elements), "elements": elements}) + "\n")
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def _product_factor(spec: str) -> Any:
+    """A product factor: n for all of Z/nZ, or PATH[:K] for the K-th custom ring of a file (default 1)."""
+    try:
+        n = int(spec)
+    except ValueError:
+        pass
+    else:
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        return ZnZRing(n)
+    path, sep, k = spec.rpartition(":")
+    if not sep or not k.isdigit():
+        path, k = spec, "1"
+    wanted = int(k)
+    for source, f in _open_sources([path]):
+        blocks = iter(f) if isinstance(f, RingFile) else iter_fast_blocks(f, custom=True, compact=True)
+        for idx, (add, mul) in enumerate(blocks, start=1):
+            if idx != wanted:
+                continue
+            try:
+                _validate(add, mul)
+            except ValueError as e:
+                raise ValueError(f"{source} batch {idx}: {e}")
+            # copies, the tables of a RingFile are views of the file
+            return tuple(None if t is None else RingTable(t.n, t.tobytes(), t.typecode) for t in (add, mul))
+        raise ValueError(f"{source} has no ring {wanted}")
+
+
+def cmd_product(args: argparse.Namespace) -> int:
+    """One row for the direct product of the factors; the product table is never built."""
+    cache = None if args.no_cache else ResultCache(args.cache)
+    writer = None
+    try:
+        ring = ProductRing([_product_factor(spec) for spec in args.factors])
+        writer = open_writer(args.output, args.format, args.gzip,
+                             result_columns(args.axioms != "off", False, args.witnesses))
+        res = ring.analyze(cache, axioms=args.axioms, error_bound=args.error_bound, seed=args.seed,
+                           witnesses=args.witnesses)
+        writer.write(res, source=" x ".join(args.factors), batch=1, n=len(ring))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if writer is not None:
+            writer.close()
+        if cache is not None:
+            cache.close()
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    import asyncio
+    from logic import service
+    cache = None if args.no_cache else ResultCache(args.cache)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.socket, cache=cache, workers=args.workers,
+                                  batch_window=args.batch_window_ms / 1000, max_batch=args.max_batch))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if cache is not None:
+            cache.close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m logic", description="Finite Ring Analyzer (headless)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("analyze", help="analyze rings given in the fast-input format")
+    p.add_argument("files", nargs="*", help="input files (default: stdin, '-' also means stdin)")
+    p.add_argument("--custom", action="store_true",
+                   help="custom format (n, addition rows, multiplication rows) instead of Z/nZ (n, elements)")
+    p.add_argument("--format", choices=FORMATS, default=None,
+                   help="output format (default: from the --output file name, jsonl for stdout)")
+    p.add_argument("-o", "--output", metavar="PATH", default="-",
+                   help="output file (default: stdout); .gz names are compressed")
+    p.add_argument("--gzip", action="store_true", default=None, help="gzip-compress the output")
+    p.add_argument("--axioms", choices=["exact", "sampled", "off"], default="exact",
+                   help="ring axiom validation for --custom input (default: exact)")
+    p.add_argument("--error-bound", type=float, default=1e-6,
+                   help="failure probability bound for --axioms sampled (default: 1e-6)")
+    p.add_argument("--seed", type=int, default=None, help="random seed for --axioms sampled")
+    p.add_argument("--up-to-isomorphism", action="store_true",
+                   help="analyze relabeled copies of a ring only once (--custom; witnesses are then "
+                        "valid but not necessarily the first in input order)")
+    p.add_argument("--witnesses", action="store_true",
+                   help="list every unit (with inverse), zero divisor, idempotent and nilpotent "
+                        "(with index) of each --custom ring")
+    p.add_argument("--cache", metavar="PATH", default=None,
+                   help=f"result cache file (default: {default_cache_path()})")
+    p.add_argument("--no-cache", action="store_true", help="do not read or write the result cache")
+    p.add_argument("--cache-stats", action="store_true", help="print cache hit/miss statistics to stderr")
+    p.add_argument("--profile", action="store_true",
+                   help="add per-stage wall time, cells scanned and peak memory columns (profile.<stage>.<metric>); "
+                        "memory tracing slows the run down; the result cache is not used")
+    p.add_argument("--pstats", metavar="PATH",
+                   help="write cProfile statistics (pstats format) to PATH (the result cache is not used)")
+    p.add_argument("--pstats-batch", metavar="N", type=int, default=None,
+                   help="profile only the N-th ring of the run (counted across all inputs) for --pstats")
+    p.set_defaults(func=cmd_analyze)
+
+    p = sub.add_parser("convert", help="compile custom-format fast input into a binary table file")
+    p.add_argument("files", nargs="*", help="input files (default: stdin)")
+    p.add_argument("-o", "--output", metavar="PATH", required=True, help="table file to write (e.g. rings.frt)")
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser("subrings", help="list the subrings or ideals of Z/nZ or of custom rings")
+    p.add_argument("inputs", nargs="*",
+                   help="moduli n for Z/nZ, or with --custom input files (default: stdin)")
+    p.add_argument("--custom", action="store_true", help="read custom-format rings (or table files) instead")
+    p.add_argument("--ideals", action="store_true", help="two-sided ideals instead of subrings")
+    p.add_argument("--generated-by", metavar="ELEMENTS",
+                   help="only the subring (ideal) generated by these elements, e.g. \"2 3\"")
+    p.add_argument("--limit", type=int, default=closure.MAX_ENUMERATED,
+                   help=f"stop with an error after this many per custom ring (default: {closure.MAX_ENUMERATED})")
+    p.set_defaults(func=cmd_subrings)
+
+    p = sub.add_parser("product", help="analyze a direct product from its factors (without its table)")
+    p.add_argument("factors", nargs="+",
+                   help="n for all of Z/nZ, or PATH[:K] for the K-th (default first) custom ring of a file")
+    p.add_argument("--format", choices=FORMATS, default=None,
+                   help="output format (default: from the --output file name, jsonl for stdout)")
+    p.add_argument("-o", "--output", metavar="PATH", default="-",
+                   help="output file (default: stdout); .gz names are compressed")
+    p.add_argument("--gzip", action="store_true", default=None, help="gzip-compress the output")
+    p.add_argument("--axioms", choices=["exact", "sampled", "off"], default="exact",
+                   help="ring axiom validation of the custom factors (default: exact)")
+    p.add_argument("--error-bound", type=float, default=1e-6,
+                   help="failure probability bound for --axioms sampled (default: 1e-6)")
+    p.add_argument("--seed", type=int, default=None, help="random seed for --axioms sampled")
+    p.add_argument("--witnesses", action="store_true",
+                   help="list every unit (with inverse), zero divisor, idempotent and nilpotent "
+                        "(with index) of the product")
+    p.add_argument("--cache", metavar="PATH", default=None,
+                   help=f"result cache file (default: {default_cache_path()})")
+    p.add_argument("--no-cache", action="store_true", help="do not read or write the result cache")
+    p.set_defaults(func=cmd_product)
+
+    # defaults of logic.service (DEFAULT_PORT, BATCH_WINDOW, MAX_BATCH), spelled out so
+    # that every CLI call does not pay for importing the service and asyncio
+    p = sub.add_parser("serve", help="run a local analysis service (HTTP on localhost or a Unix socket)")
+    p.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    p.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765, 0 picks a free one)")
+    p.add_argument("--socket", metavar="PATH", help="listen on this Unix socket instead of TCP")
+    p.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    p.add_argument("--batch-window-ms", type=float, default=5.0,
+                   help="how long to wait for more rings before dispatching a batch (default: 5)")
+    p.add_argument("--max-batch", type=int, default=64, help="most rings per pool task (default: 64)")
+    p.add_argument("--cache", metavar="PATH", default=None,
+                   help=f"result cache file (default: {default_cache_path()})")
+    p.add_argument("--no-cache", action="store_true", help="do not read or write the result cache")
+    p.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
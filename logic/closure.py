@@ -0,0 +1,200 @@
+# logic/closure.py
+"""
+Subrings and ideals: closure checks, generated subrings/ideals and enumeration.
+
+A subring here is a subset containing zero that is closed under addition and
+multiplication (it need not contain the identity, like the rings the app
+analyzes); in a finite ring additive closure already makes it an additive
+subgroup. An ideal is a subring that also absorbs multiplication by every
+ring element from both sides.
+
+Z/nZ is handled in closed form: the subring and the ideal generated by S are
+both dZ/nZ with d = gcd(n, S), so the subrings (= ideals) correspond to the
+divisors of n. Custom rings, given as (add, mul) tables, use a worklist with a
+boolean membership bitmap: each round combines the newly found elements with
+all members in one array operation.
+"""
+from math import gcd
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from logic import ring_numpy
+
+# Enumeration stops with a ValueError after this many subrings/ideals.
+MAX_ENUMERATED = 10000
+
+
+# ---------- Z/nZ ----------
+
+def _divisors(n: int) -> List[int]:
+    small = [d for d in range(1, int(n ** 0.5) + 1) if n % d == 0]
+    return sorted(set(small + [n // d for d in small]))
+
+
+def znz_generator(n: int, elements: Sequence[int]) -> int:
+    """d with dZ/nZ the subring (and ideal) of Z/nZ generated by elements."""
+    d = n
+    for e in elements:
+        d = gcd(d, e % n)
+    return d
+
+
+def znz_generated(n: int, elements: Sequence[int]) -> range:
+    """Elements of the subring of Z/nZ generated by elements (also the ideal they generate)."""
+    return range(0, n, znz_generator(n, elements))
+
+
+def znz_closure_failure(n: int, elements: Sequence[int]) -> Optional[Tuple[int, str, int, int]]:
+    """
+    None if elements form a subring of Z/nZ, else (a, op, b, result) for a
+    first sum or product (op "+" or "*", in input order) that leaves the set.
+    """
+    members = {e % n for e in elements}
+    if not members or len(members) == n // znz_generator(n, members):
+        return None  # dZ/nZ is the only candidate of that size containing the elements
+    # a finite set closed under + is a subgroup, so some pair fails: find the first one, row by row
+    arr = np.asarray(elements, dtype=np.int64) % n
+    present = np.sort(arr)
+    for a in arr.tolist():
+        for op, row in (("+", (a + arr) % n), ("*", (a * arr) % n)):
+            pos = np.minimum(np.searchsorted(present, row), len(present) - 1)
+            bad = np.flatnonzero(present[pos] != row)
+            if len(bad):
+                b = int(arr[bad[0]])
+                return (a, op, b, int(row[bad[0]]))
+    return None
+
+
+def znz_subrings(n: int) -> Iterator[range]:
+    """Every subring of Z/nZ (each one is also an ideal), largest first: dZ/nZ for d | n."""
+    for d in _divisors(n):
+        yield range(0, n, d)
+
+
+# ---------- custom rings ----------
+
+def _tables(add: Any, mul: Any) -> Tuple[np.ndarray, np.ndarray]:
+    a, m = ring_numpy.as_array(add), ring_numpy.as_array(mul)
+    n = len(m)
+    if a.shape != (n, n) or m.shape != (n, n):
+        raise ValueError("Addition and multiplication tables must both be n x n.")
+    return a, m
+
+
+def _zero(add: np.ndarray, zero: Optional[int]) -> int:
+    if zero is not None:
+        return zero
+    z = ring_numpy.find_multiplicative_identity(add)  # the identity of + is zero
+    if z is None:
+        raise ValueError("The addition table has no identity element.")
+    return z
+
+
+def closure_failure(add: Any, mul: Any, subset: Sequence[int], ideal: bool = False) -> Optional[Tuple[int, str, int, int]]:
+    """
+    None if subset is closed (a subring, or with ideal=True a two-sided ideal),
+    else (a, op, b, result): the first operation in row-major order leaving
+    it, checked in one vectorized pass per operation.
+    """
+    s, m = _tables(add, mul)
+    members = np.zeros(len(m), dtype=bool)
+    idx = np.asarray(sorted(set(subset)), dtype=np.int64)
+    members[idx] = True
+    ar = np.arange(len(m))
+    checks = [("+", s, idx, idx)]
+    if ideal:
+        checks += [("*", m, idx, ar), ("*", m, ar, idx)]
+    else:
+        checks.append(("*", m, idx, idx))
+    for op, t, rows, cols in checks:
+        out = t[np.ix_(rows, cols)]
+        hit = ring_numpy.first_true(~members[out])
+        if hit is not None:
+            a, b = int(rows[hit[0]]), int(cols[hit[1]])
+            return (a, op, b, int(out[hit]))
+    return None
+
+
+def _close(s: np.ndarray, m: np.ndarray, members: np.ndarray, frontier: np.ndarray, ideal: bool) -> np.ndarray:
+    """Grow the membership bitmap until closed; frontier are the members not yet combined."""
+    n = len(m)
+    ar = np.arange(n)
+    while len(frontier):
+        inside = np.flatnonzero(members)
+        found = [s[np.ix_(frontier, inside)].ravel()]  # additive closure (sums are commutative)
+        if ideal:
+            found += [m[np.ix_(frontier, ar)].ravel(), m[np.ix_(ar, frontier)].ravel()]
+        else:
+            found += [m[np.ix_(frontier, inside)].ravel(), m[np.ix_(inside, frontier)].ravel()]
+        new = np.unique(np.concatenate(found))
+        new = new[~members[new]]
+        members[new] = True
+        frontier = new
+    return members
+
+
+def generated(add: Any, mul: Any, generators: Sequence[int], ideal: bool = False,
+              zero: Optional[int] = None) -> List[int]:
+    """
+    Elements of the subring (or with ideal=True the two-sided ideal) generated
+    by generators. zero defaults to the identity of the addition table.
+    """
+    s, m = _tables(add, mul)
+    members = np.zeros(len(m), dtype=bool)
+    start = np.unique(np.asarray([_zero(s, zero), *generators], dtype=np.int64))
+    members[start] = True
+    return np.flatnonzero(_close(s, m, members, start, ideal)).tolist()
+
+
+def enumerate_closed(add: Any, mul: Any, ideal: bool = False, zero: Optional[int] = None,
+                     limit: int = MAX_ENUMERATED) -> List[List[int]]:
+    """
+    Every subring (or two-sided ideal) of a small custom ring, smallest first.
+
+    Each one is the closure of a smaller one plus one element, so the lattice
+    is walked from {0} upwards. Pruning: every subring is expanded once (keyed
+    by its membership bitmap), and closure(H + x) only depends on the subring
+    (ideal) generated by x alone, so of the elements outside H one per such
+    cyclic subring is tried, starting from the union instead of from scratch.
+    Raises ValueError once more than limit are found.
+    """
+    s, m = _tables(add, mul)
+    n = len(m)
+    z = _zero(s, zero)
+    # the subring/ideal generated by each single element (its "cyclic" closure)
+    cyclic = []
+    for x in range(n):
+        members = np.zeros(n, dtype=bool)
+        start = np.unique(np.array([z, x]))
+        members[start] = True
+        cyclic.append(_close(s, m, members, start, ideal))
+    # elements with the same cyclic closure give the same extensions
+    keys = {}
+    for x in range(n):
+        keys.setdefault(cyclic[x].tobytes(), x)
+    representatives = sorted(keys.values())
+
+    bottom = cyclic[z]
+    seen = {bottom.tobytes()}
+    found = [bottom]
+    level = [bottom]
+    while level:
+        following = []
+        for h in level:
+            for x in representatives:
+                if h[x]:
+                    continue  # then all of cyclic[x] is in h already
+                members = h | cyclic[x]
+                k = _close(s, m, members, np.flatnonzero(members & ~h), ideal)
+                key = k.tobytes()
+                if key in seen:
+                    continue
+                seen.add(key)
+                found.append(k)
+                following.append(k)
+                if len(found) > limit:
+                    raise ValueError(f"More than {limit} {'ideals' if ideal else 'subrings'}; raise the limit to list them all.")
+        level = following
+    found.sort(key=lambda k: (int(k.sum()), np.flatnonzero(k).tolist()))
+    return [np.flatnonzero(k).tolist() for k in found]
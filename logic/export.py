@@ -0,0 +1,438 @@
+# logic/export.py
+"""
+Streaming export of analysis results.
+
+Rows are written as they arrive, one per ring, so exports never need the
+whole batch in memory. Formats:
+
+    csv       fixed columns: source, batch, n, error, then per property its
+              value and one column per witness ("integral domain.zero divisors")
+    jsonl     one JSON object per ring with the same keys
+    columnar  compact binary, column by column in row groups (see ColumnarWriter)
+    txt       the human-readable per-batch report
+
+Any format can be gzip-compressed (compress=True, or a path ending in .gz).
+"""
+import csv
+import gzip
+import io
+import json
+import struct
+import sys
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from logic.profiling import Report, flatten_profile, format_profile, profile_columns
+
+Result = Dict[str, Dict[str, Any]]
+
+BASE_COLUMNS = ["source", "batch", "n", "error"]
+FORMATS = ("csv", "jsonl", "columnar", "txt")
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".frc": "columnar", ".txt": "txt"}
+
+# Output is handed to the OS in blocks of this size.
+WRITE_BUFFER = 1 << 20
+# Rows per bulk write (csv/jsonl) and per row group (columnar).
+ROWS_PER_FLUSH = 1024
+ROW_GROUP_SIZE = 65536
+
+COLUMNAR_MAGIC = b"FRCOL1\n"
+# Per-value type codes of "json" columns: missing, text as is, JSON, JSON array read back as a tuple.
+JSON_TYPES = {None: 0, str: 1, object: 2, tuple: 3}
+
+
+def flatten_result(res: Result) -> Dict[str, Any]:
+    """One flat column per property plus one per witness, e.g. 'integral domain.zero divisors'."""
+    row: Dict[str, Any] = {}
+    for prop, data in res.items():
+        row[prop] = data["value"]
+        for key, val in data.items():
+            if key != "value":
+                row[f"{prop}.{key}"] = val
+    return row
+
+
+WITNESS_SET_KEYS = ["units", "inverses", "zero divisors", "idempotents", "nilpotents", "nilpotency index"]
+
+
+def result_columns(with_axioms: bool, with_profile: bool = False, with_witnesses: bool = False) -> List[str]:
+    """
+    Fixed schema: base columns, then one column per property and one per
+    witness; with_witnesses adds the complete witness sets (lists), and
+    with_profile adds profile.<stage>.<metric> columns at the end.
+    """
+    fields = []
+    if with_axioms:
+        fields.append(("ring axioms", ["failed", "counterexample", "reason", "mode", "triples checked", "zero"]))
+    fields += [
+        ("commutative", ["counterexample"]),
+        ("has identity", ["identity"]),
+        ("integral domain", ["zero divisors"]),
+        ("division ring", ["missing inverse"]),
+    ]
+    if with_witnesses:
+        fields.append(("witness sets", WITNESS_SET_KEYS))
+    columns = list(BASE_COLUMNS)
+    for prop, keys in fields:
+        columns.append(prop)
+        columns += [f"{prop}.{k}" for k in keys]
+    if with_profile:
+        columns += profile_columns()
+    return columns
+
+
+def explain_failure(data: Dict[str, Any]) -> Optional[str]:
+    """Why a property failed, as shown in the GUI and the text export (None if it holds)."""
+    if data["value"]:
+        return None
+    if data.get("failed"):
+        # ring axiom report
+        detail = data.get("reason") or (f"counterexample {data['counterexample']}"
+                                          if data.get("counterexample") is not None else None)
+        return f"Failed: {data['failed']}" + (f" ({detail})" if detail else "")
+    if data.get("counterexample") is not None:
+        return f"Counterexample: {data['counterexample']}"
+    if "zero divisors" in data:
+        if data["zero divisors"] is not None:
+            return f"Zero divisors: {data['zero divisors']}"
+        return "Skipped: no identity element"
+    if "missing inverse" in data:
+        if data["missing inverse"] is not None:
+            return f"Missing inverse for: {data['missing inverse']}"
+        return "Skipped: no identity element"
+    if "identity" in data and data["identity"] is None:
+        return "No multiplicative identity found"
+    return None
+
+
+def describe_witness_sets(data: Dict[str, Any], limit: Optional[int] = None) -> List[str]:
+    """Lines listing a "witness sets" entry (at most limit elements per set, if given)."""
+    def show(items: List[Any]) -> str:
+        if limit is not None and len(items) > limit:
+            return ", ".join(map(str, items[:limit])) + f", ... ({len(items) - limit} more)"
+        return ", ".join(map(str, items)) or "none"
+
+    pairs = lambda xs, ys, sep: [f"{x}{sep}{y}" for x, y in zip(xs, ys)]  # noqa: E731
+    return [
+        f"Units ({len(data['units'])}, with inverse): {show(pairs(data['units'], data['inverses'], ' -> '))}",
+        f"Zero divisors ({len(data['zero divisors'])}): {show(data['zero divisors'])}",
+        f"Idempotents ({len(data['idempotents'])}): {show(data['idempotents'])}",
+        f"Nilpotents ({len(data['nilpotents'])}, with index): "
+        f"{show(pairs(data['nilpotents'], data['nilpotency index'], '^'))}",
+    ]
+
+
+def detect_format(path: str) -> Tuple[str, bool]:
+    """(format, gzip) from a file name such as results.csv or results.jsonl.gz."""
+    lower = path.lower()
+    compress = lower.endswith(".gz")
+    if compress:
+        lower = lower[:-3]
+    for ext, fmt in EXTENSIONS.items():
+        if lower.endswith(ext):
+            return fmt, compress
+    raise ValueError(f"Cannot tell the export format from '{path}' (use one of {', '.join(EXTENSIONS)})")
+
+
+def _cell(value: Any) -> Any:
+    return "" if value is None else value
+
+
+class ResultWriter:
+    """
+    Base class: write(result, source=, batch=, n=, error=, profile=) per ring, then close().
+
+    Subclasses get a binary stream (already gzip-wrapped and buffered).
+    """
+
+    def __init__(self, stream: BinaryIO, columns: Optional[List[str]] = None):
+        self.stream = stream
+        self.columns = columns or result_columns(with_axioms=True)
+        self.rows = 0
+        self.closers: List[Any] = []  # files to close after the last write (set by open_writer)
+
+    def write(self, result: Optional[Result], source: str = "", batch: int = 0,
+              n: Optional[int] = None, error: Optional[str] = None,
+              profile: Optional[Report] = None) -> None:
+        row: Dict[str, Any] = {"source": source, "batch": batch, "n": n, "error": error}
+        if result is not None:
+            row.update(flatten_result(result))
+        if profile is not None:
+            row.update(flatten_profile(profile))
+        self._write(row, result, profile)
+        self.rows += 1
+
+    def _write(self, row: Dict[str, Any], result: Optional[Result], profile: Optional[Report]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self.stream.flush()
+        for f in self.closers:
+            f.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _TextWriter(ResultWriter):
+    """Text formats buffer rows and hand them to the stream in bulk."""
+
+    def __init__(self, stream: BinaryIO, columns: Optional[List[str]] = None):
+        super().__init__(stream, columns)
+        self.text = io.TextIOWrapper(stream, encoding="utf-8", newline="", write_through=False)
+        self._pending: List[Any] = []
+
+    def _write(self, row: Dict[str, Any], result: Optional[Result], profile: Optional[Report]) -> None:
+        self._pending.append(self._format(row, result, profile))
+        if len(self._pending) >= ROWS_PER_FLUSH:
+            self._flush()
+
+    def _format(self, row: Dict[str, Any], result: Optional[Result], profile: Optional[Report]) -> Any:
+        raise NotImplementedError
+
+    def _flush(self) -> None:
+        self.text.write("".join(self._pending))
+        self._pending.clear()
+
+    def close(self) -> None:
+        self._flush()
+        self.text.flush()
+        self.text.detach()
+        super().close()
+
+
+class CsvWriter(_TextWriter):
+    def __init__(self, stream: BinaryIO, columns: Optional[List[str]] = None):
+        super().__init__(stream, columns)
+        self._line = io.StringIO()
+        self._csv = csv.writer(self._line)
+        self._pending.append(self._format_cells(self.columns))
+
+    def _format_cells(self, cells: List[Any]) -> str:
+        self._line.seek(0)
+        self._line.truncate()
+        self._csv.writerow(cells)
+        return self._line.getvalue()
+
+    def _format(self, row: Dict[str, Any], result: Optional[Result], profile: Optional[Report]) -> str:
+        return self._format_cells([_cell(row.get(c)) for c in self.columns])
+
+
+class JsonlWriter(_TextWriter):
+    def _format(self, row: Dict[str, Any], result: Optional[Result], profile: Optional[Report]) -> str:
+        return json.dumps(row) + "\n"
+
+
+class TxtWriter(_TextWriter):
+    """The per-batch report the GUI used to write (one block per ring)."""
+
+    def _format(self, row: Dict[str, Any], result: Optional[Result], profile: Optional[Report]) -> str:
+        lines = [f"Batch {row['batch']}"]
+        if row["error"]:
+            lines.append(f"Error: {row['error']}")
+        for prop, data in (result or {}).items():
+            if prop == "witness sets":
+                lines.append(f"{prop}:")
+                lines += [f"    {line}" for line in describe_witness_sets(data)]
+                continue
+            lines.append(f"{prop}: {'Yes' if data['value'] else 'No'}")
+            explanation = explain_failure(data)
+            if explanation:
+                lines.append(f"    {explanation}")
+        if profile:
+            lines.append("Profile:")
+            lines += format_profile(profile)
+        return "\n".join(lines) + "\n\n"
+
+
+class ColumnarWriter(ResultWriter):
+    """
+    Compact binary columns, written in row groups of ROW_GROUP_SIZE rings.
+
+    Layout: COLUMNAR_MAGIC, then per row group a little-endian uint32 header
+    length, a JSON header {"rows", "columns": [{"name", "kind", "sizes"}]} and
+    the column buffers back to back, then a JSON footer listing the columns and
+    row group offsets, its uint64 length and COLUMNAR_MAGIC again.
+
+    Column kinds: "bool" (int8, -1 = missing), "int" (int64 values + uint8
+    validity), "float" (float64 values + uint8 validity, e.g. profile
+    timings), "str" (int64 end offsets + uint8 validity + UTF-8 bytes) and
+    "json" for columns with other values, e.g. counterexample tuples or
+    witness lists (int64 end offsets + uint8 type per value, see JSON_TYPES,
+    + the values as text or UTF-8 JSON). read_columnar() reads it back.
+    """
+
+    def __init__(self, stream: BinaryIO, columns: Optional[List[str]] = None):
+        super().__init__(stream, columns)
+        self._values: Dict[str, List[Any]] = {c: [] for c in self.columns}
+        self._groups: List[Dict[str, int]] = []
+        self._offset = len(COLUMNAR_MAGIC)
+        stream.write(COLUMNAR_MAGIC)
+
+    def _write(self, row: Dict[str, Any], result: Optional[Result], profile: Optional[Report]) -> None:
+        for c in self.columns:
+            self._values[c].append(row.get(c))
+        if len(self._values[self.columns[0]]) >= ROW_GROUP_SIZE:
+            self._flush_group()
+
+    @staticmethod
+    def _encode(values: List[Any]) -> Tuple[str, List[bytes]]:
+        present = [v for v in values if v is not None]
+        valid = np.array([v is not None for v in values], dtype=np.uint8)
+        if all(isinstance(v, bool) for v in present):
+            col = np.array([-1 if v is None else int(v) for v in values], dtype=np.int8)
+            return "bool", [col.tobytes()]
+        if all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in present):
+            col = np.array([0 if v is None else v for v in values], dtype="<i8")
+            return "int", [col.tobytes(), valid.tobytes()]
+        if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+            col = np.array([0.0 if v is None else v for v in values], dtype="<f8")
+            return "float", [col.tobytes(), valid.tobytes()]
+        if all(isinstance(v, str) for v in present):
+            encoded = [b"" if v is None else v.encode("utf-8") for v in values]
+            ends = np.cumsum([len(e) for e in encoded], dtype="<i8")
+            return "str", [ends.tobytes(), valid.tobytes(), b"".join(encoded)]
+        types = np.array([JSON_TYPES[None if v is None else str if isinstance(v, str)
+                                    else tuple if isinstance(v, tuple) else object] for v in values], dtype=np.uint8)
+        encoded = [
+            b"" if v is None else (v if isinstance(v, str) else json.dumps(v)).encode("utf-8")
+            for v in values
+        ]
+        ends = np.cumsum([len(e) for e in encoded], dtype="<i8")
+        return "json", [ends.tobytes(), types.tobytes(), b"".join(encoded)]
+
+    def _flush_group(self) -> None:
+        rows = len(self._values[self.columns[0]])
+        if not rows:
+            return
+        header: Dict[str, Any] = {"rows": rows, "columns": []}
+        buffers: List[bytes] = []
+        for c in self.columns:
+            kind, parts = self._encode(self._values[c])
+            header["columns"].append({"name": c, "kind": kind, "sizes": [len(p) for p in parts]})
+            buffers += parts
+            self._values[c] = []
+        head = json.dumps(header).encode("utf-8")
+        self.stream.write(struct.pack("<I", len(head)))
+        self.stream.write(head)
+        for b in buffers:
+            self.stream.write(b)
+        self._groups.append({"offset": self._offset, "rows": rows})
+        self._offset += 4 + len(head) + sum(len(b) for b in buffers)
+
+    def close(self) -> None:
+        self._flush_group()
+        footer = json.dumps({"columns": self.columns, "row groups": self._groups}).encode("utf-8")
+        self.stream.write(footer)
+        self.stream.write(struct.pack("<Q", len(footer)))
+        self.stream.write(COLUMNAR_MAGIC)
+        super().close()
+
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "columnar": ColumnarWriter, "txt": TxtWriter}
+
+
+def open_writer(
+    path: str,
+    fmt: Optional[str] = None,
+    compress: Optional[bool] = None,
+    columns: Optional[List[str]] = None
+) -> ResultWriter:
+    """
+    Writer for path ("-" is stdout). fmt and compress default to what the
+    file name says (see detect_format); columns to the schema with axioms.
+    """
+    detected_fmt, detected_gz = "jsonl", False
+    if path != "-":
+        try:
+            detected_fmt, detected_gz = detect_format(path)
+        except ValueError:
+            if fmt is None:
+                raise
+    fmt = fmt or detected_fmt
+    compress = detected_gz if compress is None else compress
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    closers: List[Any] = []
+    if path == "-":
+        raw: BinaryIO = sys.stdout.buffer
+    else:
+        raw = open(path, "wb", buffering=WRITE_BUFFER)
+        closers.append(raw)
+    stream: BinaryIO = raw
+    if compress:
+        stream = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+        closers.insert(0, stream)
+    writer = WRITERS[fmt](stream, columns)
+    writer.closers = closers
+    return writer
+
+
+def export_results(
+    results: Iterable[Tuple[Optional[Result], Dict[str, Any]]],
+    path: str,
+    fmt: Optional[str] = None,
+    compress: Optional[bool] = None,
+    columns: Optional[List[str]] = None
+) -> int:
+    """Stream (result, meta) pairs to path; meta holds source/batch/n/error. Returns the row count."""
+    with open_writer(path, fmt, compress, columns) as writer:
+        for result, meta in results:
+            writer.write(result, **meta)
+        return writer.rows
+
+
+def read_columnar(path: str) -> Dict[str, List[Any]]:
+    """Read a columnar export back into {column: values} (gzip is detected)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    if not data.startswith(COLUMNAR_MAGIC) or not data.endswith(COLUMNAR_MAGIC):
+        raise ValueError("Not a columnar results file.")
+    end = len(data) - len(COLUMNAR_MAGIC)
+    (footer_len,) = struct.unpack("<Q", data[end - 8:end])
+    footer = json.loads(data[end - 8 - footer_len:end - 8])
+    out: Dict[str, List[Any]] = {c: [] for c in footer["columns"]}
+
+    for group in footer["row groups"]:
+        pos = group["offset"]
+        (head_len,) = struct.unpack("<I", data[pos:pos + 4])
+        header = json.loads(data[pos + 4:pos + 4 + head_len])
+        pos += 4 + head_len
+        for col in header["columns"]:
+            parts = []
+            for size in col["sizes"]:
+                parts.append(data[pos:pos + size])
+                pos += size
+            values = out[col["name"]]
+            if col["kind"] == "bool":
+                values += [None if v < 0 else bool(v) for v in np.frombuffer(parts[0], dtype=np.int8)]
+            elif col["kind"] == "int":
+                ints = np.frombuffer(parts[0], dtype="<i8")
+                valid = np.frombuffer(parts[1], dtype=np.uint8)
+                values += [int(v) if ok else None for v, ok in zip(ints, valid)]
+            elif col["kind"] == "float":
+                floats = np.frombuffer(parts[0], dtype="<f8")
+                valid = np.frombuffer(parts[1], dtype=np.uint8)
+                values += [float(v) if ok else None for v, ok in zip(floats, valid)]
+            else:
+                ends = np.frombuffer(parts[0], dtype="<i8")
+                types = np.frombuffer(parts[1], dtype=np.uint8)
+                start = 0
+                for e, t in zip(ends, types):
+                    text = parts[2][start:e].decode("utf-8")
+                    start = int(e)
+                    if t == JSON_TYPES[None]:
+                        values.append(None)
+                    elif col["kind"] == "str" or t == JSON_TYPES[str]:
+                        values.append(text)
+                    else:
+                        value = json.loads(text)
+                        values.append(tuple(value) if t == JSON_TYPES[tuple] else value)
+    return out
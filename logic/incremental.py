@@ -0,0 +1,228 @@
+# logic/incremental.py
+"""
+Live analysis of an (add, mul) pair that is edited one cell at a time.
+
+IncrementalAnalysis keeps per-property evidence between edits instead of
+rescanning the tables:
+
+    identity candidates   per element, how many cells of its row and column
+                          break e*x == x == x*e (likewise for the additive zero)
+    commutativity         per row, how many j have a*j != j*a
+    zero divisors         per row, how many non-zero b have a*b == 0
+    inverses              per row, how many b have a*b == b*a == identity
+    associativity         per a, how many (a, b, c) have (ab)c != a(bc)
+
+set_mul(i, j, v) only revisits row i, column j and, for associativity, the
+triples whose evaluation reads cell (i, j) (about 4n of them). Witnesses are
+read from the counts when result() is called, so they are the same first
+counterexamples analyze_ring reports.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from logic import ring_numpy
+
+Result = Dict[str, Dict[str, Any]]
+
+# Associativity is tracked up to this size (the initial count is n^3).
+ASSOCIATIVITY_MAX_N = 256
+
+
+def _identity_misses(t: np.ndarray):
+    """Per element e: cells of row e with t[e, x] != x, cells of column e with t[x, e] != x."""
+    ar = np.arange(len(t))
+    return (t != ar).sum(axis=1), (t != ar[:, None]).sum(axis=0)
+
+
+def _delta(now: bool, before: bool) -> int:
+    return int(now) - int(before)
+
+
+def _first(counts: np.ndarray, skip: Optional[int] = None) -> Optional[int]:
+    hits = np.flatnonzero(counts)
+    if skip is not None:
+        hits = hits[hits != skip]
+    return int(hits[0]) if len(hits) else None
+
+
+class IncrementalAnalysis:
+    """
+    Analysis of add/mul tables under single-cell edits (see the module docstring).
+
+    Entries are not range checked here: set_add/set_mul expect 0 <= v < n.
+    With fixed_zero=None the first additive identity is zero (element 0 while
+    there is none), otherwise fixed_zero is, like analyze_ring's zero_index.
+    """
+
+    def __init__(self, add: Any, mul: Any, fixed_zero: Optional[int] = None,
+                 associativity: Optional[bool] = None):
+        self.add = np.array(ring_numpy.as_array(add), dtype=np.int64)
+        self.mul = np.array(ring_numpy.as_array(mul), dtype=np.int64)
+        n = self.n = len(self.mul)
+        if self.add.shape != (n, n) or self.mul.shape != (n, n):
+            raise ValueError("Addition and multiplication tables must both be n x n.")
+        self.fixed_zero = fixed_zero
+        self.track_associativity = n <= ASSOCIATIVITY_MAX_N if associativity is None else associativity
+
+        self.add_row_miss, self.add_col_miss = _identity_misses(self.add)
+        self.row_miss, self.col_miss = _identity_misses(self.mul)
+        self.asymmetric = (self.mul != self.mul.T).sum(axis=1)
+        self.zero = self._find_zero()
+        self.zero_count = self._zero_counts()
+        self.identity = self._find_identity()
+        self.inverse_count = self._inverse_counts()
+        self.bad_triples = self._bad_triples() if self.track_associativity else None
+
+    # ---------- full recomputation (construction, zero/identity changes) ----------
+
+    def _find_zero(self) -> int:
+        if self.fixed_zero is not None:
+            return self.fixed_zero
+        z = _first((self.add_row_miss == 0) & (self.add_col_miss == 0))
+        return 0 if z is None else z
+
+    def _find_identity(self) -> Optional[int]:
+        return _first((self.row_miss == 0) & (self.col_miss == 0))
+
+    def _zero_counts(self) -> np.ndarray:
+        hits = self.mul == self.zero
+        if 0 <= self.zero < self.n:
+            hits[:, self.zero] = False
+        return hits.sum(axis=1)
+
+    def _inverse_counts(self) -> Optional[np.ndarray]:
+        e = self.identity
+        if e is None:
+            return None
+        return ((self.mul == e) & (self.mul.T == e)).sum(axis=1)
+
+    def _bad_triples(self) -> np.ndarray:
+        """Per a, the number of (b, c) with (ab)c != a(bc), one slab of a at a time."""
+        t, n = self.mul, self.n
+        counts = np.zeros(n, dtype=np.int64)
+        step = max(1, ring_numpy.CHUNK_CELLS // max(1, n * n))
+        for lo in range(0, n, step):
+            ab = t[lo:lo + step]                      # (a, b) -> ab
+            left = t[ab]                              # (a, b, c) -> (ab)c
+            right = t[lo:lo + step][:, t]             # (a, b, c) -> a(bc)
+            counts[lo:lo + step] = (left != right).sum(axis=(1, 2))
+        return counts
+
+    # ---------- edits ----------
+
+    def set_add(self, i: int, j: int, v: int) -> None:
+        old, v = int(self.add[i, j]), int(v)
+        if old == v:
+            return
+        self.add[i, j] = v
+        self.add_row_miss[i] += _delta(v != j, old != j)
+        self.add_col_miss[j] += _delta(v != i, old != i)
+        zero = self._find_zero()
+        if zero != self.zero:
+            self.zero = zero
+            self.zero_count = self._zero_counts()
+
+    def _touched_triples(self, i: int, j: int) -> np.ndarray:
+        """
+        Flat indices a*n^2 + b*n + c of the triples whose evaluation reads mul[i, j].
+
+        Changing mul[i, j] only moves triples between the last two groups via
+        (i, j, j) and (i, i, j), which the first two always contain.
+        """
+        n, t = self.n, self.mul
+        ar = np.arange(n)
+        a1, b1 = np.nonzero(t == i)   # (ab)c reads [ab, c] = [i, j] when c = j
+        b2, c2 = np.nonzero(t == j)   # a(bc) reads [a, bc] = [i, j] when a = i
+        flat = np.concatenate([
+            i * n * n + j * n + ar,    # (ab)c with (a, b) = (i, j)
+            ar * n * n + i * n + j,    # a(bc) with (b, c) = (i, j)
+            a1 * n * n + b1 * n + j,
+            i * n * n + b2 * n + c2,
+        ])
+        return np.unique(flat)
+
+    def _bad(self, flat: np.ndarray) -> np.ndarray:
+        n, t = self.n, self.mul
+        a, rest = np.divmod(flat, n * n)
+        b, c = np.divmod(rest, n)
+        return t[t[a, b], c] != t[a, t[b, c]]
+
+    def set_mul(self, i: int, j: int, v: int) -> None:
+        t = self.mul
+        old, v = int(t[i, j]), int(v)
+        if old == v:
+            return
+        if self.track_associativity:
+            # the triples reading (i, j) are the same before and after the edit
+            touched = self._touched_triples(i, j)
+            slab = touched // (self.n * self.n)
+            np.subtract.at(self.bad_triples, slab, self._bad(touched))
+        t[i, j] = v
+
+        self.row_miss[i] += _delta(v != j, old != j)
+        self.col_miss[j] += _delta(v != i, old != i)
+        if i != j:
+            change = _delta(v != t[j, i], old != t[j, i])
+            self.asymmetric[i] += change
+            self.asymmetric[j] += change
+        if j != self.zero:
+            self.zero_count[i] += _delta(v == self.zero, old == self.zero)
+
+        identity = self._find_identity()
+        if identity != self.identity:
+            self.identity = identity
+            self.inverse_count = self._inverse_counts()
+        elif identity is not None:
+            e = identity
+            for a, b in {(i, j), (j, i)}:
+                # pair (a, b) counts for row a when t[a, b] == t[b, a] == e
+                hit_now = t[a, b] == e and t[b, a] == e
+                before_ab = old if (a, b) == (i, j) else t[a, b]
+                before_ba = old if (b, a) == (i, j) else t[b, a]
+                hit_before = before_ab == e and before_ba == e
+                self.inverse_count[a] += _delta(hit_now, hit_before)
+
+        if self.track_associativity:
+            np.add.at(self.bad_triples, slab, self._bad(touched))
+
+    # ---------- results ----------
+
+    def result(self) -> Result:
+        """Same structure as analyze_ring(mul, zero_index=zero, axioms="off"), plus "associative" when tracked."""
+        t, z, e = self.mul, self.zero, self.identity
+        result: Result = {}
+
+        a = _first(self.asymmetric)
+        result["commutative"] = {
+            "value": a is None,
+            "counterexample": None if a is None else (a, _first(t[a] != t[:, a])),
+        }
+        result["has identity"] = {"value": e is not None, "identity": e}
+
+        zero_divisors = None
+        if e is not None:
+            a = _first(self.zero_count, skip=z)
+            if a is not None:
+                zero_divisors = (a, _first(t[a] == z, skip=z))
+        result["integral domain"] = {
+            "value": e is not None and zero_divisors is None,
+            "zero divisors": zero_divisors,
+        }
+
+        missing = None
+        if e is not None:
+            missing = _first(self.inverse_count == 0, skip=z)
+        result["division ring"] = {
+            "value": e is not None and missing is None,
+            "missing inverse": missing,
+        }
+
+        if self.track_associativity:
+            a = _first(self.bad_triples)
+            counterexample = None
+            if a is not None:
+                b, c = ring_numpy.first_true(t[t[a]] != t[a][t])
+                counterexample = (a, b, c)
+            result["associative"] = {"value": a is None, "counterexample": counterexample}
+        return result
@@ -0,0 +1,238 @@
+# logic/product_ring.py
+"""
+Direct products R1 x R2 x ... x Rk analyzed from their factors.
+
+The product table has (|R1| * ... * |Rk|)^2 cells, but every property
+analyze_ring reports follows from the factors:
+
+    commutative      iff every factor is
+    identity         (e1, ..., ek) iff every factor has one
+    integral domain  never with two non-trivial factors: (e1, 0, ...) * (0, e2, ...) = 0
+    division ring    never with two non-trivial factors: (e1, 0, ...) has no inverse
+    ring axioms      iff every factor is a ring
+    witness sets     units, idempotents, nilpotents: tuples of the factors' ones
+                     (nilpotency index = the largest factor index);
+                     zero divisors: non-zero tuples with a coordinate that is
+                     zero or a zero divisor in a non-trivial factor
+
+so ProductRing.analyze() analyzes each factor (through the result cache when
+one is given) and composes the results; the product table is never built.
+
+Elements are labeled in mixed radix like ring_builders.direct_product: the
+tuple (r1, ..., rk) is ((r1 * |R2| + r2) * |R3| + r3) ..., first factor most
+significant. Witnesses are lifted from a factor by putting the factor's zero
+in every other coordinate; they are valid but not necessarily the first ones
+in label order.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from logic import ring_numpy
+from logic.result_cache import ResultCache, cached_analyze
+from logic.ring_canon import analysis_zero
+from logic.znz import ZnZRing
+
+Result = Dict[str, Dict[str, Any]]
+
+
+class ProductRing:
+    """
+    The direct product of `factors`: (add, mul) table pairs (add may be None),
+    full ZnZRings or other ProductRings.
+
+    analyze() returns the same structure as ring_checker.analyze_ring.
+    """
+
+    def __init__(self, factors: Sequence[Any]):
+        if not factors:
+            raise ValueError("A direct product needs at least one factor.")
+        self.factors = []
+        for f in factors:
+            if isinstance(f, ZnZRing) and not f.is_full:
+                raise ValueError(f"Only all of Z/{f.n}Z can be a factor, not an element subset.")
+            if not isinstance(f, (ZnZRing, ProductRing)):
+                add, mul = f
+                f = (add, mul)
+            self.factors.append(f)
+        self.sizes = [len(f) if not isinstance(f, tuple) else len(f[1]) for f in self.factors]
+        self.strides = [1] * len(self.sizes)
+        for i in range(len(self.sizes) - 2, -1, -1):
+            self.strides[i] = self.strides[i + 1] * self.sizes[i + 1]
+
+    def __len__(self) -> int:
+        return self.strides[0] * self.sizes[0]
+
+    def __repr__(self) -> str:
+        return f"ProductRing({self.sizes})"
+
+    # ---------- labels ----------
+
+    def label(self, coords: Sequence[int]) -> int:
+        """Label of the element with the given factor coordinates."""
+        return sum(c * s for c, s in zip(coords, self.strides))
+
+    def coords(self, label: int) -> Tuple[int, ...]:
+        """Factor coordinates of a label."""
+        return tuple((label // s) % size for s, size in zip(self.strides, self.sizes))
+
+    def _lift(self, zeros: List[int], i: int, value: Any) -> Any:
+        """A factor-i witness (element or tuple of elements) as product labels."""
+        if isinstance(value, tuple):
+            return tuple(self._lift(zeros, i, v) if not isinstance(v, str) else v for v in value)
+        if isinstance(value, list):
+            return [self._lift(zeros, i, v) for v in value]
+        if value is None:
+            return None
+        base = self.label(zeros) - zeros[i] * self.strides[i]
+        return base + int(value) * self.strides[i]
+
+    # ---------- tables (only for display / small rings) ----------
+
+    def tables(self) -> Tuple[Any, Any]:
+        """(add, mul) of the product, materialized with ring_builders.direct_product."""
+        from logic import ring_builders
+        return ring_builders.direct_product(*(self._factor_tables(f) for f in self.factors))
+
+    @staticmethod
+    def _factor_tables(f: Any) -> Tuple[Any, Any]:
+        if isinstance(f, ZnZRing):
+            return f.add_table(), f.mul_table()
+        if isinstance(f, ProductRing):
+            return f.tables()
+        if f[0] is None:
+            raise ValueError("Factors without an addition table cannot be materialized.")
+        return f
+
+    # ---------- analysis ----------
+
+    def _analyze_factor(self, f: Any, cache: Optional[ResultCache], options: Dict[str, Any]) -> Tuple[Result, int]:
+        """(result, zero) of one factor."""
+        if isinstance(f, ZnZRing):
+            res = f.analyze()
+            if options.get("witnesses"):
+                # Z/nZ factors are small next to the product; their sets come from the table
+                res["witness sets"] = {"value": True, **ring_numpy.witness_sets(
+                    f.mul_table(), 0, res["has identity"]["identity"])}
+            if options.get("axioms", "exact") != "off":
+                res = dict(res, **{"ring axioms": {
+                    "value": True, "failed": None, "counterexample": None, "mode": "closed form",
+                    "triples checked": 0, "zero": 0, "generators": [1] if f.n > 1 else [],
+                }})
+            return res, 0
+        if isinstance(f, ProductRing):
+            return f._compose(cache, options)
+        add, mul = f
+        res = cached_analyze(cache, mul, add, **options)
+        axioms = res.get("ring axioms")
+        zero = axioms["zero"] if axioms and axioms["zero"] is not None else analysis_zero(mul, add, **options)
+        return res, zero
+
+    def analyze(self, cache: Optional[ResultCache] = None, **options: Any) -> Result:
+        """
+        Analyze every factor (analyze_ring options apply to each) and compose.
+
+        If a factor fails the ring axioms, only the "ring axioms" entry is
+        returned, with the factor's counterexample lifted into the product.
+        """
+        return self._compose(cache, options)[0]
+
+    def _compose(self, cache: Optional[ResultCache], options: Dict[str, Any]) -> Tuple[Result, int]:
+        """(result, zero) of the product."""
+        factor_results = []
+        zeros = []
+        for f in self.factors:
+            res, zero = self._analyze_factor(f, cache, options)
+            factor_results.append(res)
+            zeros.append(zero)
+        zero = self.label(zeros)
+        lift = lambda i, v: self._lift(zeros, i, v)  # noqa: E731
+        result: Result = {}
+
+        reports = [res.get("ring axioms") for res in factor_results]
+        if any(r is not None for r in reports):
+            checked = [(i, r) for i, r in enumerate(reports) if r is not None]
+            report = {
+                "value": True,
+                "failed": None,
+                "counterexample": None,
+                "mode": next((r["mode"] for _, r in checked if r["mode"] != "closed form"), "closed form"),
+                "triples checked": sum(r["triples checked"] for _, r in checked),
+                "zero": zero,
+            }
+            failed = next(((i, r) for i, r in checked if not r["value"]), None)
+            if failed is not None:
+                i, r = failed
+                report.update({"value": False, "failed": r["failed"], "counterexample": lift(i, r["counterexample"])})
+                if r.get("reason"):
+                    report["reason"] = f"factor {i + 1}: {r['reason']}"
+                report["zero"] = None if r["zero"] is None else zero
+                result["ring axioms"] = report
+                return result, zero
+            if all("generators" in r for _, r in checked):
+                report["generators"] = [g for i, r in checked for g in lift(i, r["generators"])]
+            result["ring axioms"] = report
+
+        asymmetric = next(((i, r["commutative"]) for i, r in enumerate(factor_results)
+                           if not r["commutative"]["value"]), None)
+        result["commutative"] = {
+            "value": asymmetric is None,
+            "counterexample": None if asymmetric is None else lift(asymmetric[0], asymmetric[1]["counterexample"]),
+        }
+
+        identities = [r["has identity"]["identity"] for r in factor_results]
+        identity = None if any(e is None for e in identities) else self.label(identities)
+        result["has identity"] = {"value": identity is not None, "identity": identity}
+
+        nontrivial = [i for i, size in enumerate(self.sizes) if size > 1]
+        if identity is not None and len(nontrivial) >= 2:
+            # (.., e_i, ..) * (.., e_j, ..) = 0 and neither is invertible (e_i != 0 in a non-trivial ring)
+            i, j = nontrivial[-1], nontrivial[-2]
+            result["integral domain"] = {"value": False,
+                                         "zero divisors": (lift(i, identities[i]), lift(j, identities[j]))}
+            result["division ring"] = {"value": False, "missing inverse": lift(i, identities[i])}
+        else:
+            # at most one non-trivial factor (or no identity): the product is isomorphic to it
+            t = nontrivial[0] if nontrivial else 0
+            for prop, key in (("integral domain", "zero divisors"), ("division ring", "missing inverse")):
+                data = factor_results[t][prop]
+                result[prop] = {
+                    "value": identity is not None and data["value"],
+                    key: lift(t, data[key]) if identity is not None else None,
+                }
+
+        if options.get("witnesses"):
+            result["witness sets"] = {"value": True, **self._witness_sets(
+                [r["witness sets"] for r in factor_results], zeros)}
+        return result, zero
+
+    def _labels(self, sets: Sequence[Sequence[int]]) -> np.ndarray:
+        """Labels of every tuple with coordinate i from sets[i], first factor varying slowest."""
+        labels = np.zeros(1, dtype=np.int64)
+        for s, stride in zip(sets, self.strides):
+            labels = (labels[:, None] + np.asarray(s, dtype=np.int64)[None, :] * stride).ravel()
+        return labels
+
+    def _witness_sets(self, factor_sets: List[Dict[str, Any]], zeros: List[int]) -> Dict[str, List[int]]:
+        """The product's witness sets (see the module docstring), in increasing order."""
+        out: Dict[str, List[int]] = {}
+        out["units"] = self._labels([s["units"] for s in factor_sets]).tolist()
+        out["inverses"] = self._labels([s["inverses"] for s in factor_sets]).tolist()
+
+        divisor = np.zeros(1, dtype=bool)
+        for s, size, z in zip(factor_sets, self.sizes, zeros):
+            mask = np.zeros(size, dtype=bool)
+            if size > 1:
+                mask[s["zero divisors"]] = True
+                mask[z] = True
+            divisor = (divisor[:, None] | mask[None, :]).ravel()
+        divisor[self.label(zeros)] = False
+        out["zero divisors"] = np.flatnonzero(divisor).tolist()
+
+        out["idempotents"] = self._labels([s["idempotents"] for s in factor_sets]).tolist()
+        out["nilpotents"] = self._labels([s["nilpotents"] for s in factor_sets]).tolist()
+        index = np.zeros(1, dtype=np.int64)
+        for s in factor_sets:
+            index = np.maximum(index[:, None], np.asarray(s["nilpotency index"], dtype=np.int64)[None, :]).ravel()
+        out["nilpotency index"] = index.tolist()
+        return out
@@ -0,0 +1,220 @@
+# logic/profiling.py
+"""
+Opt-in timing instrumentation for the analysis pipeline.
+
+Hot paths mark their stages with
+
+    with profiling.stage("has identity", cells=n * n):
+        ...
+
+which costs one context-variable lookup unless a Profiler is active:
+
+    with Profiler() as prof:
+        analyze_ring(mul, add_table=add)
+    prof.report()   # {"ring axioms": {"seconds": ..., "cells": ..., ...}, ...}
+
+Each stage records wall time, table cells scanned, peak traced memory
+(tracemalloc, if memory=True) and how often it ran. Stages may nest: the
+outer one includes the inner ones' time, and the inner ones note which stage
+they ran "within". With pstats_path set the whole block also runs under
+cProfile and the stats are dumped there (for snakeviz, pstats, ...).
+"""
+import cProfile
+import functools
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+Report = Dict[str, Dict[str, Any]]
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Stages marked in the code, in pipeline order (fixed export columns).
+STAGES = [
+    "parse",
+    "validate addition",
+    "validate multiplication",
+    "cache lookup",
+    "ring axioms",
+    "convert table",
+    "commutative",
+    "has identity",
+    "integral domain",
+    "division ring",
+    "witness sets",
+    "closed form",
+    "visualize",
+]
+METRICS = ["seconds", "cells", "peak bytes"]
+
+_current: ContextVar[Optional["Profiler"]] = ContextVar("profiler", default=None)
+
+
+class _NullStage:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str, cells: int = 0) -> Any:
+    """Context manager timing `name` in the active Profiler (a no-op without one)."""
+    prof = _current.get()
+    return _NULL_STAGE if prof is None else prof.stage(name, cells)
+
+
+def staged(name: str, cells: Optional[Callable[..., int]] = None) -> Callable[[F], F]:
+    """Decorator form of stage(); cells(*args, **kwargs) gives the cell count from the arguments."""
+    def wrap(fn: F) -> F:
+        @functools.wraps(fn)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            prof = _current.get()
+            if prof is None:
+                return fn(*args, **kwargs)
+            with prof.stage(name, cells(*args, **kwargs) if cells else 0):
+                return fn(*args, **kwargs)
+        return timed  # type: ignore[return-value]
+    return wrap
+
+
+def add_cells(name: str, cells: int) -> None:
+    """Count cells for a stage whose size is only known after it ran (e.g. parsing)."""
+    prof = _current.get()
+    if prof is not None:
+        prof._entry(name)["cells"] += cells
+
+
+class Profiler:
+    """Collects per-stage statistics while active (use as a context manager)."""
+
+    def __init__(self, memory: bool = True, pstats_path: Optional[str] = None):
+        self.memory = memory
+        self.pstats_path = pstats_path
+        self._stats: Report = {}
+        self._stack: List[Dict[str, Any]] = []
+        self._token = None
+        self._started_tracing = False
+        self._cprofile: Optional[cProfile.Profile] = None
+
+    def __enter__(self) -> "Profiler":
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.pstats_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _current.reset(self._token)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.pstats_path)
+            self._cprofile = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _entry(self, name: str) -> Dict[str, Any]:
+        entry = self._stats.get(name)
+        if entry is None:
+            entry = self._stats[name] = {"seconds": 0.0, "cells": 0, "peak bytes": None, "calls": 0}
+            if self._stack:
+                entry["within"] = self._stack[-1]["name"]
+        return entry
+
+    def _memory(self) -> Optional[Any]:
+        return tracemalloc.get_traced_memory() if self.memory and tracemalloc.is_tracing() else None
+
+    @contextmanager
+    def stage(self, name: str, cells: int = 0) -> Iterator[None]:
+        entry = self._entry(name)
+        frame: Dict[str, Any] = {"name": name, "base": None, "peak": 0}
+        mem = self._memory()
+        if mem is not None:
+            current, peak = mem
+            if self._stack:
+                # the enclosing stage keeps the peak seen so far before it is reset
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            frame["base"], frame["peak"] = current, current
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            mem = self._memory()
+            if mem is not None and frame["base"] is not None:
+                frame["peak"] = max(frame["peak"], mem[1])
+                used = frame["peak"] - frame["base"]
+                entry["peak bytes"] = max(entry["peak bytes"] or 0, used)
+                if self._stack:
+                    self._stack[-1]["peak"] = max(self._stack[-1]["peak"], frame["peak"])
+            entry["seconds"] += elapsed
+            entry["cells"] += cells
+            entry["calls"] += 1
+
+    def report(self) -> Report:
+        """Per-stage statistics, in the order the stages first ran."""
+        return {name: dict(entry) for name, entry in self._stats.items()}
+
+
+def merge_reports(*reports: Optional[Report]) -> Report:
+    """Sum several reports (e.g. the input parse and one batch's analysis)."""
+    out: Report = {}
+    for report in reports:
+        for name, entry in (report or {}).items():
+            if name not in out:
+                out[name] = dict(entry)
+                continue
+            acc = out[name]
+            for key in ("seconds", "cells", "calls"):
+                acc[key] += entry[key]
+            if entry["peak bytes"] is not None:
+                acc["peak bytes"] = max(acc["peak bytes"] or 0, entry["peak bytes"])
+    return out
+
+
+def profile_columns() -> List[str]:
+    """Export columns for a report: profile.<stage>.<metric>."""
+    return [f"profile.{name}.{metric}" for name in STAGES for metric in METRICS]
+
+
+def flatten_profile(report: Report) -> Dict[str, Any]:
+    return {
+        f"profile.{name}.{metric}": entry.get(metric)
+        for name, entry in report.items()
+        for metric in METRICS
+    }
+
+
+def _size(num: Optional[int]) -> str:
+    if num is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if num < 1024:
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.1f} {unit}"
+        num /= 1024
+    return f"{num:.1f} GiB"
+
+
+def format_profile(report: Report) -> List[str]:
+    """Human-readable lines (results box, text export); nested stages are indented."""
+    lines = []
+    for name, entry in report.items():
+        indent = "    " * (2 if "within" in entry else 1)
+        calls = f" x{entry['calls']}" if entry["calls"] > 1 else ""
+        lines.append(
+            f"{indent}{name}: {entry['seconds'] * 1e3:.2f} ms{calls}, "
+            f"{entry['cells']:,} cells, peak {_size(entry['peak bytes'])}"
+        )
+    return lines
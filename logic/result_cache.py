@@ -0,0 +1,227 @@
+# logic/result_cache.py
+"""
+Persistent, content-addressed cache of analyze_ring results.
+
+Entries live in a small SQLite file keyed by a hash of the (add, mul) tables
+plus the analysis options, so rings that come back in later batches are not
+analyzed again. Least recently used entries are evicted once the stored
+results exceed a size cap.
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from logic import profiling, ring_numpy
+from logic.ring_canon import analysis_zero, canonical_form, canonical_options, relabel_result
+from logic.ring_checker import analyze_ring
+
+Result = Dict[str, Dict[str, Any]]
+
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+# last-used times are written back in bulk, not on every hit
+TOUCH_FLUSH_EVERY = 256
+# bumped whenever analyze_ring's result dicts change shape, so stale entries miss
+RESULT_FORMAT = 3
+
+
+def default_cache_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "finite-ring-analyzer", "results.sqlite")
+
+
+def key_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The analyze_ring options that can change the result, with defaults filled in.
+
+    error_bound and seed only matter when the axioms are sampled, and unset
+    witnesses or zero_index equal their defaults, so the CLI, the GUI and the
+    service build the same key for the same analysis.
+    """
+    opts = dict(options)
+    opts.setdefault("axioms", "exact")
+    if opts["axioms"] == "sampled":
+        opts.setdefault("error_bound", 1e-6)
+        opts.setdefault("seed", None)
+    else:
+        opts.pop("error_bound", None)
+        opts.pop("seed", None)
+    if not opts.get("witnesses"):
+        opts.pop("witnesses", None)
+    if not opts.get("zero_index"):
+        opts.pop("zero_index", None)
+    return opts
+
+
+def table_digest(mul: Any, add: Optional[Any] = None, **options: Any) -> str:
+    """
+    Canonical hash of a ring, the analysis options and the result format.
+
+    Tables are normalized to little-endian uint32 first, so lists, RingTables
+    and arrays of any width with the same entries hash the same. Options go
+    through key_options; add is hashed as given, so callers pass it whenever
+    they have it (also when the axioms are off).
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"v{RESULT_FORMAT};".encode())
+    for table in (add, mul):
+        if table is None:
+            h.update(b"-")
+            continue
+        arr = ring_numpy.as_array(table)
+        h.update(f"{arr.shape[0]}:".encode())
+        h.update(np.ascontiguousarray(arr, dtype="<u4").tobytes())
+    h.update(repr(sorted(key_options(options).items())).encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite-backed LRU cache of result dicts.
+
+    Safe to share between threads (one connection guarded by a lock). hits,
+    misses and evictions are counted for the lifetime of the object.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+            " size INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_lru ON results(last_used)")
+        row = self._db.execute("SELECT COALESCE(SUM(size), 0), COALESCE(MAX(last_used), 0) FROM results").fetchone()
+        self._bytes, self._clock = row
+        self._touched: Dict[str, int] = {}
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def get(self, key: str) -> Optional[Result]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = self._tick()
+            if len(self._touched) >= TOUCH_FLUSH_EVERY:
+                self._flush_touched()
+        return pickle.loads(row[0])
+
+    def put(self, key: str, result: Result) -> None:
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._flush_touched()
+            old = self._db.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+            if old is not None:
+                self._bytes -= old[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), self._tick()),
+            )
+            self._bytes += len(blob)
+            self._evict()
+            self._db.commit()
+
+    def _flush_touched(self) -> None:
+        if self._touched:
+            self._db.executemany(
+                "UPDATE results SET last_used = ? WHERE key = ?",
+                [(t, k) for k, t in self._touched.items()],
+            )
+            self._touched.clear()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM results ORDER BY last_used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._bytes <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._bytes -= size
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self._bytes,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+            self._bytes = 0
+            self._touched.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            self._db.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def cached_analyze(
+    cache: Optional[ResultCache],
+    mul: Any,
+    add: Optional[Any] = None,
+    up_to_isomorphism: bool = False,
+    **options: Any
+) -> Result:
+    """
+    analyze_ring(mul, add_table=add, **options) through the cache (cache may be None).
+
+    With up_to_isomorphism=True the canonical form is looked up instead, so a
+    relabeled copy of a cached ring is a hit (see analyze_many).
+    """
+    if up_to_isomorphism and cache is not None:
+        try:
+            form = canonical_form(mul, add, analysis_zero(mul, add, **options))
+        except ValueError:
+            form = None
+        if form is not None:
+            res = relabel_result(cached_analyze(cache, form.mul, form.add, **canonical_options(options)),
+                                 form.labels)
+            if res is not None:
+                return res
+    if cache is None:
+        return analyze_ring(mul, add_table=add, **options)
+    with profiling.stage("cache lookup"):
+        key = table_digest(mul, add, **options)
+        result = cache.get(key)
+    if result is None:
+        result = analyze_ring(mul, add_table=add, **options)
+        cache.put(key, result)
+    return result
@@ -1,7 +1,11 @@
-# checks ring axioms that haven't been implemented yet
-from typing import List, Optional, Tuple
+# checks ring axioms (pure-Python reference versions + the validation stage used by analyze_ring)
+import math
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+from logic import ring_numpy
+from logic.ring_table import RingTable, validate_addition_table, validate_multiplication_table
 
-Table = List[List[int]]
+Table = Union[List[List[int]], RingTable]
 
 def is_associative(table: Table) -> Optional[Tuple[int, int, int]]:
     """Check if table is associative: (a * b) * c == a * (b * c) for all a, b, c."""
@@ -43,3 +47,128 @@ def is_distributive(add: Table, mul: Table) -> Optional[Tuple[int, int, int, str
                 if left != right:
                     return (a, b, c, "right")
     return None
+
+
+# ---------- validation stage used by analyze_ring ----------
+
+def sample_size(error_bound: float) -> int:
+    """
+    Random triples needed so a non-associative ring slips through with
+    probability <= error_bound.
+
+    When distributivity holds the associator (a*b)*c - a*(b*c) is additive in
+    each argument, so the triples where it vanishes miss at least 1/8 of all
+    triples unless it vanishes everywhere (each fixed-argument zero set is a
+    subgroup). The other axioms are sampled with the same count, without that guarantee.
+    """
+    if not 0 < error_bound < 1:
+        raise ValueError("error bound must be between 0 and 1")
+    return math.ceil(math.log(error_bound) / math.log(7 / 8))
+
+
+def _counted(counter: Optional[Tuple[int, ...]], n: int, checked: List[int]) -> Optional[Tuple[int, ...]]:
+    """Record how many triples a row-major exhaustive check examined."""
+    if counter is None:
+        checked.append(n ** 3)
+    else:
+        a, b, c = counter[:3]
+        checked.append(a * n * n + b * n + c + 1)
+    return counter
+
+
+def check_ring_axioms(
+    add: Table,
+    mul: Table,
+    mode: str = "exact",
+    error_bound: float = 1e-6,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Check that (add, mul) is a ring, stopping at the first counterexample.
+
+    Order: addition table (commutative group with identity), additive inverses,
+    additive associativity, distributivity, multiplicative associativity.
+    mode="exact" is deterministic: both associativity checks use Light's test
+    over an additive generating set (about n^2 log n lookups), distributivity
+    is checked exhaustively. mode="sampled" checks sample_size(error_bound)
+    random triples per O(n^3) axiom instead.
+    The report says which mode ran and how many triples were checked.
+    """
+    if mode not in ("exact", "sampled"):
+        raise ValueError(f"Unknown axiom check mode: {mode}")
+    report: Dict[str, Any] = {
+        "value": False,
+        "failed": None,
+        "counterexample": None,
+        "mode": "exhaustive" if mode == "exact" else "sampled",
+        "triples checked": 0,
+        "zero": None,
+    }
+
+    try:
+        zero = validate_addition_table(add)
+    except ValueError as e:
+        report.update({"failed": "addition table", "reason": str(e)})
+        return report
+    report["zero"] = zero
+    try:
+        validate_multiplication_table(mul)
+    except ValueError as e:
+        report.update({"failed": "multiplication table", "reason": str(e)})
+        return report
+
+    missing = ring_numpy.has_additive_inverses(add, zero)
+    if missing is not None:
+        report.update({"failed": "additive inverses", "counterexample": missing})
+        return report
+
+    s = ring_numpy.as_array(add)
+    m = ring_numpy.as_array(mul)
+    n = len(s)
+
+    if mode == "exact":
+        # Light's test over an additive generating set for both associativity
+        # checks (the multiplicative one relies on distributivity, checked first)
+        gens = ring_numpy.additive_generators(s, zero)
+        report["generators"] = gens
+        checks = [
+            ("additive associativity", lambda c: ring_numpy.is_associative_light(s, gens, c)),
+            ("distributivity", lambda c: _counted(ring_numpy.is_distributive(s, m), n, c)),
+            ("multiplicative associativity", lambda c: ring_numpy.is_associative_light(m, gens, c)),
+        ]
+        for name, check in checks:
+            checked: List[int] = []
+            counter = check(checked)
+            report["triples checked"] += checked[0]
+            if counter is not None:
+                report.update({"failed": name, "counterexample": counter})
+                return report
+    else:
+        rng = np.random.default_rng(seed)
+        t = sample_size(error_bound)
+        for name in ("additive associativity", "distributivity", "multiplicative associativity"):
+            a, b, c = rng.integers(0, n, size=(3, t)) if n else np.zeros((3, 0), dtype=int)
+            if name == "additive associativity":
+                bad = s[s[a, b], c] != s[a, s[b, c]]
+                kind = None
+            elif name == "distributivity":
+                left_bad = m[a, s[b, c]] != s[m[a, b], m[a, c]]
+                right_bad = m[s[a, b], c] != s[m[a, c], m[b, c]]
+                bad = left_bad | right_bad
+                kind = left_bad
+            else:
+                bad = m[m[a, b], c] != m[a, m[b, c]]
+                kind = None
+            hit = ring_numpy.first_true(bad)
+            if hit is not None:
+                k = hit[0]
+                counter = (int(a[k]), int(b[k]), int(c[k]))
+                if kind is not None:
+                    counter += ("left" if kind[k] else "right",)
+                report["triples checked"] += k + 1
+                report.update({"failed": name, "counterexample": counter})
+                return report
+            report["triples checked"] += t
+
+    report["value"] = True
+    return report
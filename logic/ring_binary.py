@@ -0,0 +1,250 @@
+# logic/ring_binary.py
+"""
+Binary container for ring tables, loaded with mmap.
+
+Text input costs an int() per token; this format stores the tables as raw
+little-endian uint8/uint16/uint32 cells so loading is free and the readers
+hand RingTable views straight over the mapped file (no copy).
+
+Layout (all integers little-endian):
+
+    header   MAGIC (8 bytes), count (u64), index offset (u64), reserved (u64)
+    rings    per ring, starting on an ALIGN-byte boundary:
+               n (u32), element width in bytes (u8), flags (u8), 2 pad bytes,
+               then the addition table (if FLAG_ADD) and the multiplication
+               table, n*n cells each, row-major, each starting on ALIGN bytes
+    index    count u64 offsets of the ring records
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from logic.ring_table import RingTable, iter_fast_blocks, typecode_for
+
+MAGIC = b"FRTABLE1"
+HEADER = struct.Struct("<8sQQQ")
+RECORD = struct.Struct("<IBBxx")
+ALIGN = 64
+FLAG_ADD = 1
+
+WIDTH_TYPECODES = {1: "B", 2: "H", 4: "I"}
+
+Ring = Tuple[Optional[RingTable], RingTable]
+
+
+def _pad(offset: int) -> int:
+    return -offset % ALIGN
+
+
+def _cells(table: Any, typecode: str) -> array:
+    """Cells of table as an array of typecode (little-endian)."""
+    if isinstance(table, RingTable) and table.typecode == typecode:
+        cells = array(typecode, table.tobytes())
+    else:
+        cells = array(typecode, (x for row in table for x in row))
+    if sys.byteorder != "little":
+        cells.byteswap()
+    return cells
+
+
+def is_ring_data(data: bytes) -> bool:
+    """Do these bytes start with the container's magic (rather than being fast-input text)?"""
+    return data[:len(MAGIC)] == MAGIC
+
+
+def is_ring_file(path: str) -> bool:
+    """Does path start with the binary container's magic bytes?"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class RingFileWriter:
+    """
+    Append rings to a new container file; close() writes the index.
+
+    Each table is stored with the narrowest width that holds n - 1. The rings
+    go to path + ".tmp", which replaces path only when close() finishes; as
+    a context manager an exception discards the file instead (abort()), so a
+    failed run never leaves a well-formed but truncated container.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._tmp_path = path + ".tmp"
+        self._f = open(self._tmp_path, "wb")
+        self._f.write(HEADER.pack(MAGIC, 0, 0, 0))
+        self._offsets: List[int] = []
+
+    def _align(self) -> None:
+        pad = _pad(self._f.tell())
+        if pad:
+            self._f.write(b"\0" * pad)
+
+    def append(self, add: Optional[Any], mul: Any) -> None:
+        n = len(mul)
+        if add is not None and len(add) != n:
+            raise ValueError("Addition and multiplication tables differ in size.")
+        tables = [mul] if add is None else [add, mul]
+        for t in tables:
+            if isinstance(t, RingTable):
+                low, high = 0, t.max_value()
+            else:
+                low = min((min(r, default=0) for r in t), default=0)
+                high = max((max(r, default=0) for r in t), default=0)
+            if low < 0 or high >= max(n, 1):
+                raise ValueError(f"Table entries must be between 0 and {n - 1}.")
+        typecode = typecode_for(max(n - 1, 0))
+        # convert and check everything first, so a bad ring leaves no partial record
+        converted = [_cells(t, typecode) for t in tables]
+        if any(len(cells) != n * n for cells in converted):
+            raise ValueError("Table must be square.")
+
+        self._align()
+        self._offsets.append(self._f.tell())
+        self._f.write(RECORD.pack(n, array(typecode).itemsize, FLAG_ADD if add is not None else 0))
+        for cells in converted:
+            self._align()
+            cells.tofile(self._f)
+
+    @property
+    def count(self) -> int:
+        return len(self._offsets)
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self._align()
+        index_offset = self._f.tell()
+        index = array("Q", self._offsets)
+        if sys.byteorder != "little":
+            index.byteswap()
+        index.tofile(self._f)
+        self._f.seek(0)
+        self._f.write(HEADER.pack(MAGIC, len(self._offsets), index_offset, 0))
+        self._f.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Drop everything written so far; path is left untouched."""
+        if self._f.closed:
+            return
+        self._f.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self) -> "RingFileWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def write_rings(path: str, rings: Iterable[Tuple[Optional[Any], Any]]) -> int:
+    """Write (add, mul) pairs (add may be None) to path; returns how many."""
+    with RingFileWriter(path) as w:
+        for add, mul in rings:
+            w.append(add, mul)
+        return w.count
+
+
+class RingFile:
+    """
+    Read-only, memory-mapped view of a container file.
+
+    ring_file[i] is (add, mul) as RingTables over the mapping (add is None
+    if it was not stored). The views stay valid while they are referenced;
+    close() unmaps only once no view is left (otherwise the mapping is
+    released with the last view).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm: Optional[mmap.mmap] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._load(memoryview(self._mm))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, name: str = "<bytes>") -> "RingFile":
+        """A RingFile over a container held in memory (e.g. received over a socket)."""
+        self = cls.__new__(cls)
+        self.path = name
+        self._mm = None
+        self._load(memoryview(data))
+        return self
+
+    def _load(self, buf: memoryview) -> None:
+        self._buf = buf
+        if len(self._buf) < HEADER.size:
+            raise ValueError(f"{self.path}: file too short for a ring table container")
+        magic, count, index_offset, _ = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}: not a ring table container")
+        if index_offset + 8 * count > len(self._buf):
+            raise ValueError(f"{self.path}: truncated (index past end of file)")
+        self.count = count
+        index = array("Q", self._buf[index_offset:index_offset + 8 * count].tobytes())
+        if sys.byteorder != "little":
+            index.byteswap()
+        self._offsets = index
+
+    def __len__(self) -> int:
+        return self.count
+
+    def size(self, i: int) -> int:
+        """n of ring i, without touching its tables."""
+        return RECORD.unpack_from(self._buf, self._offsets[i])[0]
+
+    def __getitem__(self, i: int) -> Ring:
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("ring index out of range")
+        offset = self._offsets[i]
+        n, width, flags = RECORD.unpack_from(self._buf, offset)
+        typecode = WIDTH_TYPECODES.get(width)
+        if typecode is None:
+            raise ValueError(f"{self.path}: ring {i} has unsupported element width {width}")
+        pos = offset + RECORD.size
+        tables: List[RingTable] = []
+        for _ in range(2 if flags & FLAG_ADD else 1):
+            pos += _pad(pos)
+            end = pos + n * n * width
+            if end > len(self._buf):
+                raise ValueError(f"{self.path}: ring {i} is truncated")
+            view: Union[memoryview, array] = self._buf[pos:end]
+            if sys.byteorder != "little":
+                view = array(typecode, view.tobytes())
+                view.byteswap()
+            tables.append(RingTable(n, view, typecode))
+            pos = end
+        return (tables[0], tables[1]) if len(tables) == 2 else (None, tables[0])
+
+    def __iter__(self) -> Iterator[Ring]:
+        return (self[i] for i in range(self.count))
+
+    def close(self) -> None:
+        try:
+            self._buf.release()
+            if self._mm is not None:
+                self._mm.close()
+        except BufferError:
+            pass  # tables handed out still reference the mapping
+
+    def __enter__(self) -> "RingFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def convert_text(lines: Iterable[str], path: str) -> int:
+    """Compile custom-format fast input (text lines) into a container file; returns the ring count."""
+    return write_rings(path, iter_fast_blocks(lines, custom=True, compact=True))
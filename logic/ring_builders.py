@@ -0,0 +1,377 @@
+# logic/ring_builders.py
+"""
+Vectorized constructors for common ring families.
+
+Every constructor returns (add, mul) as RingTables over read-only numpy
+buffers (narrowest unsigned dtype), built with array operations instead of
+nested lists, so they go straight into analyze_ring(mul, add_table=add),
+analyze_many, RingFileWriter or the GUI views without a text round trip.
+
+Families: Z/mZ, direct products, quotients R/I, matrix rings M_k(Z/mZ),
+polynomial quotients (Z/mZ)[x]/(f) (Galois fields GF(p^k) among them) and
+group rings (Z/mZ)[G].
+
+Rings that are free Z/mZ-modules (matrix, polynomial and group rings) label
+an element by its coordinates in base m: digit j of the label is the
+coefficient of basis element j, so basis element j has label m^j. Products
+label (r1, ..., rk) in mixed radix with the first factor most significant.
+Label 0 is always zero.
+
+Built rings are cached by their parameters (tables passed in, e.g. the
+factors of a product, are keyed by a hash of their contents); the cache is
+bounded by CACHE_BYTES.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from math import gcd
+from typing import Any, Callable, Hashable, List, Sequence, Tuple
+
+import numpy as np
+
+from logic import ring_numpy
+from logic.ring_table import RingTable
+
+Ring = Tuple[RingTable, RingTable]  # (add, mul)
+
+# Largest ring built (tables have n^2 cells each).
+MAX_ORDER = 1 << 14
+# Bytes of tables kept by the constructor cache (least recently used are dropped).
+CACHE_BYTES = 256 * 1024 * 1024
+
+_cache: "OrderedDict[Hashable, Ring]" = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def _cached(key: Hashable, build: Callable[[], Tuple[np.ndarray, np.ndarray]]) -> Ring:
+    global _cache_bytes
+    with _cache_lock:
+        ring = _cache.get(key)
+        if ring is not None:
+            _cache.move_to_end(key)
+            return ring
+    add, mul = build()
+    ring = (_freeze(add), _freeze(mul))
+    size = ring[0].nbytes + ring[1].nbytes
+    with _cache_lock:
+        if size <= CACHE_BYTES and key not in _cache:
+            _cache[key] = ring
+            _cache_bytes += size
+            while _cache_bytes > CACHE_BYTES:
+                _, old = _cache.popitem(last=False)
+                _cache_bytes -= old[0].nbytes + old[1].nbytes
+    return ring
+
+
+def clear_cache() -> None:
+    global _cache_bytes
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
+
+
+def _freeze(table: np.ndarray) -> RingTable:
+    """RingTable over a read-only copy-free view (cached tables are shared)."""
+    rt = RingTable.from_array(table)
+    arr = np.asarray(rt)
+    if arr.flags.writeable:
+        arr = arr.view()
+        arr.flags.writeable = False
+        rt = RingTable(rt.n, arr.reshape(-1), rt.typecode)
+    return rt
+
+
+def _digest(*tables: Any) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    for t in tables:
+        arr = ring_numpy.as_array(t)
+        h.update(f"{arr.shape[0]}:".encode())
+        h.update(np.ascontiguousarray(arr, dtype="<u4").tobytes())
+    return h.hexdigest()
+
+
+def _dtype(n: int) -> np.dtype:
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"Ring of order {n} is too large.")
+
+
+def _check_order(n: int) -> None:
+    if n < 1:
+        raise ValueError("Ring must have at least one element.")
+    if n > MAX_ORDER:
+        raise ValueError(f"Ring of order {n} is too large to tabulate (limit {MAX_ORDER}).")
+
+
+def _check_modulus(m: int) -> None:
+    if m < 1:
+        raise ValueError(f"Modulus must be positive, got {m}.")
+
+
+def _digits(n: int, m: int, width: int) -> np.ndarray:
+    """Base-m digits of 0..n-1, least significant first, shape (n, width)."""
+    return (np.arange(n, dtype=np.int64)[:, None] // m ** np.arange(width, dtype=np.int64)) % m
+
+
+def _number(digits: np.ndarray, m: int) -> np.ndarray:
+    return digits @ (m ** np.arange(digits.shape[-1], dtype=np.int64))
+
+
+def _top_digit(n: int, m: int) -> np.ndarray:
+    """Position of the most significant non-zero base-m digit of 1..n-1 (entry 0 unused)."""
+    top = np.zeros(n, dtype=np.int64)
+    power = m
+    while power < n:
+        top[power:] += 1
+        power *= m
+    return top
+
+
+def _module_add(m: int, width: int) -> np.ndarray:
+    """Addition of (Z/mZ)^width in base-m labels."""
+    n = m ** width
+    d = _digits(n, m, width)
+    # b -> b + m^j for every digit j; row a is row a - m^j shifted once more
+    step = [_number((d + (np.arange(width) == j)) % m, m).astype(_dtype(n)) for j in range(width)]
+    top = _top_digit(n, m)
+    add = np.empty((n, n), dtype=_dtype(n))
+    add[0] = np.arange(n)
+    for a in range(1, n):
+        j = top[a]
+        add[a] = step[j][add[a - m ** j]]
+    return add
+
+
+def _bilinear(add: np.ndarray, basis_rows: List[np.ndarray], m: int) -> np.ndarray:
+    """
+    Multiplication table of a free Z/mZ-algebra from the rows of its basis.
+
+    basis_rows[j] is e_j * b for every label b; the product is additive in the
+    left factor, so row a is row a - m^j plus basis row j (one gather per row).
+    """
+    n = len(add)
+    top = _top_digit(n, m)
+    rows = [r.astype(add.dtype) for r in basis_rows]
+    mul = np.empty((n, n), dtype=add.dtype)
+    mul[0] = 0
+    for a in range(1, n):
+        j = top[a]
+        mul[a] = add[mul[a - m ** j], rows[j]]
+    return mul
+
+
+def _algebra(m: int, width: int, basis_rows: Callable[[np.ndarray], List[np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """(add, mul) of a free Z/mZ-algebra of rank width; basis_rows(digits) gives e_j * b for all b."""
+    _check_order(m ** width)
+    add = _module_add(m, width)
+    return add, _bilinear(add, basis_rows(_digits(m ** width, m, width)), m)
+
+
+# ---------- families ----------
+
+def zmod(m: int) -> Ring:
+    """Z/mZ."""
+    _check_modulus(m)
+    _check_order(m)
+
+    def build() -> Tuple[np.ndarray, np.ndarray]:
+        ar = np.arange(m, dtype=np.int64)
+        return (ar[:, None] + ar) % m, (ar[:, None] * ar) % m
+
+    return _cached(("zmod", m), build)
+
+
+def direct_product(*factors: Tuple[Any, Any]) -> Ring:
+    """
+    R1 x R2 x ... from (add, mul) pairs (tables of any kind).
+
+    (r1, ..., rk) gets label ((r1 * |R2| + r2) * |R3| + r3) ..., so the zero of
+    the product is label 0 when every factor's zero is label 0.
+    """
+    if not factors:
+        raise ValueError("A direct product needs at least one factor.")
+    tables = [(ring_numpy.as_array(a), ring_numpy.as_array(m)) for a, m in factors]
+    sizes = [len(m) for _, m in tables]
+    n = int(np.prod(sizes, dtype=np.int64))
+    _check_order(n)
+
+    def build() -> Tuple[np.ndarray, np.ndarray]:
+        out = []
+        for k in (0, 1):
+            acc = np.zeros((1, 1), dtype=np.int64)
+            for t, size in zip(tables, sizes):
+                t = t[k].astype(np.int64)
+                acc = (acc[:, None, :, None] * size + t[None, :, None, :]).reshape(len(acc) * size, -1)
+            out.append(acc)
+        return out[0], out[1]
+
+    return _cached(("product", _digest(*(t for pair in tables for t in pair))), build)
+
+
+def quotient(ring: Tuple[Any, Any], ideal: Sequence[int]) -> Ring:
+    """
+    R/I for a two-sided ideal I of R = (add, mul), given by its elements.
+
+    Cosets are numbered by their smallest element in increasing order (so the
+    coset of zero is 0 when zero is label 0). Raises ValueError if I is not an
+    ideal (the operations on cosets would not be well defined).
+    """
+    add, mul = (ring_numpy.as_array(t).astype(np.int64) for t in ring)
+    members = np.unique(np.asarray(ideal, dtype=np.int64))
+    n = len(add)
+    if not len(members) or members.min() < 0 or members.max() >= n:
+        raise ValueError("Ideal must be a non-empty set of elements of the ring.")
+
+    def build() -> Tuple[np.ndarray, np.ndarray]:
+        reps = add[:, members].min(axis=1)  # smallest element of a + I
+        labels, coset = np.unique(reps, return_inverse=True)
+        coset = coset.reshape(-1)
+        out = []
+        for t in (add, mul):
+            q = coset[t[np.ix_(labels, labels)]]
+            # well defined: the coset of a o b only depends on the cosets of a and b
+            if (coset[t] != q[np.ix_(coset, coset)]).any():
+                raise ValueError("The given elements do not form an ideal.")
+            out.append(q)
+        return out[0], out[1]
+
+    return _cached(("quotient", _digest(add, mul), members.tobytes()), build)
+
+
+def matrix_ring(k: int, m: int) -> Ring:
+    """M_k(Z/mZ); entry (r, c) is digit r * k + c of the label."""
+    _check_modulus(m)
+    if k < 1:
+        raise ValueError(f"Matrix size must be positive, got {k}.")
+
+    def basis_rows(d: np.ndarray) -> List[np.ndarray]:
+        mats = d.reshape(len(d), k, k)
+        rows = []
+        for j in range(k * k):
+            e = np.zeros((k, k), dtype=np.int64)
+            e[divmod(j, k)] = 1
+            rows.append(_number((np.einsum("ij,bjk->bik", e, mats) % m).reshape(len(d), k * k), m))
+        return rows
+
+    _check_order(m ** (k * k))
+    return _cached(("matrix", k, m), lambda: _algebra(m, k * k, basis_rows))
+
+
+def polynomial_quotient(m: int, f: Sequence[int]) -> Ring:
+    """
+    (Z/mZ)[x]/(f) for a monic f (coefficients lowest degree first, so
+    x^2 + 1 is (1, 0, 1)); coefficient i of a residue is digit i of its label.
+    """
+    _check_modulus(m)
+    f = tuple(int(c) % m for c in f)
+    k = len(f) - 1
+    if k < 1 or f[-1] != 1 % m:
+        raise ValueError("f must be monic of degree at least 1.")
+
+    def basis_rows(d: np.ndarray) -> List[np.ndarray]:
+        # x^j * b: multiplying by x shifts the coefficients and reduces by f
+        low = np.array(f[:k], dtype=np.int64)
+        rows = []
+        for _ in range(k):
+            rows.append(_number(d, m))
+            d = (np.concatenate([np.zeros((len(d), 1), dtype=d.dtype), d[:, :-1]], axis=1) - d[:, -1:] * low) % m
+        return rows
+
+    def build() -> Tuple[np.ndarray, np.ndarray]:
+        # e_j = x^j, and x^i * x^j * b = x^i * (x^j * b): the rows above are exactly the basis rows
+        return _algebra(m, k, basis_rows)
+
+    _check_order(m ** k)
+    return _cached(("polynomial", m, f), build)
+
+
+def _is_prime(p: int) -> bool:
+    return p >= 2 and all(p % q for q in range(2, int(p ** 0.5) + 1))
+
+
+def _poly_mod(coeffs: List[int], f: List[int], p: int) -> List[int]:
+    """coeffs mod the monic polynomial f over F_p (both lowest degree first)."""
+    coeffs = list(coeffs)
+    k = len(f) - 1
+    for top in range(len(coeffs) - 1, k - 1, -1):
+        c = coeffs[top]
+        if c:
+            for i in range(k + 1):
+                coeffs[top - k + i] = (coeffs[top - k + i] - c * f[i]) % p
+    return coeffs[:k]
+
+
+@lru_cache(maxsize=None)
+def irreducible_polynomial(p: int, k: int) -> Tuple[int, ...]:
+    """First monic irreducible polynomial of degree k over F_p (lowest degree first)."""
+    if not _is_prime(p):
+        raise ValueError(f"{p} is not a prime.")
+    if k < 1:
+        raise ValueError(f"Degree must be positive, got {k}.")
+    for code in range(p ** k):
+        f = [(code // p ** i) % p for i in range(k)] + [1]
+        if k > 1 and f[0] == 0:
+            continue  # divisible by x
+        # irreducible iff no monic factor of degree <= k/2
+        if all(
+            any(_poly_mod(f, [(g // p ** i) % p for i in range(d)] + [1], p))
+            for d in range(1, k // 2 + 1)
+            for g in range(p ** d)
+        ):
+            return tuple(f)
+    raise ValueError(f"No irreducible polynomial of degree {k} over F_{p}.")  # unreachable for prime p
+
+
+def galois_field(p: int, k: int = 1) -> Ring:
+    """GF(p^k) as F_p[x]/(f) with f = irreducible_polynomial(p, k)."""
+    _check_order(p ** k)
+    return polynomial_quotient(p, irreducible_polynomial(p, k))
+
+
+def cyclic_group(n: int) -> np.ndarray:
+    """Multiplication table of the cyclic group C_n (element i is g^i)."""
+    ar = np.arange(n)
+    return (ar[:, None] + ar) % n
+
+
+def dihedral_group(n: int) -> np.ndarray:
+    """Multiplication table of the dihedral group of order 2n: element s * n + i is r^i s^s."""
+    ar = np.arange(2 * n)
+    s, i = ar // n, ar % n
+    # (r^i s^a)(r^j s^b) = r^(i + (-1)^a j) s^(a + b)
+    sign = np.where(s == 1, -1, 1)
+    rot = (i[:, None] + sign[:, None] * i[None, :]) % n
+    return ((s[:, None] + s[None, :]) % 2) * n + rot
+
+
+def group_ring(m: int, group: Any) -> Ring:
+    """
+    (Z/mZ)[G] for a finite group given by its multiplication table; basis
+    element e_g (label m^g) is the group element g.
+    """
+    _check_modulus(m)
+    g = ring_numpy.as_array(group).astype(np.int64)
+    order = len(g)
+    if g.ndim != 2 or g.shape != (order, order) or not order or g.min() < 0 or g.max() >= order:
+        raise ValueError("Group table must be square with entries 0..n-1.")
+
+    def basis_rows(d: np.ndarray) -> List[np.ndarray]:
+        rows = []
+        for x in range(order):
+            # e_x * sum_h b_h e_h = sum_h b_h e_(x h)
+            moved = np.empty_like(d)
+            moved[:, g[x]] = d
+            rows.append(_number(moved, m))
+        return rows
+
+    _check_order(m ** order)
+    return _cached(("group ring", m, _digest(g)), lambda: _algebra(m, order, basis_rows))
+
+
+def gcd_ideal(m: int, d: int) -> List[int]:
+    """Elements of the ideal dZ/mZ of Z/mZ (use with quotient(zmod(m), ...))."""
+    step = gcd(d, m) or m
+    return list(range(0, m, step))
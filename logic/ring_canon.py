@@ -0,0 +1,308 @@
+# logic/ring_canon.py
+"""
+Isomorphism-invariant fingerprints and canonical forms of finite rings.
+
+Two tables that only differ by a relabeling of the elements describe the same
+ring. ring_fingerprint() is a cheap invariant (additive orders, idempotents,
+annihilator sizes, ...) that is equal for isomorphic rings; canonical_form()
+relabels a ring so that isomorphic inputs give identical tables, which lets
+batches be deduplicated and results be reused across relabeled inputs.
+
+The canonical labeling is found by colour refinement followed by an
+individualization search (the usual graph-canonization scheme) over both
+operations, with the zero element pinned to label 0.
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from logic import ring_numpy
+
+# Rings larger than this are not canonicalized (refinement is O(n^2 log n) per round).
+MAX_CANON_N = 1024
+# Leaves visited by the individualization search before giving up on a minimal form.
+DEFAULT_MAX_LEAVES = 256
+
+# Result fields that hold element indices (or tuples/lists of them).
+ELEMENT_FIELDS = {
+    "ring axioms": ["counterexample", "zero", "generators"],
+    "commutative": ["counterexample"],
+    "has identity": ["identity"],
+    "integral domain": ["zero divisors"],
+    "division ring": ["missing inverse"],
+    "witness sets": ["units", "inverses", "zero divisors", "idempotents", "nilpotents"],
+}
+# Sets listed in increasing element order; the later fields of a group are
+# paired entry by entry with the first (inverses with units, ...)
+SORTED_FIELDS = {
+    "witness sets": [("units", "inverses"), ("zero divisors",), ("idempotents",),
+                     ("nilpotents", "nilpotency index")],
+}
+
+
+@dataclass
+class CanonicalForm:
+    """
+    A ring relabeled into canonical order.
+
+    labels[i] is the original element that got canonical label i, so a
+    canonical table entry C[i][j] == k means labels[i] * labels[j] == labels[k].
+    complete is False when the search hit its leaf budget; the form is still a
+    valid relabeling but isomorphic inputs may then map to different forms.
+    """
+    mul: np.ndarray
+    add: Optional[np.ndarray]
+    labels: np.ndarray
+    complete: bool
+
+    @property
+    def digest(self) -> str:
+        h = hashlib.blake2b(digest_size=20)
+        for table in (self.add, self.mul):
+            h.update(b"-" if table is None else np.ascontiguousarray(table, dtype="<u4").tobytes())
+        return h.hexdigest()
+
+
+def _check_tables(mul: np.ndarray, add: Optional[np.ndarray], zero: int) -> None:
+    n = len(mul)
+    for name, t in (("Multiplication", mul), ("Addition", add)):
+        if t is None:
+            continue
+        if t.ndim != 2 or t.shape != (n, n) or t.dtype.kind not in "iu":
+            raise ValueError(f"{name} table must be square with entries 0..n-1.")
+        if t.size and (t.min() < 0 or t.max() >= n):
+            raise ValueError(f"{name} table must be square with entries 0..n-1.")
+    if n and not 0 <= zero < n:
+        raise ValueError(f"Zero index {zero} is out of range.")
+
+
+def _rank_rows(rows: np.ndarray) -> np.ndarray:
+    """Dense rank of each row in lexicographic order (equal rows share a rank)."""
+    rows = np.ascontiguousarray(rows, dtype=">u8")
+    keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+    return np.unique(keys, return_inverse=True)[1].reshape(-1).astype(np.int64)
+
+
+def _rank(values: np.ndarray) -> np.ndarray:
+    return np.unique(values, return_inverse=True)[1].reshape(values.shape).astype(np.int64)
+
+
+def ring_invariants(mul: Any, add: Optional[Any] = None, zero: int = 0) -> np.ndarray:
+    """
+    Per-element invariants, one row per element (preserved by isomorphisms).
+
+    Columns: not zero, additive order (0 if the multiples never reach zero),
+    a*a == a, a*a == 0, left and right annihilator sizes, number of b with
+    a*b == b, and the size of a*R.
+    """
+    m = ring_numpy.as_array(mul)
+    s = None if add is None else ring_numpy.as_array(add)
+    n = len(m)
+    _check_tables(m, s, zero)
+    ar = np.arange(n)
+
+    order = np.zeros(n, dtype=np.int64)
+    if s is not None and n:
+        cur = ar.copy()
+        for k in range(1, n + 1):
+            reached = (cur == zero) & (order == 0)
+            order[reached] = k
+            cur = s[cur, ar]
+        order[zero] = 1
+
+    diag = m[ar, ar]
+    zeros = m == zero
+    distinct = (np.sort(m, axis=1)[:, 1:] != np.sort(m, axis=1)[:, :-1]).sum(axis=1) + 1 if n else np.zeros(0)
+    return np.stack([
+        ar != zero,
+        order,
+        diag == ar,
+        diag == zero,
+        zeros.sum(axis=1),
+        zeros.sum(axis=0),
+        (m == ar).sum(axis=1),
+        distinct,
+    ], axis=1).astype(np.int64)
+
+
+def ring_fingerprint(mul: Any, add: Optional[Any] = None, zero: int = 0) -> str:
+    """Cheap isomorphism invariant: isomorphic rings always share it (the converse may fail)."""
+    inv = ring_invariants(mul, add, zero)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{len(inv)}:{add is not None}:".encode())
+    if len(inv):
+        h.update(np.ascontiguousarray(inv[np.lexsort(inv.T[::-1])], dtype="<i8").tobytes())
+    return h.hexdigest()
+
+
+def _refine(tables: List[np.ndarray], colors: np.ndarray) -> np.ndarray:
+    """
+    Colour refinement until stable.
+
+    An element's new colour is its old colour plus the multiset, over all b, of
+    the colours of b, a∘b and b∘a for each operation. Colour ids are ranks of
+    these signatures, so they do not depend on the input labeling, and the old
+    order is kept (the zero stays colour 0).
+    """
+    n = len(colors)
+    count = int(colors.max()) + 1 if n else 0
+    while True:
+        code = np.broadcast_to(colors[None, :], (n, n)).astype(np.int64)
+        for t in tables:
+            for part in (colors[t], colors[t.T]):
+                code = _rank(code * count + part)
+        code.sort(axis=1)
+        new = _rank_rows(np.concatenate([colors[:, None], code], axis=1))
+        new_count = int(new.max()) + 1
+        if new_count == count:
+            return new
+        colors, count = new, new_count
+
+
+def _individualize(colors: np.ndarray, v: int) -> np.ndarray:
+    split = 2 * colors + 1
+    split[v] -= 1
+    return _rank(split)
+
+
+def _orbits(generators: List[np.ndarray], n: int) -> np.ndarray:
+    """Orbit id (smallest member) of every element under the group the permutations generate."""
+    ids = np.arange(n)
+    if not generators:
+        return ids
+    gens = np.array(generators)
+    inverses = np.argsort(gens, axis=1)
+    while True:
+        new = np.minimum(ids, np.minimum(ids[gens], ids[inverses]).min(axis=0))
+        if (new == ids).all():
+            return ids
+        ids = new
+
+
+def canonical_form(
+    mul: Any,
+    add: Optional[Any] = None,
+    zero: int = 0,
+    max_leaves: int = DEFAULT_MAX_LEAVES
+) -> CanonicalForm:
+    """
+    Relabel (add, mul) canonically, with `zero` mapped to label 0.
+
+    Isomorphic rings (with zero mapped to zero) get identical canonical tables.
+    Subtrees that are images of each other under automorphisms found along the
+    way are skipped. Raises ValueError for malformed tables or n > MAX_CANON_N.
+    """
+    m = ring_numpy.as_array(mul)
+    s = None if add is None else ring_numpy.as_array(add)
+    n = len(m)
+    _check_tables(m, s, zero)
+    if n > MAX_CANON_N:
+        raise ValueError(f"Ring too large to canonicalize ({n} > {MAX_CANON_N} elements).")
+    m = m.astype(np.int64)
+    tables = [m] if s is None else [s.astype(np.int64), m]
+
+    best: Dict[str, Any] = {"key": None, "labels": None}
+    automorphisms: List[np.ndarray] = []
+    state = {"leaves": 0, "complete": True}
+
+    def leaf(colors: np.ndarray) -> None:
+        state["leaves"] += 1
+        labels = np.argsort(colors)
+        key = b"".join(colors[t[np.ix_(labels, labels)]].astype("<u4").tobytes() for t in tables)
+        if best["key"] is None or key < best["key"]:
+            best["key"], best["labels"] = key, labels
+        elif key == best["key"]:
+            # same canonical tables from another labeling: that is an automorphism
+            sigma = best["labels"][colors]
+            if (sigma != np.arange(n)).any():
+                automorphisms.append(sigma)
+
+    def search(colors: np.ndarray, path: List[int]) -> None:
+        sizes = np.bincount(colors)
+        if (sizes == 1).all():
+            leaf(colors)
+            return
+        target = int(np.flatnonzero(sizes > 1)[0])
+        explored: List[int] = []
+        known, orbits = -1, None
+        for v in np.flatnonzero(colors == target):
+            v = int(v)
+            if state["leaves"] >= max_leaves:
+                state["complete"] = False
+                return
+            if len(automorphisms) != known:
+                # only automorphisms fixing the individualized path pointwise apply here
+                known = len(automorphisms)
+                fixing = [g for g in automorphisms if (g[path] == path).all()]
+                orbits = _orbits(fixing, n)
+            if (orbits[explored] == orbits[v]).any():
+                continue
+            explored.append(v)
+            search(_refine(tables, _individualize(colors, v)), path + [v])
+
+    if n:
+        start = _rank_rows(ring_invariants(m, s, zero))
+        search(_refine(tables, start), [])
+        labels = best["labels"]
+    else:
+        labels = np.zeros(0, dtype=np.int64)
+
+    relabel = np.empty(n, dtype=np.int64)
+    relabel[labels] = np.arange(n)
+    canon = [ring_numpy.as_array(relabel[t[np.ix_(labels, labels)]]) for t in tables]
+    return CanonicalForm(
+        mul=canon[-1],
+        add=canon[0] if s is not None else None,
+        labels=labels,
+        complete=state["complete"],
+    )
+
+
+def analysis_zero(mul: Any, add: Optional[Any] = None, **options: Any) -> int:
+    """
+    The element analyze_ring(mul, add_table=add, **options) treats as zero:
+    the additive identity of add, zero_index without one (or without add).
+    """
+    zero = options.get("zero_index", 0)
+    return zero if add is None else ring_numpy.additive_zero(add, zero)
+
+
+def canonical_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Analysis options for a canonical form (its zero is always label 0)."""
+    return dict(options, zero_index=0) if "zero_index" in options else options
+
+
+def relabel_result(result: Dict[str, Dict[str, Any]], labels: Sequence[int]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Translate a result computed on a canonical form back to the original labels.
+
+    Witnesses stay valid but are not necessarily the first ones in the original
+    order; the complete witness sets are sorted again. Returns None when the result cannot be translated (validation
+    messages that quote table positions).
+    """
+    def conv(val: Any) -> Any:
+        if isinstance(val, (int, np.integer)) and not isinstance(val, bool):
+            return int(labels[val])
+        if isinstance(val, tuple):
+            return tuple(conv(x) for x in val)
+        if isinstance(val, list):
+            return [conv(x) for x in val]
+        return val
+
+    if "reason" in result.get("ring axioms", {}):
+        return None
+    out: Dict[str, Dict[str, Any]] = {}
+    for prop, data in result.items():
+        data = dict(data)
+        for key in ELEMENT_FIELDS.get(prop, []):
+            if key in data:
+                data[key] = conv(data[key])
+        for group in SORTED_FIELDS.get(prop, []):
+            if all(key in data for key in group):
+                rows = sorted(zip(*(data[key] for key in group)))
+                for i, key in enumerate(group):
+                    data[key] = [row[i] for row in rows]
+        out[prop] = data
+    return out
@@ -1,11 +1,11 @@
-from typing import List, Optional, Tuple, Dict, Any
-##### Additional code to validate that the input is a valid finite ring
-# from .ring_axioms import is_associative, has_additive_inverses, is_distributive
-# from .ring_table import validate_addition_table
+from typing import List, Optional, Tuple, Dict, Any, Union
+from logic import profiling, ring_numpy
+from logic.ring_table import RingTable
+from logic.ring_axioms import check_ring_axioms
 
 
 Element = Any  # Maybe make this stricter later idk (e.g. int, str)
-Table = List[List[Element]]
+Table = Union[List[List[Element]], RingTable]  # RingTable rows index like lists
 
 def is_commutative(mul_table: Table) -> Tuple[bool, Optional[Tuple[int, int]]]:
     """Check if multiplication is commutative: a * b == b * a"""
@@ -57,54 +57,126 @@ def is_division_ring(mul_table: Table, zero_index: int = 0) -> Tuple[bool, Optio
             return False, a
     return True, None
 
-def analyze_ring(mul_table: Table) -> Dict[str, Dict[str, Any]]:
-    """Run all checks and return a structured result."""
+def find_witness_sets(mul_table: Table, zero_index: int = 0) -> Dict[str, List[int]]:
+    """All units (with inverses), zero divisors, idempotents and nilpotents (with their index).
+
+    Rows are Python-int bitsets: bit b of zeros[a] is a*b == 0, of ones[a] a*b == identity.
+    """
+    n = len(mul_table)
+    identity = find_multiplicative_identity(mul_table)
+    zeros = [sum(1 << b for b in range(n) if mul_table[a][b] == zero_index) for a in range(n)]
+    ones = [sum(1 << b for b in range(n) if mul_table[a][b] == identity) for a in range(n)]
+    nonzero = ((1 << n) - 1) & ~(1 << zero_index)
+    column = lambda rows, a: sum(1 << b for b in range(n) if rows[b] >> a & 1)  # noqa: E731
+
+    units, inverses = [], []
+    if identity is not None:
+        for a in range(n):
+            both = ones[a] & column(ones, a)
+            if both:
+                units.append(a)
+                inverses.append((both & -both).bit_length() - 1)
+    divisors = [a for a in range(n) if a != zero_index and (zeros[a] | column(zeros, a)) & nonzero]
+    idempotents = [a for a in range(n) if mul_table[a][a] == a]
+    nilpotents, index = [], []
+    for a in range(n):
+        power = a
+        for k in range(1, n + 1):
+            if power == zero_index:
+                nilpotents.append(a)
+                index.append(k)
+                break
+            power = mul_table[power][a]
+    return {"units": units, "inverses": inverses, "zero divisors": divisors,
+            "idempotents": idempotents, "nilpotents": nilpotents, "nilpotency index": index}
+
+def analyze_ring(
+    mul_table: Table,
+    zero_index: int = 0,
+    cells_read: Optional[Dict[str, int]] = None,
+    add_table: Optional[Table] = None,
+    axioms: str = "exact",
+    error_bound: float = 1e-6,
+    seed: Optional[int] = None,
+    witnesses: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    """Run all checks and return a structured result.
+
+    Shared facts (identity, zero mask, identity hits) are computed once by
+    ring_numpy.compute_ring_facts and every property reads from them; the
+    zero mask and identity hits are only computed when an identity exists
+    (or witnesses need them). The functions above are the
+    pure-Python reference implementations of the same checks (same first
+    counterexamples); they are not called here.
+
+    If add_table is given, the ring axioms are validated first
+    (ring_axioms.check_ring_axioms, axioms="exact" or "sampled"; "off" skips
+    it) and a failed axiom stops the analysis: only the "ring axioms" entry
+    is returned. In every mode the additive identity of add_table replaces
+    zero_index (which stays if there is none).
+
+    If cells_read is given it is filled with the number of table cells each
+    property depended on, plus the "total" actually read.
+
+    witnesses=True adds a "witness sets" entry with the complete sets
+    (ring_numpy.witness_sets): units and their inverses, zero divisors,
+    idempotents, nilpotents and their indices.
+    """
     result = {}
-    
-    ####### Not implemented further due to time constraints
-    #### Replace function name with the line below if implemented
-    # def analyze_ring(add: Optional[Table], mul_table: Table) -> Dict[str, Dict[str, Any]]:
-    # ##### Additional code to validate that the input is a valid finite ring
-    # # --- Additive structure (if given)
-    # if add is not None:
-    #     try:
-    #         zero = validate_addition_table(add)
-    #     except Exception as e:
-    #         result["addition structure"] = {
-    #             "value": False,
-    #             "reason": str(e)
-    #         }
-    #         return result  # stop early if not even a valid commutative group
-
-    #     add_inv = has_additive_inverses(add, zero)
-    #     assoc_add = is_associative(add)
-    #     dist = is_distributive(add, mul_table)
-
-    # # --- Multiplicative structure
-    # assoc_mul = is_associative(mul_table)
-
-    commutative, counter1 = is_commutative(mul_table)
+
+    # --- Ring axioms (if an addition table is given)
+    if add_table is not None and axioms != "off":
+        with profiling.stage("ring axioms"):
+            report = check_ring_axioms(add_table, mul_table, axioms, error_bound, seed)
+        result["ring axioms"] = report
+        if not report["value"]:
+            return result  # stop early: the property checks assume a ring
+        zero_index = report["zero"]
+    elif add_table is not None:
+        with profiling.stage("additive zero", len(mul_table) ** 2):
+            zero_index = ring_numpy.additive_zero(add_table, zero_index)
+
+    facts = ring_numpy.compute_ring_facts(mul_table, zero_index)
+    identity = facts.identity
+
     result["commutative"] = {
-        "value": commutative,
-        "counterexample": counter1
+        "value": facts.asymmetric is None,
+        "counterexample": facts.asymmetric
     }
 
-    identity = find_multiplicative_identity(mul_table)
     result["has identity"] = {
         "value": identity is not None,
         "identity": identity
     }
 
-    integral_domain, counter2 = is_integral_domain(mul_table)
+    n = len(mul_table)
+    with profiling.stage("integral domain", n * n if identity is not None else 0):
+        zero_divisors = facts.zero_divisor() if identity is not None else None
     result["integral domain"] = {
-        "value": integral_domain,
-        "zero divisors": counter2
+        "value": identity is not None and zero_divisors is None,
+        "zero divisors": zero_divisors
     }
 
-    division_ring, missing_inverse = is_division_ring(mul_table)
+    with profiling.stage("division ring", n * n if identity is not None else 0):
+        missing_inverse = facts.missing_inverse() if identity is not None else None
     result["division ring"] = {
-        "value": division_ring,
+        "value": identity is not None and missing_inverse is None,
         "missing inverse": missing_inverse
     }
 
+    if witnesses:
+        with profiling.stage("witness sets", 2 * n * n):
+            result["witness sets"] = {"value": True, **ring_numpy.witness_sets(mul_table, zero_index, identity, facts)}
+
+    if cells_read is not None:
+        read = facts.cells_read
+        found = read["has identity"]  # both checks below depend on the identity
+        cells_read.update({
+            "commutative": read["commutative"],
+            "has identity": found,
+            "integral domain": found + read.get("zero mask", 0),
+            "division ring": found + read.get("identity hits", 0),
+            "total": sum(read.values()),
+        })
+
     return result
@@ -0,0 +1,380 @@
+# logic/ring_numpy.py
+"""
+Array-backed versions of the checks in ring_checker.py and ring_axioms.py.
+
+Tables are held as contiguous integer ndarrays and every check runs as batched
+array operations. Each function mirrors its pure-Python counterpart (which stays
+the reference implementation) and returns the same counterexample, i.e. the
+first failing index in row-major order.
+"""
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+from logic import profiling
+
+# Upper bound on cells materialised per slab by the O(n^3) axiom checks.
+CHUNK_CELLS = 1 << 22
+
+
+def as_array(table: Any) -> np.ndarray:
+    """Return table as a contiguous 2D ndarray using the narrowest unsigned dtype."""
+    arr = np.asarray(table)
+    if arr.size == 0:
+        arr = arr.reshape(0, 0)
+    if arr.size == 0 or arr.dtype.kind not in "iu" or arr.min() < 0:
+        return np.ascontiguousarray(arr)
+    top = int(arr.max())
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if top <= np.iinfo(dtype).max:
+            return np.ascontiguousarray(arr, dtype=dtype)
+    return np.ascontiguousarray(arr)
+
+
+def first_true(mask: np.ndarray) -> Optional[Tuple[int, ...]]:
+    """Row-major index of the first True entry of mask, or None."""
+    if mask.size == 0:
+        return None
+    pos = int(mask.argmax())
+    if not mask.flat[pos]:
+        return None
+    return tuple(int(i) for i in np.unravel_index(pos, mask.shape))
+
+
+def _slab_size(n: int) -> int:
+    return max(1, CHUNK_CELLS // max(1, n * n))
+
+
+# ---------- shared per-table facts ----------
+
+@dataclass
+class RingFacts:
+    """
+    Facts about a multiplication table that several property checks need.
+
+    Built once per table by compute_ring_facts(); the property checks in
+    analyze_ring read these instead of walking mul_table again. zero_mask
+    and hits_identity are only computed when a check first asks for them.
+    cells_read counts the table cells each fact actually compared.
+    """
+    table: np.ndarray
+    zero: int
+    asymmetric: Optional[Tuple[int, int]]   # first (i, j) with i*j != j*i
+    identity: Optional[int]
+    cells_read: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def n(self) -> int:
+        return len(self.table)
+
+    @cached_property
+    def zero_mask(self) -> np.ndarray:
+        """[a, b] -> a*b == zero."""
+        self.cells_read["zero mask"] = self.n * self.n
+        return self.table == self.zero
+
+    @cached_property
+    def hits_identity(self) -> Optional[np.ndarray]:
+        """[a, b] -> a*b == b*a == identity (None without an identity)."""
+        if self.identity is None:
+            return None
+        self.cells_read["identity hits"] = self.n * self.n
+        hits = self.table == self.identity  # one comparison per cell, the transpose is a view
+        return hits & hits.T
+
+    def zero_divisor(self) -> Optional[Tuple[int, int]]:
+        """First (a, b) with a, b != zero and a*b == zero."""
+        mask = self.zero_mask
+        if 0 <= self.zero < self.n:
+            mask = mask.copy()
+            mask[self.zero, :] = False
+            mask[:, self.zero] = False
+        return first_true(mask)
+
+    def missing_inverse(self) -> Optional[int]:
+        """First non-zero element without a two-sided inverse (needs identity)."""
+        has_inverse = self.hits_identity.any(axis=1)
+        if 0 <= self.zero < self.n:
+            has_inverse[self.zero] = True
+        hit = first_true(~has_inverse)
+        return None if hit is None else hit[0]
+
+
+def compute_ring_facts(mul_table: Any, zero_index: int = 0) -> RingFacts:
+    """
+    Settle commutativity and the identity of mul_table.
+
+    Commutativity compares every cell with its transpose once. For the
+    identity, rows are compared with 0..n-1 and only the rows that match
+    (the candidates) have their columns checked. The zero mask and identity
+    hits follow lazily (see RingFacts).
+    """
+    n = len(mul_table)
+    with profiling.stage("convert table", n * n):
+        t = as_array(mul_table)
+    ar = np.arange(n)
+
+    with profiling.stage("commutative", n * n):
+        asymmetric = first_true(t != t.T)
+    with profiling.stage("has identity", n * n):
+        candidates = np.flatnonzero((t == ar).all(axis=1))       # e * i == i
+        profiling.add_cells("has identity", n * len(candidates))
+        cols = (t[:, candidates] == ar[:, None]).all(axis=0)    # i * e == i
+        identity = int(candidates[cols][0]) if cols.any() else None
+    cells_read = {"commutative": n * n, "has identity": n * n + n * len(candidates)}
+    return RingFacts(t, zero_index, asymmetric, identity, cells_read)
+
+
+# ---------- ring_checker counterparts ----------
+
+def is_commutative(mul_table: Any) -> Tuple[bool, Optional[Tuple[int, int]]]:
+    """Check if multiplication is commutative: a * b == b * a"""
+    t = as_array(mul_table)
+    hit = first_true(t != t.T)
+    if hit is not None:
+        return False, hit
+    return True, None
+
+
+def additive_zero(add_table: Any, default: int = 0) -> int:
+    """The identity of an addition table; default when there is none (or the table is not square)."""
+    s = as_array(add_table)
+    if s.ndim == 2 and s.shape[0] == s.shape[1] and s.size:
+        identity = find_multiplicative_identity(s)
+        if identity is not None:
+            return identity
+    return default
+
+
+def find_multiplicative_identity(mul_table: Any) -> Optional[int]:
+    """Return the index of the identity element if it exists."""
+    t = as_array(mul_table)
+    n = len(t)
+    ar = np.arange(n)
+    rows = (t == ar).all(axis=1)           # e * i == i
+    cols = (t == ar[:, None]).all(axis=0)  # i * e == i
+    hit = first_true(rows & cols)
+    return None if hit is None else hit[0]
+
+
+def has_zero_divisors(mul_table: Any, zero_index: int = 0) -> Optional[Tuple[int, int]]:
+    """Check for zero divisors: a ≠ 0, b ≠ 0, but a * b == 0"""
+    t = as_array(mul_table)
+    mask = t == zero_index
+    if 0 <= zero_index < len(t):
+        mask[zero_index, :] = False
+        mask[:, zero_index] = False
+    return first_true(mask)
+
+
+def is_integral_domain(mul_table: Any, zero_index: int = 0) -> Tuple[bool, Optional[Tuple[int, int]]]:
+    """True if no zero divisors and ring has identity."""
+    t = as_array(mul_table)
+    if find_multiplicative_identity(t) is None:
+        return False, None
+    zd = has_zero_divisors(t, zero_index)
+    if zd:
+        return False, zd
+    return True, None
+
+
+def is_division_ring(mul_table: Any, zero_index: int = 0) -> Tuple[bool, Optional[int]]:
+    """Check if every non-zero element has a multiplicative inverse."""
+    t = as_array(mul_table)
+    identity = find_multiplicative_identity(t)
+    if identity is None:
+        return False, None
+    hits = (t == identity) & (t.T == identity)
+    has_inverse = hits.any(axis=1)
+    if 0 <= zero_index < len(t):
+        has_inverse[zero_index] = True
+    hit = first_true(~has_inverse)
+    if hit is not None:
+        return False, hit[0]
+    return True, None
+
+
+# ---------- complete witness sets ----------
+
+def pack_rows(mask: np.ndarray) -> np.ndarray:
+    """Row bitsets of a boolean matrix: uint64 words, bit j of row i (word j // 64) is mask[i, j]."""
+    rows, cols = mask.shape
+    words = max(1, -(-cols // 64))
+    packed = np.zeros((rows, words * 8), dtype=np.uint8)
+    packed[:, :-(-cols // 8)] = np.packbits(mask, axis=1, bitorder="little")
+    return packed.view("<u8")
+
+
+def lowest_bits(bits: np.ndarray) -> np.ndarray:
+    """Index of the lowest set bit of every row bitset (-1 for empty rows)."""
+    nonzero = bits != 0
+    word = nonzero.argmax(axis=1)
+    w = bits[np.arange(len(bits)), word]
+    low = w & (~w + np.uint64(1))  # isolate the lowest bit (two's complement)
+    pos = np.log2(np.maximum(low, 1).astype(np.float64)).astype(np.int64)
+    return np.where(nonzero.any(axis=1), word * 64 + pos, -1)
+
+
+def witness_sets(mul_table: Any, zero: int = 0, identity: Optional[int] = None,
+                 facts: Optional[RingFacts] = None) -> Dict[str, List[int]]:
+    """
+    Every unit (with its two-sided inverse), zero divisor, idempotent and
+    nilpotent (with its index) of the ring, in increasing order.
+
+    Zero divisors are the non-zero a with a*b == 0 or b*a == 0 for some
+    non-zero b; nilpotents the a with a^k == 0 (powers taken from the left),
+    k being the index. The "a*b == 0" and "a*b == identity" relations are
+    packed into per-row uint64 bitsets and reduced word by word; facts (from
+    compute_ring_facts with the same zero) saves recomputing them.
+    """
+    t = as_array(mul_table)
+    n = len(t)
+    ar = np.arange(n)
+    out: Dict[str, List[int]] = {}
+
+    zero_mask = facts.zero_mask if facts is not None else t == zero
+    nonzero = pack_rows((ar != zero)[None, :])
+    left = pack_rows(zero_mask) & nonzero      # row a: the b != 0 with a*b == 0
+    right = pack_rows(zero_mask.T) & nonzero   # row a: the b != 0 with b*a == 0
+    divisors = ((left | right) != 0).any(axis=1)
+    if 0 <= zero < n:
+        divisors[zero] = False
+
+    units, inverses = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    if identity is not None:
+        hits = facts.hits_identity if facts is not None else (t == identity) & (t.T == identity)
+        inverse = lowest_bits(pack_rows(hits))
+        units = np.flatnonzero(inverse >= 0)
+        inverses = inverse[units]
+    out["units"] = units.tolist()
+    out["inverses"] = inverses.tolist()
+    out["zero divisors"] = np.flatnonzero(divisors).tolist()
+    out["idempotents"] = np.flatnonzero(t[ar, ar] == ar).tolist()
+
+    # a^k for every still undecided a; a leaves when a^k is zero (nilpotent, index k)
+    # or when its powers repeat (a^(k+1) == a^k or == a: they cycle without reaching zero)
+    index = np.zeros(n, dtype=np.int64)
+    pending, power = ar, ar.copy()
+    for k in range(1, n + 1):
+        hit = power == zero
+        index[pending[hit]] = k
+        following = t[power, pending]
+        keep = ~hit & (following != power) & (following != pending)
+        pending, power = pending[keep], following[keep]
+        if not len(pending):
+            break
+    nilpotents = np.flatnonzero(index)
+    out["nilpotents"] = nilpotents.tolist()
+    out["nilpotency index"] = index[nilpotents].tolist()
+    return out
+
+
+# ---------- ring_axioms counterparts ----------
+
+def is_associative(table: Any) -> Optional[Tuple[int, int, int]]:
+    """Check if table is associative: (a * b) * c == a * (b * c) for all a, b, c."""
+    t = as_array(table)
+    n = len(t)
+    step = _slab_size(n)
+    for a0 in range(0, n, step):
+        rows = t[a0:a0 + step]
+        left = t[rows]      # [a, b, c] -> (a*b)*c
+        right = rows[:, t]  # [a, b, c] -> a*(b*c)
+        hit = first_true(left != right)
+        if hit is not None:
+            return (a0 + hit[0], hit[1], hit[2])
+    return None
+
+
+def additive_generators(add_table: Any, zero: int) -> List[int]:
+    """
+    A small generating set of the additive structure (usually O(log n) elements).
+
+    Greedy: take the first element not yet generated and extend the generated
+    set H to H + <x>. Every new generator at least doubles H in a group. Each
+    element of H is a sum of generators, so the result generates everything
+    even if the addition table turns out not to be associative.
+    """
+    s = as_array(add_table)
+    n = len(s)
+    generated = np.zeros(n, dtype=bool)
+    if n == 0:
+        return []
+    generated[zero] = True
+    gens: List[int] = []
+    for x in range(n):
+        if generated[x]:
+            continue
+        gens.append(x)
+        # multiples x, x+x, ... until they cycle
+        multiples = [x]
+        seen = {x}
+        c = int(s[x, x])
+        while c not in seen:
+            seen.add(c)
+            multiples.append(c)
+            c = int(s[c, x])
+        sums = s[np.ix_(np.flatnonzero(generated), np.array(multiples))]
+        generated[sums.ravel()] = True
+        generated[multiples] = True
+    return gens
+
+
+def is_associative_light(
+    table: Any,
+    generators: List[int],
+    checked: Optional[List[int]] = None
+) -> Optional[Tuple[int, int, int]]:
+    """
+    Light's associativity test restricted to a generating set.
+
+    The elements g with (x*g)*y == x*(g*y) for all x, y are closed under the
+    operation itself and, when the operation distributes over an addition,
+    under that addition too. Testing g over a generating set of either one
+    is therefore enough, at n^2 lookups per generator instead of n^3 in total.
+    Returns an (a, b, c) counterexample like is_associative (b is the generator).
+    If checked is given, the number of triples examined is appended to it.
+    """
+    t = as_array(table)
+    n = len(t)
+    count = 0
+    for g in generators:
+        left = t[t[:, g]]    # [x, y] -> (x*g)*y
+        right = t[:, t[g]]   # [x, y] -> x*(g*y)
+        hit = first_true(left != right)
+        if hit is not None:
+            count += hit[0] * n + hit[1] + 1
+            if checked is not None:
+                checked.append(count)
+            return (hit[0], int(g), hit[1])
+        count += n * n
+    if checked is not None:
+        checked.append(count)
+    return None
+
+
+def has_additive_inverses(add_table: Any, zero: int) -> Optional[int]:
+    """Check that every element has an inverse: a + (-a) = 0."""
+    t = as_array(add_table)
+    hit = first_true(~(t == zero).any(axis=1))
+    return None if hit is None else hit[0]
+
+
+def is_distributive(add: Any, mul: Any) -> Optional[Tuple[int, int, int, str]]:
+    """Check distributivity of multiplication over addition."""
+    s = as_array(add)
+    m = as_array(mul)
+    n = len(s)
+    step = _slab_size(n)
+    for a0 in range(0, n, step):
+        mul_a = m[a0:a0 + step]
+        # Left distributive: a*(b+c) == a*b + a*c
+        left_bad = mul_a[:, s] != s[mul_a[:, :, None], mul_a[:, None, :]]
+        # Right distributive: (a+b)*c == a*c + b*c
+        right_bad = m[s[a0:a0 + step]] != s[mul_a[:, None, :], m[None, :, :]]
+        hit = first_true(left_bad | right_bad)
+        if hit is not None:
+            a, b, c = a0 + hit[0], hit[1], hit[2]
+            return (a, b, c, "left" if left_bad[hit] else "right")
+    return None
@@ -1,20 +1,145 @@
 # logic/ring_table.py
-from typing import List, Union, Tuple, Any
+from array import array
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Sequence, Union, Tuple, Any
 import re
 
+import numpy as np
+
+from logic import profiling, ring_numpy
+
+
+def typecode_for(max_value: int) -> str:
+    """Narrowest unsigned array typecode holding 0..max_value (uint8/uint16/uint32)."""
+    if max_value <= 0xFF:
+        return "B"
+    if max_value <= 0xFFFF:
+        return "H"
+    if max_value <= 0xFFFFFFFF:
+        return "I"
+    raise ValueError(f"Table entries up to {max_value} do not fit in 32 bits")
+
+
+class RingTable:
+    """
+    An n x n operation table stored as one flat typed buffer.
+
+    Elements are uint8/uint16/uint32 depending on their range, instead of a
+    boxed int per cell inside a list per row. table[i] is a zero-copy
+    memoryview of row i, so table[i][j] works anywhere a List[List[int]] did.
+    col(j) is a strided zero-copy view of column j. np.asarray(table) is zero-copy as well.
+
+    The buffer can be anything exposing the buffer protocol (array, bytes,
+    numpy array, an mmap slice); writable buffers make the table editable
+    through table[i][j] = v.
+    """
+    __slots__ = ("n", "typecode", "_data", "_view")
+
+    def __init__(self, n: int, data: Any = None, typecode: Optional[str] = None):
+        typecode = typecode or typecode_for(max(n - 1, 0))
+        if data is None:
+            data = array(typecode, bytes(n * n * array(typecode).itemsize))
+        view = memoryview(data)
+        if view.format != typecode or view.ndim != 1:
+            view = view.cast("B").cast(typecode)
+        if len(view) != n * n:
+            raise ValueError(f"Buffer holds {len(view)} cells, expected {n}x{n}")
+        self.n = n
+        self.typecode = typecode
+        self._data = data
+        self._view = view
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]]) -> "RingTable":
+        """Copy a square List[List[int]] (or anything row-indexable) into a RingTable."""
+        n = len(rows)
+        if any(len(row) != n for row in rows):
+            raise ValueError("Table must be square.")
+        try:
+            flat = array("I" if n else "B", chain.from_iterable(rows))
+        except OverflowError:
+            raise ValueError("Table entries must be non-negative 32-bit integers.")
+        top = max(flat, default=0)
+        typecode = typecode_for(max(top, n - 1, 0))
+        if typecode != flat.typecode:
+            flat = array(typecode, flat)
+        return cls(n, flat, typecode)
+
+    @classmethod
+    def from_array(cls, arr: np.ndarray) -> "RingTable":
+        """RingTable over a square int array (no copy if it already has the narrowest dtype)."""
+        n = len(arr)
+        top = int(arr.max()) if arr.size else 0
+        typecode = typecode_for(max(top, n - 1, 0))
+        return cls(n, np.ascontiguousarray(arr, dtype=_TYPECODE_DTYPES[typecode]).reshape(-1), typecode)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i: int) -> memoryview:
+        n = self.n
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("row index out of range")
+        return self._view[i * n:(i + 1) * n]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return (self[i] for i in range(self.n))
+
+    def __repr__(self) -> str:
+        return f"RingTable(n={self.n}, typecode={self.typecode!r})"
+
+    def __reduce__(self):
+        return (RingTable, (self.n, self.tobytes(), self.typecode))
+
+    def __array__(self, dtype=None, copy=None):
+        """A view of the cells (writes go to the table) unless copy is true or dtype differs."""
+        arr = np.frombuffer(self._view, dtype=self._view.format).reshape(self.n, self.n)
+        if dtype is not None:
+            return arr.astype(dtype, copy=bool(copy))
+        return arr.copy() if copy else arr
+
+    def row(self, i: int) -> memoryview:
+        return self[i]
+
+    def col(self, j: int) -> memoryview:
+        """Column j as a strided view (no copy)."""
+        return self._view[j::self.n]
+
+    @property
+    def nbytes(self) -> int:
+        return self._view.nbytes
+
+    def max_value(self) -> int:
+        return max(self._view, default=0)
+
+    def tobytes(self) -> bytes:
+        return self._view.tobytes()
+
+    def tolist(self) -> List[List[int]]:
+        return [row.tolist() for row in self]
+
+
+Table = Union[List[List[int]], RingTable]
+
+
 def build_znz_table(n: int) -> List[List[int]]:
     """Return multiplication table for Z/nZ."""
     return [[(i * j) % n for j in range(n)] for i in range(n)]
 
-def validate_custom_table(table: List[List[int]]) -> bool:
+def validate_custom_table(table: Table) -> bool:
     """Core checks: square, all entries in 0..n-1."""
     n = len(table)
+    if isinstance(table, RingTable):
+        return n == 0 or int(np.asarray(table).max()) < n
     if any(len(row) != n for row in table):
         return False
     valid = set(range(n))
     return all(x in valid for row in table for x in row)
 
-def validate_addition_table(add_table: List[List[int]]) -> int:
+@profiling.staged("validate addition", cells=lambda table: len(table) ** 2)
+def validate_addition_table(add_table: Table) -> int:
     """
     Validate that the addition table defines a commutative group with some identity element.
     Automatically detects and returns the index of the additive identity.
@@ -23,31 +148,197 @@ def validate_addition_table(add_table: List[List[int]]) -> int:
     if not validate_custom_table(add_table):
         raise ValueError("Addition table must be square with entries 0..n-1.")
 
-    n = len(add_table)
-
-    # Check commutativity: a + b == b + a
-    for i in range(n):
-        for j in range(n):
-            if add_table[i][j] != add_table[j][i]:
-                raise ValueError(f"Addition not commutative at (row {i+1}, column {j+1})")
+    # Check commutativity: a + b == b + a (first failing cell in row-major order)
+    commutative, cell = ring_numpy.is_commutative(add_table)
+    if not commutative:
+        i, j = cell
+        raise ValueError(f"Addition not commutative at (row {i+1}, column {j+1})")
 
     # Try to find the identity element (i.e., row/col e such that a + e = a and e + a = a)
-    for e in range(n):
-        if all(add_table[e][i] == i and add_table[i][e] == i for i in range(n)):
-            return e  # success — return index of identity
+    e = ring_numpy.find_multiplicative_identity(add_table)
+    if e is not None:
+        return e  # success — return index of identity
 
     raise ValueError("No valid additive identity found\n(no element that behaves like e + a = a + e = a).\nThis app requires a valid addition table with an identity element.")
 
 
-def validate_multiplication_table(mul_table: List[List[int]]) -> None:
+@profiling.staged("validate multiplication", cells=lambda table: len(table) ** 2)
+def validate_multiplication_table(mul_table: Table) -> None:
     """Raise if not a valid multiplication table (shape + range)."""
     if not validate_custom_table(mul_table):
         raise ValueError("Multiplication table must be square with entries 0..n-1.")
 
+# Bulk tokenizer: blocks made only of these bytes are parsed by numpy in one
+# call per line; anything else (signs, other characters, huge numbers) goes
+# through the int() path, which also produces the error messages.
+_TO_SPACE = bytes.maketrans(b",\t\r\x0b\x0c", b"     ")
+_NUMERIC = b"0123456789\n ,\t\r\x0b\x0c"
+_TYPECODE_DTYPES = {"B": np.uint8, "H": np.uint16, "I": np.uint32}
+
+
+def _bulk_ints(lines: Sequence[str]) -> Optional[List[np.ndarray]]:
+    """One int64 array per line, or None if the fast path does not apply."""
+    try:
+        data = "\n".join(lines).encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    if data.translate(None, _NUMERIC):
+        return None
+    # (fromstring reads a blank string as [0], so those are skipped)
+    arrs = [
+        np.fromstring(part, dtype=np.int64, sep=" ") if part and not part.isspace() else np.zeros(0, dtype=np.int64)
+        for part in data.translate(_TO_SPACE).split(b"\n")
+    ]
+    # fromstring saturates on overflow; leave big numbers to int()
+    if any(a.size and a.max() > 0xFFFFFFFF for a in arrs):
+        return None
+    return arrs
+
+
+def parse_ints(line: str) -> List[int]:
+    """Integers of a comma- or whitespace-separated line (raises like int() on bad tokens)."""
+    arrs = _bulk_ints([line])
+    if arrs is not None:
+        return arrs[0].tolist()
+    return [int(x) for x in re.split(r"[,\s]+", line) if x]
+
+
+def _finish_table(table: Union[np.ndarray, List[List[int]]], compact: bool) -> Table:
+    """Parsed table as the caller wants it: RingTable when compact, else List[List[int]]."""
+    if isinstance(table, np.ndarray):
+        return RingTable.from_array(table) if compact else table.tolist()
+    return RingTable.from_rows(table) if compact else table
+
+
+def _parse_elems(idx: int, n: int, line: str) -> List[int]:
+    """Element line of a Z/nZ-style block, checked against 0..n-1."""
+    arrs = _bulk_ints([line])
+    if arrs is not None:
+        # all non-negative here; only the upper bound needs checking
+        arr = arrs[0]
+        if arr.size and arr.max() >= n:
+            raise ValueError(f"Batch {idx}: elems must be in 0..{n-1}, got {arr.tolist()}")
+        return arr.tolist()
+    elems = [int(x) for x in re.split(r"[,\s]+", line) if x]
+    if any(e < 0 or e >= n for e in elems):
+        raise ValueError(f"Batch {idx}: elems must be in 0..{n-1}, got {elems}")
+    return elems
+
+
+def _znz_tables(n: int, elems: List[int]) -> Tuple[Any, Any]:
+    """(add, mul) of a Z/nZ subset: int64 arrays when n*n fits, else nested lists."""
+    if n < 1 << 31:
+        e = np.array(elems, dtype=np.int64)
+        return (e[:, None] + e) % n, (e[:, None] * e) % n
+    return [[(a+b) % n for b in elems] for a in elems], [[(a*b) % n for b in elems] for a in elems]
+
+
+def _parse_n(idx: int, lines: List[str]) -> int:
+    try:
+        return int(lines[0])
+    except ValueError:
+        raise ValueError(f"Batch {idx}: expected integer n, got '{lines[0]}'")
+
+def _parse_znz_spec(idx: int, lines: List[str]) -> Tuple[int, List[int]]:
+    n = _parse_n(idx, lines)
+    if len(lines) != 2:
+        raise ValueError(f"Batch {idx}: Z/nZ fast mode needs 2 lines (n + elems), got {len(lines)}")
+    return n, _parse_elems(idx, n, lines[1])
+
+def _parse_block(idx: int, lines: List[str], custom: bool) -> Any:
+    """
+    Parse one fast-input block (non-blank, stripped lines); idx is used in error messages.
+
+    Tables come back as int64 arrays (bulk-parsed) or nested lists; see _finish_table.
+    """
+    # 1) + 2) Z/nZ tab
+    if not custom:
+        n, elems = _parse_znz_spec(idx, lines)
+        return _znz_tables(n, elems)[1]
+
+    # 1) Read n
+    n = _parse_n(idx, lines)
+
+    # 3) Custom tab: ZnZ‑style fallback (2 lines)
+    if len(lines) == 2:
+        elems = _parse_elems(idx, n, lines[1])
+        return _znz_tables(n, elems)
+
+    # 4) Custom tab: full custom tables (1 + 2*n lines)
+    if len(lines) == 1 + 2*n:
+        add_rows = lines[1:1+n]
+        mul_rows = lines[1+n:1+2*n]
+        def parse_tbl(rows: List[str], kind: str) -> Union[np.ndarray, List[List[int]]]:
+            arrs = _bulk_ints(rows)
+            if arrs is not None and all(len(a) == n for a in arrs):
+                return np.concatenate(arrs).reshape(n, n) if n else np.zeros((0, 0), dtype=np.int64)
+            # slow path: exact per-row messages (and int() errors) for malformed rows
+            tbl = []
+            for r, row in enumerate(rows, start=1):
+                nums = [int(x) for x in re.split(r"[,\s]+", row) if x]
+                if len(nums) != n:
+                    raise ValueError(f"Batch {idx} {kind} row {r}: need {n} elements, got {len(nums)} elements")
+                tbl.append(nums)
+            return tbl
+        return (parse_tbl(add_rows, "Addition"), parse_tbl(mul_rows, "Multiplication"))
+
+    # Otherwise invalid
+    raise ValueError(f"Batch {idx}: invalid number of lines ({len(lines)}) for n={n}")
+
+def _iter_raw_blocks(source: Iterable[str]) -> Iterator[Tuple[int, List[str]]]:
+    """(batch number, non-blank stripped lines) for each blank-line-separated block."""
+    idx = 0
+    lines: List[str] = []
+    for raw in source:
+        line = raw.strip()
+        if line:
+            lines.append(line)
+            continue
+        if lines:
+            idx += 1
+            yield idx, lines
+            lines = []
+    if lines:
+        idx += 1
+        yield idx, lines
+
+def iter_fast_blocks(
+    source: Iterable[str],
+    custom: bool = False,
+    compact: bool = False
+) -> Iterator[Union[Table, Tuple[Table, Table]]]:
+    """
+    Streaming version of parse_fast_blocks.
+
+    source is any iterable of lines (an open file, sys.stdin, ...). Rings are
+    yielded one at a time as soon as their block ends, so only the current
+    block is held in memory. Blocks and error messages are the same as in
+    parse_fast_blocks; compact=True yields RingTables instead of nested lists.
+    """
+    for idx, lines in _iter_raw_blocks(source):
+        with profiling.stage("parse"):
+            block = _parse_block(idx, lines, custom)
+            if custom:
+                ring = tuple(_finish_table(t, compact) for t in block)
+                profiling.add_cells("parse", 2 * len(ring[1]) ** 2)
+            else:
+                ring = _finish_table(block, compact)
+                profiling.add_cells("parse", len(ring) ** 2)
+        yield ring
+
+def iter_znz_specs(source: Iterable[str]) -> Iterator[Tuple[int, List[int]]]:
+    """Z/nZ fast-input blocks as (n, elems) without building any table (see logic.znz)."""
+    for idx, lines in _iter_raw_blocks(source):
+        with profiling.stage("parse"):
+            spec = _parse_znz_spec(idx, lines)
+            profiling.add_cells("parse", len(spec[1]))
+        yield spec
+
 def parse_fast_blocks(
     text: str,
-    custom: bool = False
-) -> List[Union[List[List[int]], Tuple[List[List[int]], List[List[int]]]]]:
+    custom: bool = False,
+    compact: bool = False
+) -> List[Union[Table, Tuple[Table, Table]]]:
     """
     Parses fast-input batches separated by blank lines (optional).
 
@@ -56,58 +347,8 @@ def parse_fast_blocks(
         * 2-line blocks: ZnZ‑style subset → returns (add, mul).
         * 1+2*n-line blocks: full custom tables → returns (add, mul).
         * Otherwise: ValueError.
-    """
-    raw_blocks = re.split(r"\n\s*\n", text.strip())
-    out: List[Any] = []
-
-    for idx, blk in enumerate(raw_blocks, start=1):
-        lines = [l.strip() for l in blk.splitlines() if l.strip()]
-        if not lines:
-            continue
+    - compact=True: tables come back as RingTable (flat typed buffers) instead of nested lists.
 
-        # 1) Read n
-        try:
-            n = int(lines[0])
-        except ValueError:
-            raise ValueError(f"Batch {idx}: expected integer n, got '{lines[0]}'")
-
-        # 2) Z/nZ tab
-        if not custom:
-            if len(lines) != 2:
-                raise ValueError(f"Batch {idx}: Z/nZ fast mode needs 2 lines (n + elems), got {len(lines)}")
-            elems = [int(x) for x in re.split(r"[,\s]+", lines[1]) if x]
-            if any(e < 0 or e >= n for e in elems):
-                raise ValueError(f"Batch {idx}: elems must be in 0..{n-1}, got {elems}")
-            mul = [[(a*b) % n for b in elems] for a in elems]
-            out.append(mul)
-            continue
-
-        # 3) Custom tab: ZnZ‑style fallback (2 lines)
-        if len(lines) == 2:
-            elems = [int(x) for x in re.split(r"[,\s]+", lines[1]) if x]
-            if any(e < 0 or e >= n for e in elems):
-                raise ValueError(f"Batch {idx}: elems must be in 0..{n-1}, got {elems}")
-            add = [[(a+b) % n for b in elems] for a in elems]
-            mul = [[(a*b) % n for b in elems] for a in elems]
-            out.append((add, mul))
-            continue
-
-        # 4) Custom tab: full custom tables (1 + 2*n lines)
-        if len(lines) == 1 + 2*n:
-            add_rows = lines[1:1+n]
-            mul_rows = lines[1+n:1+2*n]
-            def parse_tbl(rows: List[str], kind: str) -> List[List[int]]:
-                tbl = []
-                for r, row in enumerate(rows, start=1):
-                    nums = [int(x) for x in re.split(r"[,\s]+", row) if x]
-                    if len(nums) != n:
-                        raise ValueError(f"Batch {idx} {kind} row {r}: need {n} elements, got {len(nums)} elements")
-                    tbl.append(nums)
-                return tbl
-            out.append((parse_tbl(add_rows, "Addition"), parse_tbl(mul_rows, "Multiplication")))
-            continue
-
-        # Otherwise invalid
-        raise ValueError(f"Batch {idx}: invalid number of lines ({len(lines)}) for n={n}")
-
-    return out
+    Use iter_fast_blocks to stream rings from a file instead of building the list.
+    """
+    return list(iter_fast_blocks(text.splitlines(), custom, compact))
@@ -0,0 +1,514 @@
+# logic/service.py
+"""
+Long-running local analysis service: python -m logic serve
+
+Tools that analyze a few rings at a time would otherwise pay interpreter
+start-up, imports and pool start-up on every call. The service keeps a warm
+ProcessPoolExecutor (every worker imported the checkers and analyzed a tiny
+ring before the first request) and speaks plain HTTP/1.1 on localhost or a
+Unix socket, using nothing but asyncio:
+
+    POST /analyze    body: fast input (text, as for the CLI) or a ring table
+                     container (logic.ring_binary, detected by its magic)
+                     query: custom=1, axioms=exact|sampled|off, error_bound=,
+                     seed=, witnesses=1, source=
+                     reply: JSON lines, one per ring in input order, streamed
+                     (chunked) as the rings finish; the keys are those of
+                     `python -m logic analyze --format jsonl`
+    GET  /metrics    queue depth, work in flight, counters and latency percentiles
+    GET  /health     {"status": "ok"}
+
+Rings of all requests go through one queue. The dispatcher takes the first
+queued ring, keeps collecting for batch_window seconds (or until max_batch
+rings / MAX_BATCH_CELLS table cells) and ships them as one pool task, so
+concurrent small requests are coalesced instead of paying a round trip each.
+At most two tasks per worker are in flight; beyond that rings wait in the
+queue, which is what "queue depth" reports. Custom rings are looked up in
+the result cache (keys normalized by result_cache.key_options, so the CLI
+and the GUI hit the same entries) before being queued.
+"""
+import asyncio
+import http.client
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from logic.batch import Packed, pack_table, unpack_table
+from logic.export import flatten_result
+from logic.result_cache import ResultCache, table_digest
+from logic.ring_binary import RingFile, is_ring_data
+from logic.ring_checker import analyze_ring
+from logic.ring_table import (iter_fast_blocks, iter_znz_specs, validate_addition_table,
+                              validate_multiplication_table)
+from logic.znz import ZnZRing
+
+Result = Dict[str, Dict[str, Any]]
+Outcome = Tuple[Optional[Result], Optional[str]]  # (result, error message)
+
+DEFAULT_PORT = 8765
+# Seconds the dispatcher waits for more rings after the first one of a batch.
+BATCH_WINDOW = 0.005
+# Upper bounds for one pool task.
+MAX_BATCH = 64
+MAX_BATCH_CELLS = 1 << 22
+# Pool tasks in flight per worker; further rings wait in the queue.
+TASKS_PER_WORKER = 2
+# Latency samples kept per metric for the percentiles in /metrics.
+LATENCY_SAMPLES = 4096
+# Largest request body accepted.
+MAX_BODY = 1 << 30
+
+
+# ---------- pool workers ----------
+
+def _warm() -> None:
+    """Pool initializer: pay imports and first-call costs before the first request."""
+    analyze_ring([[0, 0], [0, 1]], add_table=[[0, 1], [1, 0]])
+    ZnZRing(6).analyze()
+
+
+def _ping() -> int:
+    time.sleep(0.05)  # keeps the worker busy so the next ping starts another one
+    return os.getpid()
+
+
+def _run_jobs(jobs: List[Tuple[str, Any, Dict[str, Any]]]) -> List[Outcome]:
+    """One pool task: ("znz", (n, elements)) and ("custom", (add, mul) packed) rings with their options."""
+    out: List[Outcome] = []
+    for kind, payload, options in jobs:
+        try:
+            if kind == "znz":
+                n, elems = payload
+                res = ZnZRing(n, elems).analyze()
+            else:
+                add, mul = payload
+                res = analyze_ring(unpack_table(mul), add_table=None if add is None else unpack_table(add), **options)
+            out.append((res, None))
+        except ValueError as e:
+            out.append((None, str(e)))
+        except Exception as e:  # one bad ring must not fail the other rings of the batch
+            out.append((None, f"analysis failed: {e!r}"))
+    return out
+
+
+# ---------- requests ----------
+
+class _Job:
+    """
+    One ring of a request. kind is "znz", "custom" or "invalid" (payload is
+    then the validation message); cached is the cache hit found while parsing.
+    """
+    __slots__ = ("kind", "payload", "options", "n", "key", "cached", "future", "queued_at")
+
+    def __init__(self, kind: str, payload: Any, options: Dict[str, Any], n: int, key: Optional[str]):
+        self.kind = kind
+        self.payload = payload
+        self.options = options
+        self.n = n
+        self.key = key
+        self.cached: Optional[Result] = None
+        self.future: Optional[asyncio.Future] = None
+        self.queued_at = 0.0
+
+
+def parse_options(query: Dict[str, List[str]]) -> Tuple[bool, Dict[str, Any], str]:
+    """(custom, analyze_ring options, source) from the query string of POST /analyze."""
+    def get(name: str, default: str) -> str:
+        return query.get(name, [default])[-1]
+
+    flag = lambda name: get(name, "0").lower() in ("1", "true", "yes")  # noqa: E731
+    custom = flag("custom")
+    axioms = get("axioms", "exact")
+    if axioms not in ("exact", "sampled", "off"):
+        raise ValueError("axioms must be exact, sampled or off")
+    try:
+        options: Dict[str, Any] = {"axioms": axioms, "error_bound": float(get("error_bound", "1e-6")),
+                                   "seed": int(get("seed", "")) if "seed" in query else None}
+    except ValueError:
+        raise ValueError("error_bound must be a number and seed an integer")
+    if flag("witnesses"):
+        if not custom:
+            raise ValueError("witnesses needs custom=1")
+        options["witnesses"] = True
+    return custom, options, get("source", "request")
+
+
+def parse_body(data: bytes, custom: bool, options: Dict[str, Any], keyed: bool) -> List[_Job]:
+    """
+    Jobs for every ring of a request body; ValueError for input that does not
+    parse. Rings failing the table checks become "invalid" jobs (an error row,
+    like in the CLI).
+    """
+    if is_ring_data(data):
+        if not custom:
+            raise ValueError("the body holds ring tables, send it with custom=1")
+        rings: Iterator[Any] = iter(RingFile.from_bytes(data, "<request>"))
+    else:
+        try:
+            lines = data.decode("utf-8").splitlines()
+        except UnicodeDecodeError:
+            raise ValueError("the body is neither fast input (UTF-8 text) nor a ring table container")
+        if not custom:
+            return [_Job("znz", spec, {}, len(ZnZRing(*spec)), None) for spec in iter_znz_specs(lines)]
+        rings = iter_fast_blocks(lines, custom=True, compact=True)
+    jobs = []
+    for add, mul in rings:
+        try:
+            if add is not None:
+                validate_addition_table(add)
+            validate_multiplication_table(mul)
+        except ValueError as e:
+            jobs.append(_Job("invalid", str(e), options, len(mul), None))
+            continue
+        key = table_digest(mul, add, **options) if keyed else None
+        packed: Tuple[Optional[Packed], Packed] = (None if add is None else pack_table(add), pack_table(mul))
+        jobs.append(_Job("custom", packed, options, len(mul), key))
+    return jobs
+
+
+def _percentiles(samples: Deque[float]) -> Dict[str, Optional[float]]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": None, "p90": None, "p99": None, "max": None}
+    pick = lambda q: round(ordered[int(q * (len(ordered) - 1))], 6)  # noqa: E731
+    return {"p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99), "max": round(ordered[-1], 6)}
+
+
+# ---------- the service ----------
+
+class AnalysisService:
+    """
+    The queue, dispatcher, warm pool and metrics behind the HTTP front end.
+
+    start() must be awaited (inside the event loop) before submitting work;
+    handle() is the asyncio stream handler for one connection.
+    """
+
+    def __init__(self, workers: Optional[int] = None, batch_window: float = BATCH_WINDOW,
+                 max_batch: int = MAX_BATCH, cache: Optional[ResultCache] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.cache = cache
+        self.started = time.monotonic()
+        self.counters = {"requests": 0, "rings": 0, "errors": 0, "cache hits": 0, "batches": 0, "batched rings": 0}
+        self.active_requests = 0
+        self.queued = 0
+        self.in_flight_batches = 0
+        self.in_flight_rings = 0
+        self.latency: Dict[str, Deque[float]] = {
+            name: deque(maxlen=LATENCY_SAMPLES) for name in ("queue", "analysis", "ring", "request")
+        }
+        self._queue: "asyncio.Queue[_Job]"
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        # running _run tasks (the event loop itself only keeps weak references)
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Start the pool with every worker warmed up, then the dispatcher."""
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers * TASKS_PER_WORKER)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm)
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _ping) for _ in range(self.workers)))
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def close(self) -> None:
+        """Stop dispatching, cancel the batches still running and shut the pool down."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---------- queue and dispatch ----------
+
+    def submit(self, job: _Job) -> "asyncio.Future[Outcome]":
+        """Queue one ring (or answer it from the cache); the future resolves to (result, error)."""
+        loop = asyncio.get_running_loop()
+        job.future = loop.create_future()
+        if job.kind == "invalid":
+            job.future.set_result((None, job.payload))
+            return job.future
+        if job.cached is not None:
+            self.counters["cache hits"] += 1
+            job.future.set_result((job.cached, None))
+            return job.future
+        job.queued_at = loop.time()
+        self.queued += 1
+        self._queue.put_nowait(job)
+        return job.future
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # wait for a free slot first, so rings keep piling up (and batch better) under load
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            cells = batch[0].n ** 2
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch and cells < MAX_BATCH_CELLS:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self._queue.get_nowait())
+                cells += batch[-1].n ** 2
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[_Job]) -> None:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self.queued -= len(batch)
+        self.in_flight_batches += 1
+        self.in_flight_rings += len(batch)
+        self.counters["batches"] += 1
+        self.counters["batched rings"] += len(batch)
+        try:
+            outcomes = await loop.run_in_executor(
+                self._pool, _run_jobs, [(job.kind, job.payload, job.options) for job in batch])
+        except Exception as e:  # e.g. a worker died: fail this batch, keep serving
+            outcomes = [(None, f"analysis failed: {e!r}")] * len(batch)
+        finally:
+            self._slots.release()
+            self.in_flight_batches -= 1
+            self.in_flight_rings -= len(batch)
+        finished = loop.time()
+        self.latency["analysis"].append(finished - started)
+        for job, (res, err) in zip(batch, outcomes):
+            self.latency["queue"].append(started - job.queued_at)
+            self.latency["ring"].append(finished - job.queued_at)
+            if not job.future.done():
+                job.future.set_result((res, err))
+        if self.cache is not None:
+            new = [(job.key, res) for job, (res, _) in zip(batch, outcomes) if res is not None and job.key is not None]
+            if new:
+                # SQLite writes go to a thread, like the lookups in parse()
+                await loop.run_in_executor(None, self._store, new)
+
+    def _store(self, entries: List[Tuple[str, Result]]) -> None:
+        for key, res in entries:
+            self.cache.put(key, res)
+
+    # ---------- requests ----------
+
+    async def analyze(self, data: bytes, custom: bool, options: Dict[str, Any],
+                      source: str = "request") -> AsyncIterator[Dict[str, Any]]:
+        """Export rows (as written by the CLI's jsonl format) for every ring in data, in input order."""
+        jobs = await self.parse(data, custom, options)
+        async for row in self.rows(jobs, source):
+            yield row
+
+    async def parse(self, data: bytes, custom: bool, options: Dict[str, Any]) -> List[_Job]:
+        """Parse, pack and look up the cache off the event loop; raises ValueError for malformed input."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._parse, data, custom, options)
+
+    def _parse(self, data: bytes, custom: bool, options: Dict[str, Any]) -> List[_Job]:
+        jobs = parse_body(data, custom, options, self.cache is not None)
+        for job in jobs:
+            if job.key is not None:
+                job.cached = self.cache.get(job.key)
+        return jobs
+
+    async def rows(self, jobs: List[_Job], source: str) -> AsyncIterator[Dict[str, Any]]:
+        futures = [self.submit(job) for job in jobs]
+        self.counters["rings"] += len(jobs)
+        for idx, (job, future) in enumerate(zip(jobs, futures), start=1):
+            res, err = await future
+            row: Dict[str, Any] = {"source": source, "batch": idx, "n": job.n, "error": err}
+            if res is not None:
+                row.update(flatten_result(res))
+            else:
+                self.counters["errors"] += 1
+            yield row
+
+    def metrics(self) -> Dict[str, Any]:
+        batches = self.counters["batches"]
+        return {
+            "uptime": round(time.monotonic() - self.started, 3),
+            "workers": self.workers,
+            "queue depth": self.queued,
+            "in flight": {"batches": self.in_flight_batches, "rings": self.in_flight_rings},
+            "active requests": self.active_requests,
+            **{k: v for k, v in self.counters.items() if k != "batched rings"},
+            "mean batch size": round(self.counters["batched rings"] / batches, 3) if batches else None,
+            "latency": {name: _percentiles(samples) for name, samples in self.latency.items()},
+        }
+
+    # ---------- HTTP ----------
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """One request per connection (the reply ends with the connection)."""
+        try:
+            await self._handle(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # the client went away
+        finally:
+            writer.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        except ValueError:
+            return await _reply(writer, 400, {"error": "malformed request line"})
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        url = urlsplit(target)
+
+        if url.path == "/metrics" and method == "GET":
+            return await _reply(writer, 200, self.metrics())
+        if url.path == "/health" and method == "GET":
+            return await _reply(writer, 200, {"status": "ok"})
+        if url.path != "/analyze":
+            return await _reply(writer, 404, {"error": f"no such endpoint: {url.path}"})
+        if method != "POST":
+            return await _reply(writer, 405, {"error": "use POST"})
+        try:
+            length = int(headers["content-length"])
+        except (KeyError, ValueError):
+            return await _reply(writer, 411, {"error": "a Content-Length header is required"})
+        if length > MAX_BODY:
+            return await _reply(writer, 413, {"error": f"bodies are limited to {MAX_BODY} bytes"})
+        data = await reader.readexactly(length)
+
+        self.counters["requests"] += 1
+        self.active_requests += 1
+        started = time.monotonic()
+        try:
+            try:
+                custom, options, source = parse_options(parse_qs(url.query))
+                jobs = await self.parse(data, custom, options)
+            except ValueError as e:
+                return await _reply(writer, 400, {"error": str(e)})
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                         b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+            async for row in self.rows(jobs, source):
+                chunk = (json.dumps(row) + "\n").encode("utf-8")
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        finally:
+            self.active_requests -= 1
+            self.latency["request"].append(time.monotonic() - started)
+
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           411: "Length Required", 413: "Payload Too Large"}
+
+
+async def _reply(writer: asyncio.StreamWriter, status: int, body: Dict[str, Any]) -> None:
+    data = (json.dumps(body) + "\n").encode("utf-8")
+    writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1") + data)
+    await writer.drain()
+
+
+async def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, socket_path: Optional[str] = None,
+                cache: Optional[ResultCache] = None, **service_options: Any) -> None:
+    """
+    Run the service until cancelled (SIGTERM cancels it too, so the pool is
+    shut down); the address is printed to stderr once it accepts requests.
+    """
+    service = AnalysisService(cache=cache, **service_options)
+    await service.start()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:  # Windows event loops
+        pass
+    try:
+        if socket_path:
+            server = await asyncio.start_unix_server(service.handle, socket_path)
+            address = f"unix:{socket_path}"
+        else:
+            server = await asyncio.start_server(service.handle, host, port)
+            address = "%s:%d" % server.sockets[0].getsockname()[:2]
+        print(f"serving on {address} ({service.workers} workers)", file=sys.stderr, flush=True)
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+# ---------- client ----------
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def _connect(address: str, timeout: Optional[float]) -> http.client.HTTPConnection:
+    """address is host:port or unix:/path/to/socket."""
+    if address.startswith("unix:"):
+        return _UnixConnection(address[len("unix:"):], timeout)
+    host, _, port = address.rpartition(":")
+    return http.client.HTTPConnection(host or "127.0.0.1", int(port), timeout=timeout)
+
+
+def _json_reply(address: str, method: str, path: str, data: Optional[bytes] = None,
+                timeout: Optional[float] = None) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+    conn = _connect(address, timeout)
+    conn.request(method, path, body=data)
+    resp = conn.getresponse()
+    if resp.status != 200:
+        try:
+            message = json.loads(resp.read())["error"]
+        except (ValueError, KeyError):
+            message = resp.reason
+        conn.close()
+        raise ValueError(f"{resp.status}: {message}")
+    return conn, resp
+
+
+def analyze_remote(address: str, data: bytes, custom: bool = False, timeout: Optional[float] = None,
+                   **options: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Send fast input (or a ring table container) to a running service and yield
+    its rows as they arrive. options are the query parameters of POST /analyze.
+    """
+    query = {k: (int(v) if isinstance(v, bool) else v) for k, v in options.items() if v is not None}
+    query["custom"] = int(custom)
+    conn, resp = _json_reply(address, "POST", "/analyze?" + urlencode(query), data, timeout)
+    try:
+        for line in resp:
+            yield json.loads(line)
+    finally:
+        conn.close()
+
+
+def remote_metrics(address: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """GET /metrics of a running service."""
+    conn, resp = _json_reply(address, "GET", "/metrics", timeout=timeout)
+    try:
+        return json.loads(resp.read())
+    finally:
+        conn.close()
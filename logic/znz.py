@@ -0,0 +1,176 @@
+# logic/znz.py
+"""
+Closed-form analysis of Z/nZ and of element subsets of Z/nZ.
+
+Everything here is answered from n and the element list with gcd arithmetic,
+so no multiplication table is ever built (n can be in the millions).
+Witnesses are reported as residues mod n, and "first" means first in the
+order the elements were given, like the table-based checks.
+"""
+from math import gcd, isqrt
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from logic import profiling
+
+
+def smallest_prime_factor(n: int) -> Optional[int]:
+    """Smallest prime dividing n (None for n < 2)."""
+    if n < 2:
+        return None
+    if n % 2 == 0:
+        return 2
+    for p in range(3, isqrt(n) + 1, 2):
+        if n % p == 0:
+            return p
+    return n
+
+
+def is_prime(n: int) -> bool:
+    return smallest_prime_factor(n) == n
+
+
+class ZnZRing:
+    """
+    The elements of Z/nZ given by `elements` (all of Z/nZ when None), with
+    addition and multiplication mod n.
+
+    analyze() returns the same structure as ring_checker.analyze_ring.
+    """
+
+    def __init__(self, n: int, elements: Optional[Sequence[int]] = None):
+        if n < 1:
+            raise ValueError(f"Modulus must be at least 1, got {n}")
+        if elements is not None:
+            elements = list(elements)
+            if any(e < 0 or e >= n for e in elements):
+                raise ValueError(f"All elements must be between 0 and {n-1}.")
+            if len(elements) == n and elements == list(range(n)):
+                elements = None
+        self.n = n
+        self._elements = elements
+        self._members: Optional[set] = None
+
+    @property
+    def is_full(self) -> bool:
+        """True when the element list is all of Z/nZ in the natural order."""
+        return self._elements is None
+
+    @property
+    def elements(self) -> Sequence[int]:
+        return range(self.n) if self._elements is None else self._elements
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def __repr__(self) -> str:
+        if self.is_full:
+            return f"ZnZRing({self.n})"
+        return f"ZnZRing({self.n}, {self._elements})"
+
+    # ---------- tables (only for display / small rings) ----------
+
+    def add_table(self) -> List[List[int]]:
+        n, el = self.n, self.elements
+        return [[(a + b) % n for b in el] for a in el]
+
+    def mul_table(self) -> List[List[int]]:
+        n, el = self.n, self.elements
+        return [[(a * b) % n for b in el] for a in el]
+
+    # ---------- properties ----------
+
+    def identity(self) -> Optional[int]:
+        """First e with e*s ≡ s for every listed s."""
+        n = self.n
+        if self.is_full:
+            return 1 % n
+        # (e - 1) * s ≡ 0 for all s  <=>  n / gcd(n, s_1, ..., s_k) divides e - 1
+        g = n
+        for s in self._elements:
+            g = gcd(g, s)
+        m = n // g
+        for e in self._elements:
+            if (e - 1) % m == 0:
+                return e
+        return None
+
+    def zero_divisors(self) -> Optional[Tuple[int, int]]:
+        """First (a, b), a ≠ 0, b ≠ 0, with a*b ≡ 0."""
+        n = self.n
+        if self.is_full:
+            p = smallest_prime_factor(n)
+            return None if p is None or p == n else (p, n // p)
+
+        # b works for a iff n / gcd(a, n) divides b, i.e. iff it divides gcd(b, n);
+        # so group the non-zero elements by gcd(b, n) and keep the first of each class.
+        first_in_class: Dict[int, int] = {}
+        for b in self._elements:
+            if b:
+                first_in_class.setdefault(gcd(b, n), b)
+        order = {b: i for i, b in reversed(list(enumerate(self._elements)))}
+
+        partner_for: Dict[int, Optional[int]] = {}
+        for a in self._elements:
+            if not a:
+                continue
+            d = gcd(a, n)
+            if d not in partner_for:
+                q = n // d
+                partners = [b for cls, b in first_in_class.items() if cls % q == 0]
+                partner_for[d] = min(partners, key=order.__getitem__) if partners else None
+            if partner_for[d] is not None:
+                return (a, partner_for[d])
+        return None
+
+    def has_inverse(self, a: int, identity: int) -> bool:
+        """Is there a listed b with a*b ≡ identity?"""
+        n = self.n
+        d = gcd(a, n)
+        if identity % d:
+            return False
+        if self.is_full:
+            return True
+        q = n // d
+        b0 = (identity // d) * pow(a // d, -1, q) % q if q > 1 else 0
+        members = self._member_set()
+        if d <= len(members):
+            return any(b0 + t * q in members for t in range(d))
+        return any((a * b) % n == identity for b in members)
+
+    def missing_inverse(self, identity: int) -> Optional[int]:
+        """First non-zero element without an inverse."""
+        n = self.n
+        if self.is_full:
+            p = smallest_prime_factor(n)
+            return None if p is None or p == n else p
+        for a in self._elements:
+            if a and not self.has_inverse(a, identity):
+                return a
+        return None
+
+    def _member_set(self) -> set:
+        if self._members is None:
+            self._members = set(self._elements)
+        return self._members
+
+    @profiling.staged("closed form")
+    def analyze(self) -> Dict[str, Dict[str, Any]]:
+        """Commutative, identity, integral domain and division ring in closed form."""
+        result: Dict[str, Dict[str, Any]] = {}
+        result["commutative"] = {"value": True, "counterexample": None}
+
+        identity = self.identity()
+        result["has identity"] = {"value": identity is not None, "identity": identity}
+
+        zero_divisors = self.zero_divisors() if identity is not None else None
+        result["integral domain"] = {
+            "value": identity is not None and zero_divisors is None,
+            "zero divisors": zero_divisors
+        }
+
+        missing = self.missing_inverse(identity) if identity is not None else None
+        result["division ring"] = {
+            "value": identity is not None and missing is None,
+            "missing inverse": missing
+        }
+        return result
@@ -1,5 +1,6 @@
 # main.py
 import sys
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from ui.main_window import MainWindow
 
@@ -10,4 +11,5 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # batch analysis uses a process pool (needed for the .exe build)
     main()
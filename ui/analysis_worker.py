@@ -0,0 +1,45 @@
+# ui/analysis_worker.py
+from PyQt5.QtCore import QThread, pyqtSignal
+from logic.batch import analyze_many, analyze_profiled, AnalysisCancelled
+
+class AnalysisWorker(QThread):
+    """Runs logic.batch.analyze_many (or analyze_profiled when profiling) off the GUI thread."""
+    progress = pyqtSignal(int, int)      # done, total
+    results_ready = pyqtSignal(object)  # list of result dicts (object keeps dict order)
+    profiles_ready = pyqtSignal(object)  # list of profiling reports, emitted before results_ready
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, mul_tables, add_tables=None, options=None, cache=None, parent=None, profile=False):
+        super().__init__(parent)
+        self.mul_tables = mul_tables
+        self.add_tables = add_tables
+        self.options = options or {}
+        self.cache = cache
+        self.profile = profile
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def run(self):
+        try:
+            # profiling bypasses the cache (see analyze_profiled)
+            run = analyze_profiled if self.profile else analyze_many
+            results = run(
+                self.mul_tables,
+                progress=self.progress.emit,
+                cancelled=lambda: self._cancel_requested,
+                add_tables=self.add_tables,
+                **({} if self.profile else {"cache": self.cache}),
+                **self.options,
+            )
+            if self.profile:
+                results, reports = results
+                self.profiles_ready.emit(reports)
+        except AnalysisCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.results_ready.emit(results)
@@ -0,0 +1,285 @@
+# ui/batch_editor.py
+"""
+Model-backed editors for batch mode.
+
+Batch data lives in plain storage instead of widgets: Z/nZ batches are rows
+(n, elements text) of one ZnzBatchModel shown in a single QTableView, and
+custom batches are (add, mul) RingTables in a CustomBatchModel, listed in a
+QListView with one pair of table views editing the selected batch. Views only
+create widgets for what is on screen, changing the batch count keeps the
+existing batches, and tables are allocated when a batch is first opened.
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PyQt5.QtCore import QAbstractListModel, QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtWidgets import (
+    QAbstractItemView, QHBoxLayout, QLabel, QListView, QSpinBox,
+    QSplitter, QTableView, QVBoxLayout, QWidget
+)
+
+from logic.ring_table import RingTable
+
+# Batch count limit of the batch-mode spin boxes (nothing is created per batch).
+MAX_BATCHES = 100_000
+DEFAULT_N = 3
+
+
+class ZnzBatchModel(QAbstractTableModel):
+    """Z/nZ batches as rows: modulus n and the elements as typed (parsed on Analyze)."""
+
+    HEADERS = ("modulus n", "Elements")
+
+    def __init__(self, min_n: int = 2, max_n: int = 2_000_000_000, parent=None):
+        super().__init__(parent)
+        self.min_n = min_n
+        self.max_n = max_n
+        self._ns: List[int] = []
+        self._elements: List[str] = []
+
+    def set_count(self, count: int) -> None:
+        """Add default batches at the end or drop the last ones; the others are kept."""
+        old = len(self._ns)
+        if count > old:
+            self.beginInsertRows(QModelIndex(), old, count - 1)
+            self._ns += [DEFAULT_N] * (count - old)
+            self._elements += [""] * (count - old)
+            self.endInsertRows()
+        elif count < old:
+            self.beginRemoveRows(QModelIndex(), count, old - 1)
+            del self._ns[count:], self._elements[count:]
+            self.endRemoveRows()
+
+    def batches(self) -> List[Tuple[int, str]]:
+        return list(zip(self._ns, self._elements))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ns)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        i, col = index.row(), index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._ns[i] if col == 0 else self._elements[i]
+        if role == Qt.ToolTipRole and col == 1:
+            return "e.g. 0,1,2; empty = all of Z/nZ"
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        i, col = index.row(), index.column()
+        if col == 0:
+            try:
+                n = int(value)
+            except (TypeError, ValueError):
+                return False
+            if not self.min_n <= n <= self.max_n:
+                return False
+            self._ns[i] = n
+        else:
+            self._elements[i] = str(value)
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        return self.HEADERS[section] if orientation == Qt.Horizontal else f"Batch {section + 1}"
+
+
+class CustomBatchModel(QAbstractListModel):
+    """
+    Custom batches as (add, mul) RingTables, listed as "Batch i (n = ...)".
+
+    Only the size is stored until a batch is opened with tables(i); unopened
+    batches are all-zero tables of that size, like empty cells.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sizes: List[int] = []
+        self._tables: List[Optional[Tuple[RingTable, RingTable]]] = []
+
+    def set_count(self, count: int) -> None:
+        old = len(self._sizes)
+        if count > old:
+            self.beginInsertRows(QModelIndex(), old, count - 1)
+            self._sizes += [DEFAULT_N] * (count - old)
+            self._tables += [None] * (count - old)
+            self.endInsertRows()
+        elif count < old:
+            self.beginRemoveRows(QModelIndex(), count, old - 1)
+            del self._sizes[count:], self._tables[count:]
+            self.endRemoveRows()
+
+    def size(self, i: int) -> int:
+        return self._sizes[i]
+
+    def tables(self, i: int) -> Tuple[RingTable, RingTable]:
+        """The editable (add, mul) of batch i."""
+        if self._tables[i] is None:
+            n = self._sizes[i]
+            self._tables[i] = (RingTable(n), RingTable(n))
+        return self._tables[i]
+
+    def resize(self, i: int, n: int) -> None:
+        """Change batch i to n x n, keeping the overlapping cells (entries >= n become 0)."""
+        if n == self._sizes[i]:
+            return
+        self._sizes[i] = n
+        if self._tables[i] is not None:
+            resized = []
+            for table in self._tables[i]:
+                new = RingTable(n)
+                k = min(n, table.n)
+                block = np.asarray(table)[:k, :k]
+                np.asarray(new)[:k, :k] = np.where(block < n, block, 0)
+                resized.append(new)
+            self._tables[i] = (resized[0], resized[1])
+        index = self.index(i)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def snapshot(self) -> List[Tuple[RingTable, RingTable]]:
+        """Read-only copies of every batch's tables (safe to analyze while editing goes on)."""
+        out = []
+        for i, n in enumerate(self._sizes):
+            if self._tables[i] is None:
+                out.append((RingTable(n), RingTable(n)))
+            else:
+                out.append(tuple(RingTable(t.n, t.tobytes(), t.typecode) for t in self._tables[i]))
+        return out
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._sizes)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role == Qt.DisplayRole:
+            return f"Batch {index.row() + 1}  (n = {self._sizes[index.row()]})"
+        return None
+
+
+class TableEditModel(QAbstractTableModel):
+    """Editable view over one RingTable; entries outside 0..n-1 are rejected."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._table: Optional[RingTable] = None
+
+    def set_table(self, table: Optional[RingTable]) -> None:
+        self.beginResetModel()
+        self._table = table
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self._table is None else self._table.n
+
+    def columnCount(self, parent=QModelIndex()):
+        return self.rowCount(parent)
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return str(self._table[index.row()][index.column()])
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        try:
+            v = int(str(value).strip() or "0")
+        except ValueError:
+            return False
+        if not 0 <= v < self._table.n:
+            return False
+        self._table[index.row()][index.column()] = v
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+
+def _table_view(model) -> QTableView:
+    view = QTableView()
+    view.setModel(model)
+    view.horizontalHeader().setDefaultSectionSize(30)
+    view.verticalHeader().setDefaultSectionSize(30)
+    return view
+
+
+class CustomBatchEditor(QWidget):
+    """Batch list on the left; size, addition and multiplication table of the selected batch on the right."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = CustomBatchModel(self)
+        self.add_model = TableEditModel(self)
+        self.mul_model = TableEditModel(self)
+        self.current: Optional[int] = None
+
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QAbstractItemView.SingleSelection)
+
+        self.size_label = QLabel("Size n:")
+        self.size_spin = QSpinBox(minimum=2, value=DEFAULT_N)
+        self.add_view = _table_view(self.add_model)
+        self.mul_view = _table_view(self.mul_model)
+
+        editor = QWidget()
+        v = QVBoxLayout(editor)
+        h = QHBoxLayout()
+        h.addWidget(self.size_label)
+        h.addWidget(self.size_spin)
+        h.addStretch(1)
+        v.addLayout(h)
+        v.addWidget(QLabel("Addition Table:"))
+        v.addWidget(self.add_view)
+        v.addWidget(QLabel("Multiplication Table:"))
+        v.addWidget(self.mul_view)
+
+        splitter = QSplitter(Qt.Horizontal)
+        splitter.addWidget(self.list_view)
+        splitter.addWidget(editor)
+        splitter.setStretchFactor(0, 0)
+        splitter.setStretchFactor(1, 1)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(splitter)
+
+        self.list_view.selectionModel().currentRowChanged.connect(lambda cur, _: self.open_batch(cur.row()))
+        self.size_spin.valueChanged.connect(self.resize_current)
+
+    def set_count(self, count: int) -> None:
+        self.model.set_count(count)
+        if self.current is None or self.current >= count:
+            self.list_view.setCurrentIndex(self.model.index(min(self.current or 0, count - 1)))
+
+    def open_batch(self, i: int) -> None:
+        """Show batch i in the editor (allocating its tables on first use)."""
+        if i < 0:
+            self.current = None
+            self.add_model.set_table(None)
+            self.mul_model.set_table(None)
+            return
+        self.current = i
+        add, mul = self.model.tables(i)
+        self.size_spin.blockSignals(True)
+        self.size_spin.setValue(self.model.size(i))
+        self.size_spin.blockSignals(False)
+        self.add_model.set_table(add)
+        self.mul_model.set_table(mul)
+
+    def resize_current(self, n: int) -> None:
+        if self.current is None:
+            return
+        self.model.resize(self.current, n)
+        self.open_batch(self.current)
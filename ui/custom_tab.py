@@ -1,22 +1,43 @@
 # ui/custom_tab.py
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QSpinBox, QTableWidget,
-    QCheckBox, QPlainTextEdit, QScrollArea, QFrame, 
-    QHeaderView, QSizePolicy, QSplitter
+    QCheckBox, QPlainTextEdit,
+    QSizePolicy, QSplitter, QComboBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
+from logic.incremental import IncrementalAnalysis
+from ui.batch_editor import MAX_BATCHES, CustomBatchEditor
 
 class CustomTab(QWidget):
+    live_updated = pyqtSignal(object, object)  # result dict, (add, mul) arrays
+    live_failed = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         self.layout = QVBoxLayout(self)
         self.fast_cb = QCheckBox("Fast Input Mode")
         self.batch_cb = QCheckBox("Batch Mode")
         self.batch_label = QLabel("Amount of batches:")
-        self.batch_count = QSpinBox(minimum=1, value=1)
+        self.batch_count = QSpinBox(minimum=1, maximum=MAX_BATCHES, value=1)
         self.batch_label.setVisible(False)
         self.batch_count.setVisible(False)
 
+        # ring axiom validation before the property analysis
+        self.axioms_label = QLabel("Ring axiom check:")
+        self.axioms_combo = QComboBox()
+        self.axioms_combo.addItem("Off", "off")
+        self.axioms_combo.addItem("Exhaustive", "exact")
+        self.axioms_combo.addItem("Sampled (error ≤ 1e-6)", "sampled")
+
+        # complete sets instead of the first counterexample only
+        self.witnesses_cb = QCheckBox("List all units, zero divisors, idempotents and nilpotents")
+
+        # re-analyze on every cell edit (manual mode)
+        self.live_cb = QCheckBox("Live analysis")
+        self.live_cb.setToolTip("Update the results after each edited cell, without pressing Analyze. "
+                                "Associativity is included for n <= 256; the full ring axiom check is not.")
+        self.live = None  # IncrementalAnalysis while live analysis is on
+
         self.size_label = QLabel("Table size n (>=2):")
         self.size_spin = QSpinBox(minimum=2, value=3)
         # self.table_widget = QTableWidget(3, 3)
@@ -40,8 +61,8 @@ class CustomTab(QWidget):
         )
         self.fast_text.setVisible(False)
 
-        self.batches_area = QScrollArea()
-        self.batches_area.setWidgetResizable(True)
+        # batch list + one editor for the selected batch; tables are stored, not widgets
+        self.batches_area = CustomBatchEditor()
         self.batches_area.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.batches_area.setVisible(False)
 
@@ -52,6 +73,10 @@ class CustomTab(QWidget):
         upper_layout.addWidget(self.batch_cb)
         upper_layout.addWidget(self.batch_label)
         upper_layout.addWidget(self.batch_count)
+        upper_layout.addWidget(self.axioms_label)
+        upper_layout.addWidget(self.axioms_combo)
+        upper_layout.addWidget(self.witnesses_cb)
+        upper_layout.addWidget(self.live_cb)
         upper_layout.addWidget(self.size_label)
         upper_layout.addWidget(self.size_spin)
         upper_layout.addWidget(self.add_label)
@@ -75,6 +100,10 @@ class CustomTab(QWidget):
         self.batch_cb.stateChanged.connect(self.toggle_batch)
         self.batch_count.valueChanged.connect(self.build_batches)
         self.size_spin.valueChanged.connect(self.resize_table)
+        self.live_cb.stateChanged.connect(self.restart_live)
+        self.axioms_combo.currentIndexChanged.connect(self.restart_live)
+        self.add_table.cellChanged.connect(lambda i, j: self.on_cell_changed(i, j, self.add_table))
+        self.mul_table.cellChanged.connect(lambda i, j: self.on_cell_changed(i, j, self.mul_table))
 
     def toggle_fast(self, state):
         fast = (state == Qt.Checked)
@@ -84,6 +113,8 @@ class CustomTab(QWidget):
         
         self.size_label.setVisible(not fast)
         self.size_spin.setVisible(not fast)
+        self.live_cb.setChecked(False)
+        self.live_cb.setVisible(not fast)
         
         self.add_label.setVisible(not fast)
         self.add_table.setVisible(not fast)
@@ -100,6 +131,8 @@ class CustomTab(QWidget):
         
         self.size_label.setVisible(not batch)
         self.size_spin.setVisible(not batch)
+        self.live_cb.setChecked(False)
+        self.live_cb.setVisible(not batch)
         
         self.add_label.setVisible(not batch)
         self.add_table.setVisible(not batch)
@@ -109,42 +142,79 @@ class CustomTab(QWidget):
             self.build_batches()
 
     def build_batches(self):
-        count = self.batch_count.value()
-        container = QFrame()
-        v = QVBoxLayout(container)
-        
-        self.sizes = []
-        self.add_tables = []
-        self.mul_tables = []
-        
-        for i in range(count):
-            size_spin = QSpinBox(minimum=2, value=3)
-            add_table = QTableWidget(3, 3)
-            mul_table = QTableWidget(3, 3)
-            add_table.horizontalHeader().setDefaultSectionSize(30)
-            add_table.verticalHeader().setDefaultSectionSize(30)
-            mul_table.horizontalHeader().setDefaultSectionSize(30)
-            mul_table.verticalHeader().setDefaultSectionSize(30)
-
-            v.addWidget(QLabel(f"Batch {i+1} size:"))
-            v.addWidget(size_spin)
-            v.addWidget(QLabel("Addition Table:"))
-            v.addWidget(add_table)
-            v.addWidget(QLabel("Multiplication Table:"))
-            v.addWidget(mul_table)
-
-            size_spin.valueChanged.connect(
-                lambda val, a=add_table, m=mul_table: (
-                    a.setRowCount(val), a.setColumnCount(val),
-                    m.setRowCount(val), m.setColumnCount(val)
-                )
-            )
-            
-            self.sizes.append(size_spin)
-            self.add_tables.append(add_table)
-            self.mul_tables.append(mul_table)
-        self.batches_area.setWidget(container)
+        """Match the batch list to the batch count (existing batches are kept)."""
+        self.batches_area.set_count(self.batch_count.value())
+
+    def batch_tables(self):
+        """(add, mul) RingTables of every batch, copied so editing can go on during analysis."""
+        return self.batches_area.model.snapshot()
+
+    def axiom_mode(self):
+        """'off', 'exact' or 'sampled' (see ring_axioms.check_ring_axioms)."""
+        return self.axioms_combo.currentData()
 
     def resize_table(self, val):
-        self.table_widget.setRowCount(val)
-        self.table_widget.setColumnCount(val)
\ No newline at end of file
+        for table in (self.add_table, self.mul_table):
+            table.setRowCount(val)
+            table.setColumnCount(val)
+        self.restart_live()
+
+    def cell_value(self, table, i, j):
+        """Entry (i, j) of a manual table (empty cells are 0); ValueError unless it is in [0, n-1]."""
+        item = table.item(i, j)
+        text = item.text().strip() if item is not None else ""
+        n = table.rowCount()
+        try:
+            v = int(text or "0")
+        except ValueError:
+            raise ValueError(f"Cell ({i}, {j}) must be an integer, got {text!r}.")
+        if not 0 <= v < n:
+            raise ValueError(f"Cell ({i}, {j}) must be between 0 and {n-1}, got {v}.")
+        return v
+
+    def read_tables(self):
+        """(add, mul) of the manual tables as lists of rows."""
+        n = self.size_spin.value()
+        return tuple(
+            [[self.cell_value(table, i, j) for j in range(n)] for i in range(n)]
+            for table in (self.add_table, self.mul_table)
+        )
+
+    # ---------- live analysis ----------
+
+    def restart_live(self, *_):
+        """Rebuild the evidence from all cells (live mode switched on, resize, axiom mode)."""
+        self.live = None
+        if not self.live_cb.isChecked():
+            return
+        try:
+            add, mul = self.read_tables()
+        except ValueError as e:
+            self.live_failed.emit(str(e))
+            return
+        # the additive identity is zero in every axiom mode (element 0 while there is none, as in analyze_ring)
+        self.live = IncrementalAnalysis(add, mul)
+        self.emit_live()
+
+    def on_cell_changed(self, i, j, table):
+        if not self.live_cb.isChecked():
+            return
+        if self.live is None:
+            # an earlier cell was invalid: start over once everything parses
+            self.restart_live()
+            return
+        try:
+            v = self.cell_value(table, i, j)
+        except ValueError as e:
+            # the live tables no longer match the grid: rebuild on the next valid edit
+            self.live = None
+            self.live_failed.emit(str(e))
+            return
+        if table is self.add_table:
+            self.live.set_add(i, j, v)
+        else:
+            self.live.set_mul(i, j, v)
+        self.emit_live()
+
+    def emit_live(self):
+        self.live_updated.emit(self.live.result(), (self.live.add, self.live.mul))
\ No newline at end of file
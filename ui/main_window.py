@@ -1,18 +1,38 @@
 # ui/main_window.py
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QPushButton, QTextEdit,
-    QTabWidget, QTableWidget, QTableWidgetItem, QMessageBox,
+    QTabWidget, QTableView, QMessageBox,
     QHBoxLayout, QCheckBox,
-    QFileDialog
+    QFileDialog, QProgressBar
 )
-from PyQt5.QtGui import QColor
-from logic.ring_checker import analyze_ring
-from logic.ring_table import parse_fast_blocks, validate_addition_table, validate_multiplication_table
+from logic.ring_table import parse_fast_blocks, parse_ints, iter_znz_specs, validate_addition_table, validate_multiplication_table
+from logic.znz import ZnZRing
+from logic.result_cache import ResultCache, cached_analyze
+from logic.batch import LazyResults
+from logic import closure, profiling
+from logic.export import describe_witness_sets, detect_format, explain_failure, export_results, result_columns
 from ui.znz_tab import ZnzTab
 from ui.custom_tab import CustomTab
-import re
-import csv
+from ui.analysis_worker import AnalysisWorker
+from ui.table_model import OperationTableModel
+import sqlite3
 import traceback
+from contextlib import nullcontext
+
+# Rings larger than this are analyzed but not drawn in the result tables
+# (the views read cells on demand, but header pixel offsets overflow past ~70M rows)
+MAX_VISUAL_SIZE = 1 << 20
+# Elements listed per witness set in the results box (exports list all of them)
+MAX_LISTED = 50
+
+# export file dialog filters -> extension added when the name has none
+EXPORT_FILTERS = {
+    "CSV Files (*.csv)": ".csv",
+    "JSON Lines (*.jsonl)": ".jsonl",
+    "Columnar Binary (*.frc)": ".frc",
+    "Text Files (*.txt)": ".txt",
+    "Compressed CSV (*.csv.gz)": ".csv.gz",
+}
 
 class MainWindow(QWidget):
     def __init__(self):
@@ -24,20 +44,57 @@ class MainWindow(QWidget):
         
         self.batch_results = []
         self.batch_tables = []
+        self.batch_axioms = False  # whether the shown results include a ring axiom report
+        self.batch_mode = "off"  # axiom mode of the shown custom batches
+        self.batch_witnesses = False  # whether the shown results list the complete witness sets
+        self.profiling = False  # whether the shown results were profiled
+        self.input_profile = None  # reading the whole input (parse, validation)
+        self.batch_profiles = {}  # batch index -> analysis report
+        self.draw_profiles = {}  # batch index -> visualize report (last time it was shown)
+        self.worker = None
+
+        # results of previously analyzed custom rings (disk-backed, shared with the CLI)
+        try:
+            self.cache = ResultCache()
+        except (OSError, sqlite3.Error):
+            self.cache = None
 
         self.tabs = QTabWidget()
         self.znz_tab = ZnzTab()
         self.custom_tab = CustomTab()
         self.tabs.addTab(self.znz_tab, "Z/nZ")
         self.tabs.addTab(self.custom_tab, "Custom")
+        self.custom_tab.live_updated.connect(self.on_live_result)
+        self.custom_tab.live_failed.connect(self.on_live_failed)
         
         # hide output checkbox
         self.hide_output_cb = QCheckBox("Hide Output")
         self.hide_output_cb.setChecked(True)
         self.hide_output_cb.stateChanged.connect(self.toggle_output_visibility)
 
+        # analyze each batch when it is first shown (neighbours are prefetched)
+        self.lazy_cb = QCheckBox("Analyze batches on demand")
+        self.lazy_cb.setToolTip("Show batch 1 as soon as it is analyzed; the others are analyzed when viewed or exported.")
+
+        # per-stage timings in the results box and exports
+        self.profile_cb = QCheckBox("Profile analysis")
+        self.profile_cb.setToolTip("Record wall time, cells scanned and peak memory per stage. "
+                                   "Rings are then analyzed one at a time, and memory tracing slows everything down.")
+
         self.analyze_btn = QPushButton("Analyze")
         self.analyze_btn.clicked.connect(self.analyze)
+
+        # progress of a running analysis (hidden when idle)
+        self.progress_bar = QProgressBar()
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.cancel_analysis)
+        progress_layout = QHBoxLayout()
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.cancel_btn)
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.cache_label = QLabel()
+        self.cache_label.setVisible(False)
         
         # --- Results Container (hidden initially) ---
         self.results_container = QWidget()
@@ -46,10 +103,14 @@ class MainWindow(QWidget):
         self.results_box = QTextEdit(readOnly=True)
 
         self.add_label = QLabel("Addition Table:")
-        self.add_table = QTableWidget()
+        self.add_model = OperationTableModel(self)
+        self.add_table = QTableView()
+        self.add_table.setModel(self.add_model)
         
         self.mul_label = QLabel("Multiplication Table:")
-        self.mul_table = QTableWidget()
+        self.mul_model = OperationTableModel(self)
+        self.mul_table = QTableView()
+        self.mul_table.setModel(self.mul_model)
 
         # Smaller cells
         for table in [self.mul_table, self.add_table]:
@@ -67,6 +128,8 @@ class MainWindow(QWidget):
         
         self.layout.addWidget(self.tabs, stretch=1)
         self.layout.addWidget(self.analyze_btn)
+        self.layout.addLayout(progress_layout)
+        self.layout.addWidget(self.cache_label)
         self.layout.addWidget(self.results_container, stretch=1)
         
         # previous and next batch buttons
@@ -87,6 +150,14 @@ class MainWindow(QWidget):
         self.export_btn = QPushButton("Export Results")
         self.export_btn.clicked.connect(self.export_results)
         rc_layout.addWidget(self.export_btn)
+
+        # cProfile dump of the shown batch
+        self.pstats_btn = QPushButton("Save Profile of Batch...")
+        self.pstats_btn.setToolTip("Analyze and draw this batch again under cProfile and save the statistics (.pstats)")
+        self.pstats_btn.clicked.connect(self.save_batch_pstats)
+        rc_layout.addWidget(self.pstats_btn)
+        self.layout.addWidget(self.lazy_cb)
+        self.layout.addWidget(self.profile_cb)
         self.layout.addWidget(self.hide_output_cb)
 
         # Ensure UI matches default state
@@ -96,30 +167,55 @@ class MainWindow(QWidget):
 
     def analyze(self):
         try:
+            lazy = self.lazy_cb.isChecked()
+            profile = self.profile_cb.isChecked()
+            input_profile = profiling.Profiler() if profile else None
+            # (one at a time when profiling: tracemalloc is process-wide)
+            radius = 0 if profile else 1
             idx = self.tabs.currentIndex()
             if idx == 0:
-                tables = self.collect_znz()
-                if not tables:
+                with input_profile or nullcontext():
+                    rings = self.collect_znz()
+                if not rings:
                     raise ValueError("No valid batches were parsed. Check your input format.")
 
-                # Z/nZ only has mul_table (and auto-generated add)
-                self.batch_tables = [(None, t) for t in tables]
-            else:
-                # Custom gives (add, mul) tuples directly
-                tables = self.collect_custom()
-                self.batch_tables = tables
+                # Z/nZ is answered in closed form; the views compute cells on demand
+                self.drop_results()
+                self.start_profiling(input_profile)
+                self.batch_tables = rings
+                self.batch_axioms = False
+                self.batch_witnesses = False
+                if lazy:
+                    self.on_analysis_done(LazyResults(len(rings), lambda i: self.profiled(i, rings[i].analyze),
+                                                      radius=radius))
+                else:
+                    self.on_analysis_done([self.profiled(i, r.analyze) for i, r in enumerate(rings)])
+                return
+
+            # Custom gives (add, mul) tuples directly (validated per ring when lazy)
+            with input_profile or nullcontext():
+                tables = self.collect_custom(validate=not lazy)
+            self.drop_results()
+            self.start_profiling(input_profile)
+            self.batch_tables = tables
                 
             # print(f"[analyze] Parsed {len(tables)} table(s): {tables}")
 
-            self.batch_results = [analyze_ring(mul) for (_, mul) in self.batch_tables]
-            self.current_batch = 0
-            self.update_batch_display()
-
-            add, mul = self.batch_tables[0]
-            self.display_results(self.batch_results[0])
-            self.visualize(add, mul, self.batch_results[0])
-
-            self.hide_output_cb.setChecked(False)
+            mode = self.custom_tab.axiom_mode()
+            witnesses = self.custom_tab.witnesses_cb.isChecked()
+            self.batch_axioms = mode != "off"
+            self.batch_mode = mode
+            self.batch_witnesses = witnesses
+            if lazy:
+                self.on_analysis_done(LazyResults(
+                    len(tables),
+                    lambda i: self.profiled(i, lambda: self.analyze_custom_one(
+                        tables[i], mode, use_cache=not self.profiling, witnesses=witnesses)),
+                    radius=radius))
+                return
+            add_tables = [add for (add, _) in self.batch_tables]
+            options = {"witnesses": True} if witnesses else {}
+            self.start_analysis([mul for (_, mul) in self.batch_tables], add_tables, axioms=mode, **options)
             
         except Exception as e:
             # traceback.print_exc()
@@ -127,35 +223,136 @@ class MainWindow(QWidget):
             
         # print(f"Parsed {len(self.batch_results)} batches")
 
+    def analyze_custom_one(self, tables, mode, use_cache=True, witnesses=False):
+        add, mul = tables
+        if mode == "off":
+            # otherwise check_ring_axioms validates the tables (as a failed axiom)
+            validate_addition_table(add)
+            validate_multiplication_table(mul)
+        # add is passed in every mode so the cache key matches the CLI's
+        return cached_analyze(self.cache if use_cache else None, mul, add, axioms=mode, witnesses=witnesses)
+
+    def drop_results(self):
+        """Forget the shown batches (and stop prefetching for them)."""
+        if isinstance(self.batch_results, LazyResults):
+            self.batch_results.close()
+        self.batch_results = []
+        self.batch_tables = []
+        self.batch_profiles = {}
+        self.draw_profiles = {}
+
+    def start_profiling(self, input_profile):
+        """Profile the new batches if input_profile (the Profiler that read the input) is given."""
+        self.profiling = input_profile is not None
+        self.input_profile = input_profile.report() if input_profile is not None else None
+
+    def profiled(self, i, analyze):
+        """analyze() for batch i, under a Profiler when profiling (the report is kept for display and export)."""
+        if not self.profiling:
+            return analyze()
+        prof = profiling.Profiler()
+        try:
+            with prof:
+                return analyze()
+        finally:
+            self.batch_profiles[i] = prof.report()
+
+    def batch_profile(self, i):
+        return profiling.merge_reports(self.batch_profiles.get(i), self.draw_profiles.get(i))
+
+    def on_profiles_ready(self, reports):
+        self.batch_profiles = dict(enumerate(reports))
+
+    def start_analysis(self, mul_tables, add_tables=None, **options):
+        """Analyze on a background thread (process pool for big batches) so the window stays responsive."""
+        self.analyze_btn.setEnabled(False)
+        self.progress_bar.setRange(0, len(mul_tables))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.cancel_btn.setVisible(True)
+        self.cancel_btn.setEnabled(True)
+
+        self.worker = AnalysisWorker(mul_tables, add_tables, options, self.cache, self, profile=self.profiling)
+        self.worker.progress.connect(self.on_analysis_progress)
+        self.worker.profiles_ready.connect(self.on_profiles_ready)
+        self.worker.results_ready.connect(self.on_analysis_done)
+        self.worker.failed.connect(self.on_analysis_failed)
+        self.worker.cancelled.connect(self.on_analysis_cancelled)
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.start()
+
+    def cancel_analysis(self):
+        if self.worker is not None:
+            self.cancel_btn.setEnabled(False)
+            self.worker.cancel()
+
+    def on_analysis_progress(self, done, total):
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(done)
+
+    def on_analysis_done(self, results):
+        if self.cache is not None:
+            st = self.cache.stats()
+            self.cache_label.setText(f"Result cache: {st['hits']} hits, {st['misses']} misses, {st['entries']} stored")
+            self.cache_label.setVisible(True)
+        self.batch_results = results
+        self.current_batch = 0
+        self.update_batch_display()
+        self.hide_output_cb.setChecked(False)
+
+    def on_live_result(self, res, tables):
+        """Show the custom tab's live analysis (refreshed on every edited cell) as the only batch."""
+        if self.worker is not None:
+            return
+        self.drop_results()
+        self.start_profiling(None)
+        self.batch_tables = [tables]
+        self.batch_axioms = False
+        self.batch_witnesses = False
+        self.batch_results = [res]
+        self.current_batch = 0
+        self.update_batch_display()
+        self.hide_output_cb.setChecked(False)
+
+    def on_live_failed(self, message):
+        self.results_box.setPlainText(f"❌ Error: {message}")
+
+    def on_analysis_failed(self, message):
+        self.drop_results()
+        QMessageBox.critical(self, "Error", message)
+
+    def on_analysis_cancelled(self):
+        self.drop_results()
+
+    def on_worker_finished(self):
+        self.worker = None
+        self.analyze_btn.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+
     def collect_znz(self):
+        """Z/nZ input as ZnZRing objects (an empty element list means all of Z/nZ)."""
         tab = self.znz_tab
         if tab.fast_cb.isChecked():
-            return parse_fast_blocks(tab.fast_text.toPlainText(), custom=False)
+            return [ZnZRing(n, elems) for n, elems in iter_znz_specs(tab.fast_text.toPlainText().splitlines())]
         elif tab.batch_cb.isChecked():
             results = []
-            for n_spin, el_le in zip(tab.ns, tab.elements):
-                n = n_spin.value()
-                elems = [int(x) for x in re.split(r"[,\s]+", el_le.text())]
-                # after you parse elems = [...]
-                if any(e < 0 or e >= n for e in elems):
-                    raise ValueError(f"All elements must be between 0 and {n-1}.")
-                table = [[(a*b)%n for b in elems] for a in elems]
-                results.append(table)
+            for n, text in tab.batch_model.batches():
+                elems = parse_ints(text)
+                results.append(ZnZRing(n, elems or None))
             return results
         else:
             n = tab.n_spin.value()
-            elems = [int(x) for x in re.split(r"[,\s]+", tab.elements_le.text()) if x]
-            if any(e<0 or e>=n for e in elems):
-                raise ValueError(f"All elements must be between 0 and {n-1}.")
-            table = [[(a*b)%n for b in elems] for a in elems]
-            return [table]
-
+            elems = parse_ints(tab.elements_le.text())
+            return [ZnZRing(n, elems or None)]
 
-    def collect_custom(self):
+    def collect_custom(self, validate=True):
         tab = self.custom_tab
 
         if tab.fast_cb.isChecked():
-            parsed = parse_fast_blocks(tab.fast_text.toPlainText(), custom=True)
+            parsed = parse_fast_blocks(tab.fast_text.toPlainText(), custom=True, compact=True)
+            if not validate:
+                return parsed
             validated = []
             for add, mul in parsed:
                 validate_addition_table(add)
@@ -166,103 +363,155 @@ class MainWindow(QWidget):
 
         elif tab.batch_cb.isChecked():
             results = []
-            for size_spin, add_w, mul_w in zip(tab.sizes, tab.add_tables, tab.mul_tables):
-                n = size_spin.value()
-                # read add table
-                add_table = [
-                    [int(add_w.item(i, j).text() or "0") for j in range(n)]
-                    for i in range(n)
-                ]
-                # read mul table
-                mul_table = [
-                    [int(mul_w.item(i, j).text() or "0") for j in range(n)]
-                    for i in range(n)
-                ]
-                
-                # print(f"[manual batch mode] n={n}, parsed add_table: {len(add_table)}x{len(add_table[0])}, mul_table: {len(mul_table)}x{len(mul_table[0])}")
-
+            # entries were range checked while editing; the tables are read from storage, not cells
+            for add_table, mul_table in tab.batch_tables():
                 # separate validations
-                validate_addition_table(add_table)        # raises on error
-                validate_multiplication_table(mul_table)  # raises on error
+                if validate:
+                    validate_addition_table(add_table)        # raises on error
+                    validate_multiplication_table(mul_table)  # raises on error
 
                 results.append((add_table, mul_table))
 
             return results
 
         else:
-            n = tab.size_spin.value()
-            add = [
-                [int(tab.add_table.item(i, j).text() or "0") for j in range(n)]
-                for i in range(n)
-            ]
-            mul = [
-                [int(tab.mul_table.item(i, j).text() or "0") for j in range(n)]
-                for i in range(n)
-            ]
+            add, mul = tab.read_tables()
 
-            validate_addition_table(add)
-            validate_multiplication_table(mul)
+            if validate:
+                validate_addition_table(add)
+                validate_multiplication_table(mul)
 
             return [(add, mul)]
 
     def display_results(self, res):
         lines = []
         for prop, data in res.items():
+            if prop == "witness sets":
+                lines.append("📋 Witness Sets")
+                lines += [f"    {line}" for line in describe_witness_sets(data, limit=MAX_LISTED)]
+                continue
             ok = data["value"]
             lines.append(f"{'✅' if ok else '❌'} {prop.title()}")
 
-            if not ok:
-                # Provide explanation or reason for failure
-                if "counterexample" in data and data["counterexample"] is not None:
+            if "mode" in data:
+                # ring axiom validation report
+                lines.append(f"    {data['mode'].capitalize()} check, {data['triples checked']} triples")
+                if data.get("failed"):
+                    lines.append(f"    Failed: {data['failed']}")
+                if data.get("reason"):
+                    lines.append(f"    {data['reason']}")
+                if data.get("counterexample") is not None:
                     lines.append(f"    Counterexample: {data['counterexample']}")
-                elif "zero divisors" in data:
-                    if data["zero divisors"] is not None:
-                        lines.append(f"    Zero divisors: {data['zero divisors']}")
-                    else:
-                        lines.append("    Skipped: no identity element")
-                elif "missing inverse" in data:
-                    if data["missing inverse"] is not None:
-                        lines.append(f"    Missing inverse for: {data['missing inverse']}")
-                    else:
-                        lines.append("    Skipped: no identity element")
-                elif "identity" in data and data["identity"] is None:
-                    lines.append("    No multiplicative identity found")
+            elif not ok:
+                # Provide explanation or reason for failure
+                explanation = explain_failure(data)
+                if explanation:
+                    lines.append(f"    {explanation}")
 
         self.results_box.setPlainText("\n".join(lines))
 
+    @profiling.staged("visualize")
     def visualize(self, add_table, mul_table, res):
-        n = len(mul_table)
-
-        # Clear tables and set size
-        for tbl in [self.mul_table, self.add_table]:
-            tbl.clear()
-            tbl.setRowCount(n)
-            tbl.setColumnCount(n)
-
-        # If no custom add table, generate default (ZnZ mode)
-        if add_table is None:
-            add_table = [[(i + j) % n for j in range(n)] for i in range(n)]
-
-        identity = res['has identity']['identity']
-        zero_div = res['integral domain']['zero divisors']
-
-        for i in range(n):
-            for j in range(n):
-                m_item = QTableWidgetItem(str(mul_table[i][j]))
-                if identity is not None and (i == identity or j == identity):
-                    m_item.setBackground(QColor(200, 255, 200))
-                if zero_div and (i, j) == tuple(zero_div):
-                    m_item.setBackground(QColor(255, 200, 200))
-                self.mul_table.setItem(i, j, m_item)
-
-                a_item = QTableWidgetItem(str(add_table[i][j]))
-                self.add_table.setItem(i, j, a_item)
-                
+        """Point both views at the tables; cells and highlighting are read on demand."""
+        if mul_table is None or len(mul_table) > MAX_VISUAL_SIZE:
+            self.add_model.clear()
+            self.mul_model.clear()
+            return
+        # (both missing when the ring axioms failed and the analysis stopped early)
+        identity = res.get('has identity', {}).get('identity')
+        zero_div = res.get('integral domain', {}).get('zero divisors')
+        self.add_model.set_table(add_table)
+        self.mul_model.set_table(mul_table, identity=identity, zero_divisors=zero_div)
+
+    @profiling.staged("visualize")
+    def visualize_znz(self, ring, res):
+        """Z/nZ views compute (a + b) % n and (a * b) % n per visible cell; witnesses are residues."""
+        n = len(ring)
+        if n > MAX_VISUAL_SIZE:
+            self.add_model.clear()
+            self.mul_model.clear()
+            return
+        mod, el = ring.n, ring.elements
+        self.add_model.set_table(n=n, cell=lambda i, j: (el[i] + el[j]) % mod, labels=el)
+        self.mul_model.set_table(
+            n=n, cell=lambda i, j: (el[i] * el[j]) % mod, labels=el,
+            identity=res['has identity']['identity'],
+            zero_divisors=res['integral domain']['zero divisors'],
+        )
+
     def update_batch_display(self):
         self.nav_label.setText(f"Batch: {self.current_batch + 1}")
-        self.display_results(self.batch_results[self.current_batch])
-        add, mul = self.batch_tables[self.current_batch]
-        self.visualize(add, mul, self.batch_results[self.current_batch])
+        try:
+            res = self.batch_results[self.current_batch]
+        except Exception as e:
+            # on-demand analysis reports invalid rings when they are shown
+            self.results_box.setPlainText(f"❌ Error: {e}")
+            self.add_model.clear()
+            self.mul_model.clear()
+        else:
+            self.display_results(res)
+            entry = self.batch_tables[self.current_batch]
+            if isinstance(entry, ZnZRing) and not entry.is_full:
+                self.show_closure(entry)
+            draw = profiling.Profiler() if self.profiling else None
+            with draw or nullcontext():
+                if isinstance(entry, ZnZRing):
+                    self.visualize_znz(entry, res)
+                else:
+                    add, mul = entry
+                    self.visualize(add, mul, res)
+            if draw is not None:
+                self.draw_profiles[self.current_batch] = draw.report()
+        if self.profiling:
+            self.show_profile()
+        if isinstance(self.batch_results, LazyResults):
+            self.batch_results.prefetch(self.current_batch)
+
+    def show_closure(self, ring):
+        """Warn when a Z/nZ element subset is not a subring, and name the subring it generates."""
+        failure = closure.znz_closure_failure(ring.n, ring.elements)
+        if failure is None:
+            return
+        a, op, b, r = failure
+        d = closure.znz_generator(ring.n, ring.elements)
+        generated = closure.znz_generated(ring.n, ring.elements)
+        listed = ", ".join(map(str, generated[:MAX_LISTED])) + (", …" if len(generated) > MAX_LISTED else "")
+        self.results_box.append(
+            f"\n⚠️ These elements are not closed: {a} {op} {b} = {r} is not among them, so the results above "
+            f"are for the table restricted to them, not for a subring.\n"
+            f"   They generate {f'{d}ℤ/{ring.n}ℤ' if d > 1 else f'all of ℤ/{ring.n}ℤ'} ({len(generated)} elements): {listed}"
+        )
+
+    def show_profile(self):
+        """Append the shown batch's stage timings (and those of reading the input) to the results box."""
+        lines = ["", "Profile (this batch):"] + profiling.format_profile(self.batch_profile(self.current_batch))
+        if self.input_profile:
+            lines += ["Profile (reading the input, all batches):"] + profiling.format_profile(self.input_profile)
+        self.results_box.append("\n".join(lines))
+
+    def save_batch_pstats(self):
+        """Analyze and draw the shown batch again under cProfile (without the result cache) and save the stats."""
+        if not self.batch_results or not self.batch_tables:
+            QMessageBox.warning(self, "Nothing to profile", "Run analysis first.")
+            return
+        i = self.current_batch
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Profile", f"batch{i + 1}.pstats", "Profile Statistics (*.pstats *.prof)"
+        )
+        if not path:
+            return
+        entry = self.batch_tables[i]
+        try:
+            with profiling.Profiler(memory=False, pstats_path=path):
+                if isinstance(entry, ZnZRing):
+                    self.visualize_znz(entry, entry.analyze())
+                else:
+                    add, mul = entry
+                    self.visualize(add, mul, self.analyze_custom_one(entry, self.batch_mode, use_cache=False,
+                                                                      witnesses=self.batch_witnesses))
+            QMessageBox.information(self, "Profile Saved", f"cProfile statistics saved to:\n{path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Profile Error", str(e))
 
     def prev_batch(self):
         if self.current_batch > 0:
@@ -286,63 +535,32 @@ class MainWindow(QWidget):
             QMessageBox.warning(self, "Nothing to export", "Run analysis first.")
             return
 
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Export Results", "", "CSV Files (*.csv);;Text Files (*.txt)"
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Export Results", "", ";;".join(EXPORT_FILTERS)
         )
         if not path:
             return
+        try:
+            detect_format(path)
+        except ValueError:
+            # no recognised extension: take the one of the chosen filter
+            path += EXPORT_FILTERS.get(selected, ".csv")
+
+        def rows():
+            # results are pulled one at a time (on-demand batches are analyzed here)
+            for i, entry in enumerate(self.batch_tables):
+                meta = {"batch": i + 1, "n": len(entry) if isinstance(entry, ZnZRing) else len(entry[1])}
+                try:
+                    res = self.batch_results[i]
+                except Exception as e:
+                    res, meta["error"] = None, str(e)
+                if self.profiling:
+                    meta["profile"] = self.batch_profile(i)
+                yield res, meta
 
         try:
-            with open(path, "w", newline="") as f:
-                writer = csv.writer(f) if path.endswith(".csv") else None
-                for i, (res, _) in enumerate(zip(self.batch_results, self.batch_tables)):
-                    header = f"Batch {i+1}"
-                    if writer:
-                        writer.writerow([header])
-                        for k, d in res.items():
-                            value_str = "Yes" if d["value"] else "No"
-                            explanation = ""
-
-                            if not d["value"]:
-                                if "counterexample" in d and d["counterexample"] is not None:
-                                    explanation = f"Counterexample: {d['counterexample']}"
-                                elif "zero divisors" in d:
-                                    explanation = (
-                                        f"Zero divisors: {d['zero divisors']}" if d["zero divisors"] is not None
-                                        else "Skipped: no identity element"
-                                    )
-                                elif "missing inverse" in d:
-                                    explanation = (
-                                        f"Missing inverse for: {d['missing inverse']}" if d["missing inverse"] is not None
-                                        else "Skipped: no identity element"
-                                    )
-                                elif "identity" in d and d["identity"] is None:
-                                    explanation = "No multiplicative identity found"
-
-                            writer.writerow([k, value_str, explanation])
-                        writer.writerow([])  # spacer between batches
-                    else:
-                        f.write(f"{header}\n")
-                        for k, d in res.items():
-                            value_str = "Yes" if d["value"] else "No"
-                            f.write(f"{k}: {value_str}\n")
-
-                            if not d["value"]:
-                                if "counterexample" in d and d["counterexample"] is not None:
-                                    f.write(f"    Counterexample: {d['counterexample']}\n")
-                                elif "zero divisors" in d:
-                                    if d["zero divisors"] is not None:
-                                        f.write(f"    Zero divisors: {d['zero divisors']}\n")
-                                    else:
-                                        f.write(f"    Skipped: no identity element\n")
-                                elif "missing inverse" in d:
-                                    if d["missing inverse"] is not None:
-                                        f.write(f"    Missing inverse for: {d['missing inverse']}\n")
-                                    else:
-                                        f.write(f"    Skipped: no identity element\n")
-                                elif "identity" in d and d["identity"] is None:
-                                    f.write("    No multiplicative identity found\n")
-                        f.write("\n")
+            export_results(rows(), path, columns=result_columns(self.batch_axioms, self.profiling,
+                                                                         self.batch_witnesses))
             QMessageBox.information(self, "Export Successful", f"Results saved to:\n{path}")
         except Exception as e:
-            QMessageBox.critical(self, "Export Error", str(e))
\ No newline at end of file
+            QMessageBox.critical(self, "Export Error", str(e))
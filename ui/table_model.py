@@ -0,0 +1,85 @@
+# ui/table_model.py
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QBrush, QColor
+
+IDENTITY_BRUSH = QBrush(QColor(200, 255, 200))
+ZERO_DIVISOR_BRUSH = QBrush(QColor(255, 200, 200))
+
+
+class OperationTableModel(QAbstractTableModel):
+    """
+    Read-only model over an operation table.
+
+    Cells are read from the table on demand (table[i][j], so lists, RingTables
+    and ndarrays all work) or computed by cell(i, j); nothing is copied or
+    created per cell. Highlighting is worked out in data() as well.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._n = 0
+        self._cell = None
+        self._labels = None
+        self._identity = None
+        self._zero_div = None
+
+    def set_table(self, table=None, labels=None, identity=None, zero_divisors=None, n=None, cell=None):
+        """
+        Show table (or n x n cells computed by cell(i, j)).
+
+        labels name the rows/columns (Z/nZ subsets); identity and zero_divisors
+        are element names as in the analysis result and get highlighted.
+        """
+        self.beginResetModel()
+        if table is not None:
+            self._n = len(table)
+            self._cell = lambda i, j: table[i][j]
+        else:
+            self._n = n or 0
+            self._cell = cell
+        self._labels = labels
+        self._identity = self._index_of(identity)
+        self._zero_div = None
+        if zero_divisors:
+            a, b = (self._index_of(x) for x in zero_divisors)
+            if a is not None and b is not None:
+                self._zero_div = (a, b)
+        self.endResetModel()
+
+    def clear(self):
+        self.set_table(n=0)
+
+    def _index_of(self, element):
+        """Row/column of an element name (labels are usually short, identity is looked up once)."""
+        if element is None:
+            return None
+        if self._labels is None:
+            return element if 0 <= element < self._n else None
+        try:
+            return self._labels.index(element)
+        except ValueError:
+            return None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._n
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._n
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        i, j = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            return str(self._cell(i, j))
+        if role == Qt.BackgroundRole:
+            if self._zero_div == (i, j):
+                return ZERO_DIVISOR_BRUSH
+            if self._identity is not None and (i == self._identity or j == self._identity):
+                return IDENTITY_BRUSH
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and self._labels is not None:
+            return str(self._labels[section])
+        return super().headerData(section, orientation, role)
@@ -1,11 +1,14 @@
 # ui/znz_tab.py
-import re
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QSpinBox, QLineEdit,
-    QCheckBox, QPlainTextEdit, QScrollArea, QFrame,
-    QHBoxLayout, QSplitter, QSizePolicy,QFormLayout
+    QCheckBox, QPlainTextEdit, QTableView, QHeaderView,
+    QSplitter, QSizePolicy,QFormLayout
 )
 from PyQt5.QtCore import Qt
+from ui.batch_editor import MAX_BATCHES, ZnzBatchModel
+
+# Z/nZ is analyzed in closed form, so n is only limited by QSpinBox's int range
+MAX_MODULUS = 2_000_000_000
 
 class ZnzTab(QWidget):
     def __init__(self):
@@ -15,15 +18,15 @@ class ZnzTab(QWidget):
         self.batch_cb = QCheckBox("Batch Mode")
 
         self.batch_label = QLabel("Amount of batches:")
-        self.batch_count = QSpinBox(minimum=1, value=1)
+        self.batch_count = QSpinBox(minimum=1, maximum=MAX_BATCHES, value=1)
         self.batch_label.setVisible(False)
         self.batch_count.setVisible(False)
 
         self.n_label = QLabel("Enter modulus n (>=2):")
-        self.n_spin = QSpinBox(minimum=2, value=3)
+        self.n_spin = QSpinBox(minimum=2, maximum=MAX_MODULUS, value=3)
         self.elements_label = QLabel("Elements:")
         self.elements_le = QLineEdit()
-        self.elements_le.setPlaceholderText("Example: 0,1,2")
+        self.elements_le.setPlaceholderText("Example: 0,1,2 (empty = all of Z/nZ)")
 
         self.fast_text = QPlainTextEdit()
         self.fast_text.setPlaceholderText(
@@ -31,7 +34,11 @@ class ZnzTab(QWidget):
         )
         self.fast_text.setVisible(False)
 
-        self.batches_area = QScrollArea()
+        # one row per batch, edited in place (no widgets per batch)
+        self.batch_model = ZnzBatchModel(min_n=2, max_n=MAX_MODULUS)
+        self.batches_area = QTableView()
+        self.batches_area.setModel(self.batch_model)
+        self.batches_area.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.batches_area.setVisible(False)
 
         # --- Upper section ---
@@ -107,22 +114,5 @@ class ZnzTab(QWidget):
             self.build_batches()
 
     def build_batches(self):
-        count = self.batch_count.value()
-        container = QFrame()
-        v = QVBoxLayout(container)
-        self.ns = []
-        self.elements = []
-        for i in range(count):
-            h = QHBoxLayout()
-            spin = QSpinBox(minimum=2, value=3)
-            line = QLineEdit()
-            line.setPlaceholderText(f"(e.g. 0,1,2)")
-            h.addWidget(QLabel(f"Batch {i+1}"))
-            h.addWidget(QLabel(f"modulus n:"))
-            h.addWidget(spin)
-            h.addWidget(QLabel("Elements:"))
-            h.addWidget(line)
-            v.addLayout(h)
-            self.ns.append(spin)
-            self.elements.append(line)
-        self.batches_area.setWidget(container)
\ No newline at end of file
+        """Match the batch rows to the batch count (existing batches are kept)."""
+        self.batch_model.set_count(self.batch_count.value())
\ No newline at end of file